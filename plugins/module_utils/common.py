@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+try:
+    from ravendb import DocumentStore, GetDatabaseNamesOperation
+    from ravendb.http.server_node import ServerNode
+    from ravendb.serverwide.operations.common import GetDatabaseRecordOperation
+except ImportError:
+    # Every module checks for the ravendb client itself and fails with missing_required_lib.
+    pass
+
+DEFAULT_PAGE_SIZE = 128
+MAX_POLL_INTERVAL = 10
+
+
+def create_store(url, certificate_path, ca_cert_path, database_name=None):
+    """Create and initialize a RavenDB DocumentStore with optional client and CA certificates."""
+    store = DocumentStore(urls=[url], database=database_name)
+    if certificate_path and ca_cert_path:
+        store.certificate_pem_path = certificate_path
+        store.trust_store_path = ca_cert_path
+    store.initialize()
+    return store
+
+
+def initialize_ravendb_store(params):
+    """Create and initialize a RavenDB DocumentStore from Ansible module parameters."""
+    return create_store(
+        params['url'], params.get('certificate_path'), params.get('ca_cert_path'), params.get('database_name'))
+
+
+def iter_database_names(store, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Lazily yield the names of existing RavenDB databases, fetching one page at a time.
+    The server lists every shard of a sharded database ('name$0', 'name$1', ...); those are yielded once as 'name'.
+    """
+    sharded_databases = set()
+    start = 0
+    while True:
+        page = store.maintenance.server.send(GetDatabaseNamesOperation(start, page_size))
+        for name in page:
+            if '$' in name:
+                name = name.split('$', 1)[0]
+                if name in sharded_databases:
+                    continue
+                sharded_databases.add(name)
+            yield name
+        if len(page) < page_size:
+            return
+        start += page_size
+
+
+def get_raw_database_record(store, database_name):
+    """Fetch the database record as raw JSON, including parts the client does not model (e.g. sharding)."""
+    class GetRawDatabaseRecordCommand(GetDatabaseRecordOperation.GetDatabaseRecordCommand):
+        def set_response(self, response, from_cache):
+            self.result = json.loads(response) if response else None
+
+    class GetRawDatabaseRecordOperation(GetDatabaseRecordOperation):
+        def get_command(self, conventions):
+            return GetRawDatabaseRecordCommand(database_name)
+
+    return store.maintenance.server.send(GetRawDatabaseRecordOperation(database_name))
+
+
+def is_database_disabled(store, database_name):
+    """Return True if the database record is marked as disabled."""
+    database_record = get_raw_database_record(store, database_name) or {}
+    return bool(database_record.get("Disabled"))
+
+
+class DatabaseMaintenance:
+    """
+    Maintenance operations on one database, sent through the store's server-level request executor.
+    Every database shares that executor's HTTP session and cluster topology, instead of the client
+    creating (and fetching the topology for) a request executor per database name.
+    """
+
+    def __init__(self, store, database_name):
+        self.store = store
+        self.database_name = database_name
+
+    @property
+    def request_executor(self):
+        return self.store.maintenance.server._request_executor
+
+    def send(self, operation, node_tag=None):
+        """Send a maintenance operation to the database, on the given node if a tag is set."""
+        request_executor = self.request_executor
+        command = operation.get_command(request_executor.conventions)
+        create_request = command.create_request
+        command.create_request = lambda node: create_request(
+            ServerNode(node.url, self.database_name, node.cluster_tag, node.server_role))
+        if node_tag:
+            command._selected_node_tag = node_tag
+        request_executor.execute_command(command)
+        return command.result
+
+
+def get_database_maintenance(store, database_name):
+    """
+    Return a maintenance executor bound to the given database.
+    Works on stores without a default database, where the client's for_database() fails.
+    """
+    return DatabaseMaintenance(store, database_name)
+
+
+def get_database_nodes(store, database_name):
+    """Return the tags of the nodes hosting the database, as listed in its topology."""
+    database_record = store.maintenance.server.send(GetDatabaseRecordOperation(database_name))
+    topology = (database_record.topology if database_record else None) or {}
+    return (list(topology.get("Members") or []) + list(topology.get("Promotables") or [])
+            + list(topology.get("Rehabs") or []))
+
+
+def send_to_node(database_maintenance, operation, node_tag):
+    """Send a maintenance operation to a specific node of the database group."""
+    return database_maintenance.send(operation, node_tag)
+
+
+def wait_for_operation(operation, timeout, interval=1):
+    """
+    Poll a long-running server operation with exponential backoff until it leaves the InProgress state.
+
+    Returns a tuple: (state: Optional[dict], elapsed: float). The state is None if the timeout expired.
+    """
+    started = time.monotonic()
+    while True:
+        state = operation.fetch_operations_status()
+        elapsed = round(time.monotonic() - started, 2)
+        if state and state.get("Status") != "InProgress":
+            return state, elapsed
+
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            return None, elapsed
+
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+
+def is_valid_url(url):
+    """Return True if the given URL contains a valid scheme and netloc."""
+    parsed = urlparse(url)
+    return all([parsed.scheme, parsed.netloc])
+
+
+def validate_paths(*paths):
+    """
+    Validate that all given file paths exist on the filesystem.
+    Returns a tuple: (valid: bool, error_msg: Optional[str])
+    """
+    for path in paths:
+        if path and not os.path.isfile(path):
+            return False, f"Path does not exist: {path}"
+    return True, None
@@ -29,16 +29,141 @@ options:
         description:
             - Name of the database to be created or deleted.
             - Must be a valid name containing only letters, numbers, dashes, and underscores.
-        required: true
+            - Mutually exclusive with C(databases). One of them is required.
+        required: false
         type: str
     replication_factor:
         description:
             - Number of server nodes to replicate the database to.
             - Must be a positive integer.
-            - Only used when creating a database.
+            - Used when creating a database, and for existing databases when C(reconcile_topology=true).
         required: false
         default: 1
         type: int
+    members:
+        description:
+            - Explicit list of node tags that should host the database.
+            - When creating a database, it is placed on exactly these nodes and C(replication_factor) is ignored.
+            - For an existing database, nodes missing from the database group are added and nodes not listed are removed.
+            - Nodes are only removed once every node that stays in the database group is a member, so that the
+              data is never left without an up-to-date copy (e.g. when moving a database from node A to node B).
+              The wait is bounded by C(wait.timeout), or 600 seconds without C(wait).
+            - Only used with C(database_name) and C(state=present).
+        required: false
+        type: list
+        elements: str
+    reconcile_topology:
+        description:
+            - Whether to reconcile the database group of an existing database with C(replication_factor).
+            - Missing nodes are added on cluster nodes not yet hosting the database; extra nodes are removed
+              starting with rehab and promotable nodes, then the lowest-priority members.
+            - Always enabled when C(members) is given.
+        required: false
+        default: false
+        type: bool
+    sharding:
+        description:
+            - Create the database as a sharded database (RavenDB 6.0 or later).
+            - Each shard is replicated C(replication_factor) times. Without C(placement), shard replicas are
+              spread evenly across all cluster nodes.
+            - For an existing database, the module verifies that it is sharded with the same number of shards.
+              Changing the shard count or the placement of an existing database is not supported.
+            - Only used with C(database_name) and C(state=present). Mutually exclusive with C(members).
+        required: false
+        type: dict
+        suboptions:
+            shards:
+                description:
+                    - Number of shards.
+                required: true
+                type: int
+            placement:
+                description:
+                    - Explicit node tags for each shard, keyed by shard number.
+                    - Every shard must be listed. Overrides C(replication_factor).
+                required: false
+                type: dict
+    settings:
+        description:
+            - Database configuration settings to keep in the database record, e.g. C(Indexing.MapBatchSize).
+            - Values are compared with the live database record and written only when at least one key differs.
+            - Keys that are not listed are left untouched.
+            - Only database-level configuration keys are accepted; server-level keys are rejected by the server.
+            - Settings are applied when the database is created, or on the next database reload for an existing database.
+            - Only used with C(database_name) and C(state=present).
+        required: false
+        type: dict
+    wait:
+        description:
+            - Wait until every node of the database group is a member before returning.
+            - The database topology is polled with exponential backoff, starting at C(interval) seconds.
+            - A member only counts as ready once it answers a statistics request for the database itself.
+            - Nodes still in Promotable or Rehab state are waited for; the task fails if they do not converge within C(timeout).
+            - Only used with C(database_name) and C(state=present). Skipped in check mode.
+        required: false
+        type: dict
+        suboptions:
+            timeout:
+                description:
+                    - Maximum number of seconds to wait for the topology to converge.
+                required: false
+                default: 60
+                type: int
+            interval:
+                description:
+                    - Initial number of seconds between two topology polls. Doubled after each poll, up to 10 seconds.
+                required: false
+                default: 1
+                type: float
+    databases:
+        description:
+            - List of databases to reconcile in a single invocation.
+            - All entries are checked against one listing of the existing databases, using a single connection.
+            - Creations and deletions are executed concurrently, bounded by C(max_concurrency).
+            - Entries with C(state=enabled) or C(state=disabled) are toggled with one server call per direction.
+            - Mutually exclusive with C(database_name).
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - Name of the database.
+                    - Must be a valid name containing only letters, numbers, dashes, and underscores.
+                required: true
+                type: str
+            replication_factor:
+                description:
+                    - Number of server nodes to replicate the database to.
+                required: false
+                default: 1
+                type: int
+            state:
+                description:
+                    - Desired state of the database.
+                required: false
+                type: str
+                choices:
+                  - present
+                  - absent
+                  - enabled
+                  - disabled
+                default: present
+    max_concurrency:
+        description:
+            - Maximum number of databases created or deleted in parallel when C(databases) is used.
+            - Must be a positive integer.
+        required: false
+        default: 4
+        type: int
+    page_size:
+        description:
+            - Number of database names requested per page when listing the existing databases.
+            - The listing is paged until exhausted, so clusters of any size are handled correctly.
+            - A single database lookup stops paging as soon as the name is found.
+        required: false
+        default: 128
+        type: int
     certificate_path:
         description:
             - Path to a client certificate (PEM format) for secured communication.
@@ -51,16 +176,56 @@ options:
             - Optional if the server certificate is trusted by system CA store.
         required: false
         type: str
+    compaction:
+        description:
+            - Options for C(state=compacted).
+        required: false
+        type: dict
+        suboptions:
+            documents:
+                description:
+                    - Whether to compact the documents storage.
+                required: false
+                default: true
+                type: bool
+            indexes:
+                description:
+                    - Names of the indexes to compact. Corax indexes cannot be compacted.
+                required: false
+                default: []
+                type: list
+                elements: str
+            nodes:
+                description:
+                    - Node tags to compact the database on, one node at a time.
+                    - Defaults to every node hosting the database.
+                required: false
+                type: list
+                elements: str
+            timeout:
+                description:
+                    - Maximum number of seconds to wait for the compaction of a single node.
+                required: false
+                default: 3600
+                type: int
     state:
         description:
             - Desired state of the database.
             - If C(present), the database will be created if it does not exist.
             - If C(absent), the database will be deleted if it exists.
+            - If C(disabled), the existing database is disabled, which unloads it and releases its memory
+              and mapped files on every node. If C(enabled), a disabled database is loaded again.
+            - If C(compacted), the existing database is compacted on each of its nodes in turn and the
+              module waits for every compaction to finish. The database is unavailable on a node while it is
+              being compacted. Always reports a change.
         required: false
         type: str
         choices:
           - present
           - absent
+          - enabled
+          - disabled
+          - compacted
         default: present
 requirements:
     - python >= 3.9
@@ -84,6 +249,61 @@ EXAMPLES = '''
     replication_factor: 3
     state: present
 
+- name: Ensure a RavenDB database has tuned indexing settings
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    settings:
+      Indexing.MapBatchSize: 16384
+      Indexing.MapTimeoutInSec: 30
+    state: present
+  register: db
+
+- name: Scale an existing RavenDB database out to 3 nodes
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    replication_factor: 3
+    reconcile_topology: true
+    state: present
+
+- name: Pin a RavenDB database to specific nodes
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    members: ["A", "C"]
+    state: present
+
+- name: Create a sharded RavenDB database with 3 shards, 2 replicas each
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_sharded_database"
+    replication_factor: 2
+    sharding:
+      shards: 3
+    state: present
+
+- name: Create a sharded RavenDB database with explicit shard placement
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_sharded_database"
+    sharding:
+      shards: 2
+      placement:
+        "0": ["A", "B"]
+        "1": ["B", "C"]
+    state: present
+
+- name: Create a RavenDB database and wait until all its nodes are members
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    replication_factor: 3
+    wait:
+      timeout: 120
+      interval: 0.5
+    state: present
+
 - name: Delete a RavenDB database
   ravendb.ravendb.database:
     url: "http://{{ ansible_host }}:8080"
@@ -109,6 +329,38 @@ EXAMPLES = '''
     ca_cert_path: "/etc/ravendb/security/ca_certificate.pem"
     state: absent
 
+- name: Reconcile many RavenDB databases in one task
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    max_concurrency: 8
+    databases:
+      - name: "tenant_a"
+        replication_factor: 3
+      - name: "tenant_b"
+        replication_factor: 3
+      - name: "tenant_old"
+        state: absent
+
+- name: Disable idle tenant databases in bulk
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    databases:
+      - name: "tenant_cold_1"
+        state: disabled
+      - name: "tenant_cold_2"
+        state: disabled
+
+- name: Compact a RavenDB database and one of its indexes on every node
+  ravendb.ravendb.database:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    compaction:
+      documents: true
+      indexes:
+        - "Orders/ByCompany"
+      timeout: 7200
+    state: compacted
+
 - name: Simulate creating a RavenDB database (check mode)
   ravendb.ravendb.database:
     url: "http://{{ ansible_host }}:8080"
@@ -138,18 +390,109 @@ msg:
     returned: always
     sample: Database 'my_database' created successfully.
     version_added: "1.0.0"
+
+settings_changed:
+    description:
+        - Keys of C(settings) that differed from the database record and were (or would be) written.
+        - A database reload is only needed when this list is not empty for an existing database.
+    type: list
+    elements: str
+    returned: when C(settings) is provided
+    sample:
+      - Indexing.MapBatchSize
+
+topology_changes:
+    description:
+        - Node tags added to and removed from the database group (or planned to be, in check mode).
+    type: dict
+    returned: when C(members) is given or C(reconcile_topology=true) and the database already exists
+    sample:
+      add:
+        - C
+      remove: []
+
+shard_placement:
+    description: Node tags of each shard, keyed by shard number, for a sharded database that was (or would be) created.
+    type: dict
+    returned: when C(sharding) is provided and the database is created
+    sample:
+      "0": ["A", "B"]
+      "1": ["C", "A"]
+      "2": ["B", "C"]
+
+convergence:
+    description:
+        - Topology convergence details when C(wait) is used.
+        - C(nodes) maps each node tag to the number of seconds it took to become a member serving the database.
+    type: dict
+    returned: when C(wait) is provided and not in check mode
+    sample:
+      elapsed: 3.52
+      nodes:
+        A: 0.01
+        B: 1.24
+        C: 3.52
+
+compaction:
+    description:
+        - Per-node compaction results when C(state=compacted).
+        - Sizes are reported by the server in megabytes.
+    type: list
+    elements: dict
+    returned: when C(state=compacted) and not in check mode
+    sample:
+      - node: A
+        elapsed: 12.4
+        size_before_mb: 2048
+        size_after_mb: 1210
+        reclaimed_mb: 838
+
+databases:
+    description: Per-database results when C(databases) is used.
+    type: list
+    elements: dict
+    returned: when C(databases) is used
+    sample:
+      - name: tenant_a
+        state: present
+        changed: true
+        failed: false
+        msg: Database 'tenant_a' created successfully.
 '''
 
 import traceback
-import os
+import json
 import re
-from urllib.parse import urlparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ravendb.ravendb.plugins.module_utils.common import (
+    create_store,
+    iter_database_names,
+    get_database_maintenance,
+    get_raw_database_record,
+    is_database_disabled,
+    send_to_node,
+    wait_for_operation,
+    is_valid_url,
+    validate_paths,
+    DEFAULT_PAGE_SIZE,
+    MAX_POLL_INTERVAL)
 
 LIB_IMP_ERR = None
 try:
-    from ravendb import DocumentStore, GetDatabaseNamesOperation
-    from ravendb.serverwide.operations.common import CreateDatabaseOperation, DeleteDatabaseOperation
+    from ravendb.serverwide.operations.common import (
+        AddDatabaseNodeOperation,
+        CreateDatabaseOperation,
+        DeleteDatabaseOperation,
+        GetDatabaseRecordOperation,
+        ServerOperation)
+    from ravendb.serverwide.commands import GetClusterTopologyCommand
+    from ravendb.documents.operations.compact import CompactDatabaseOperation
+    from ravendb.documents.operations.statistics import GetStatisticsOperation
+    from ravendb.documents.operations.server_misc import ToggleDatabasesStateOperation
+    from ravendb.serverwide.misc import CompactSettings
+    from ravendb.serverwide.operations.configuration import PutDatabaseSettingsOperation
     from ravendb.serverwide.database_record import DatabaseRecord
     from ravendb.exceptions.raven_exceptions import RavenException
     HAS_LIB = True
@@ -157,37 +500,52 @@ except ImportError:
     HAS_LIB = False
     LIB_IMP_ERR = traceback.format_exc()
 
+DEFAULT_TOPOLOGY_TIMEOUT = 600
+
 
-def create_store(url, certificate_path, ca_cert_path):
-    """Create and initialize a RavenDB DocumentStore with optional client and CA certificates."""
-    store = DocumentStore(urls=[url])
-    if certificate_path and ca_cert_path:
-        store.certificate_pem_path = certificate_path
-        store.trust_store_path = ca_cert_path
-    store.initialize()
-    return store
+def database_exists(store, database_name, page_size=DEFAULT_PAGE_SIZE):
+    """Return True if the database exists. Stops paging as soon as the name is found."""
+    return any(name == database_name for name in iter_database_names(store, page_size))
 
 
-def get_existing_databases(store):
-    """Retrieve the list of existing RavenDB databases from the server."""
-    return store.maintenance.server.send(GetDatabaseNamesOperation(0, 128))
+def get_existing_databases(store, page_size=DEFAULT_PAGE_SIZE):
+    """Retrieve the names of all existing RavenDB databases as a set."""
+    return set(iter_database_names(store, page_size))
 
 
-def handle_present_state(store, database_name, replication_factor, check_mode):
+def handle_present_state(
+        store,
+        database_name,
+        replication_factor,
+        check_mode,
+        existing_databases=None,
+        page_size=DEFAULT_PAGE_SIZE,
+        settings=None,
+        members=None):
     """
     Ensure the specified database exists.
+    An already fetched set of database names can be passed to skip the listing.
+    Settings and members, if given, are stored in the record of a newly created database.
 
     Returns a tuple: (changed: bool, message: str)
     """
-    existing_databases = get_existing_databases(store)
+    if existing_databases is None:
+        exists = database_exists(store, database_name, page_size)
+    else:
+        exists = database_name in existing_databases
 
-    if database_name in existing_databases:
+    if exists:
         return False, f"Database '{database_name}' already exists."
 
     if check_mode:
         return True, f"Database '{database_name}' would be created."
 
     database_record = DatabaseRecord(database_name)
+    if settings:
+        database_record.settings = normalize_settings(settings)
+    if members:
+        database_record.topology = {"Members": list(members), "ReplicationFactor": len(members)}
+        replication_factor = len(members)
     create_database_operation = CreateDatabaseOperation(
         database_record=database_record,
         replication_factor=replication_factor
@@ -196,14 +554,19 @@ def handle_present_state(store, database_name, replication_factor, check_mode):
     return True, f"Database '{database_name}' created successfully."
 
 
-def handle_absent_state(store, database_name, check_mode):
+def handle_absent_state(store, database_name, check_mode, existing_databases=None, page_size=DEFAULT_PAGE_SIZE):
     """
     Ensure the specified database is absent.
+    An already fetched set of database names can be passed to skip the listing.
+
     Returns a tuple: (changed: bool, message: str)
     """
-    existing_databases = get_existing_databases(store)
+    if existing_databases is None:
+        exists = database_exists(store, database_name, page_size)
+    else:
+        exists = database_name in existing_databases
 
-    if database_name not in existing_databases:
+    if not exists:
         return False, f"Database '{database_name}' does not exist."
 
     if check_mode:
@@ -214,10 +577,587 @@ def handle_absent_state(store, database_name, check_mode):
     return True, f"Database '{database_name}' deleted successfully."
 
 
-def is_valid_url(url):
-    """Return True if the given URL contains a valid scheme and netloc."""
-    parsed = urlparse(url)
-    return all([parsed.scheme, parsed.netloc])
+def get_database_record(store, database_name):
+    """Fetch the database record of the given database, or None if it does not exist."""
+    return store.maintenance.server.send(GetDatabaseRecordOperation(database_name))
+
+
+def normalize_settings(settings):
+    """Render setting values as the strings RavenDB keeps in the database record."""
+    normalized = {}
+    for key, value in (settings or {}).items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        normalized[key] = str(value)
+    return normalized
+
+
+def diff_settings(existing_settings, desired_settings):
+    """Return the sorted keys whose desired value differs from the existing one."""
+    existing_settings = existing_settings or {}
+    return sorted(
+        key for key, value in desired_settings.items()
+        if existing_settings.get(key) != value)
+
+
+def reconcile_settings(store, database_name, settings, check_mode):
+    """
+    Ensure the database record contains the given settings, writing only when a key differs.
+
+    Returns a tuple: (changed: bool, changed_keys: list, message: str)
+    """
+    desired_settings = normalize_settings(settings)
+    database_record = get_database_record(store, database_name)
+    existing_settings = (database_record.settings if database_record else None) or {}
+
+    changed_keys = diff_settings(existing_settings, desired_settings)
+    if not changed_keys:
+        return False, [], f"Database '{database_name}' already exists and settings match."
+
+    if check_mode:
+        return True, changed_keys, f"Database '{database_name}' settings would be updated: {', '.join(changed_keys)}."
+
+    merged_settings = dict(existing_settings)
+    merged_settings.update(desired_settings)
+    get_database_maintenance(store, database_name).send(
+        PutDatabaseSettingsOperation(database_name, merged_settings))
+    return True, changed_keys, f"Database '{database_name}' settings updated: {', '.join(changed_keys)}."
+
+
+def merge_shard_topologies(shards):
+    """
+    Merge the topologies of all shards into one view of the database group.
+    A node is a member only if it is a member of every shard it hosts.
+    """
+    pending = set()
+    members = []
+    for shard_topology in shards.values():
+        pending.update(shard_topology.get("Promotables") or [])
+        pending.update(shard_topology.get("Rehabs") or [])
+        members.extend(tag for tag in shard_topology.get("Members") or [] if tag not in members)
+    return dict(
+        Members=[tag for tag in members if tag not in pending],
+        Promotables=sorted(pending),
+        Rehabs=[])
+
+
+def get_database_topology(store, database_name):
+    """Return the database topology as a dict with Members, Promotables and Rehabs lists."""
+    database_record = get_raw_database_record(store, database_name)
+    if not database_record:
+        return {}
+    sharding = database_record.get("Sharding")
+    if sharding and sharding.get("Shards"):
+        return merge_shard_topologies(sharding["Shards"])
+    return database_record.get("Topology") or {}
+
+
+def get_cluster_topology(store):
+    """Fetch the cluster topology from the server."""
+    class GetClusterTopologyOperation(ServerOperation):
+        def get_command(self, conventions):
+            return GetClusterTopologyCommand()
+
+    return store.maintenance.server.send(GetClusterTopologyOperation())
+
+
+def get_cluster_node_tags(store):
+    """Return the sorted tags of all nodes in the cluster."""
+    topology = get_cluster_topology(store).topology
+    tags = set()
+    for nodes in (topology.members, topology.promotables, topology.watchers):
+        tags.update((nodes or {}).keys())
+    return sorted(tags)
+
+
+def plan_topology_changes(current_nodes, cluster_nodes, replication_factor, members=None):
+    """
+    Compute the smallest set of node additions and removals for the database group.
+    current_nodes is ordered by preference (members, then promotables, then rehabs).
+
+    Returns a tuple: (to_add: list, to_remove: list, error: Optional[str])
+    """
+    if members is not None:
+        unknown = [tag for tag in members if tag not in cluster_nodes]
+        if unknown:
+            return [], [], f"Unknown cluster nodes: {', '.join(unknown)}."
+        to_add = [tag for tag in members if tag not in current_nodes]
+        to_remove = [tag for tag in current_nodes if tag not in members]
+        return to_add, to_remove, None
+
+    if len(current_nodes) < replication_factor:
+        candidates = [tag for tag in cluster_nodes if tag not in current_nodes]
+        missing = replication_factor - len(current_nodes)
+        if len(candidates) < missing:
+            return [], [], (
+                f"Cannot reach replication factor {replication_factor}: "
+                f"only {len(cluster_nodes)} nodes in the cluster.")
+        return candidates[:missing], [], None
+
+    return [], current_nodes[replication_factor:], None
+
+
+def reconcile_topology(store, database_name, replication_factor, check_mode, members=None, wait=None):
+    """
+    Add or remove nodes so the database group matches the members list or replication factor.
+    Removals are only sent once every node that stays in the group is a member (waiting up to
+    wait['timeout'] seconds), so the database always keeps an up-to-date copy.
+
+    Returns a tuple: (changed: bool, changes: dict, message: str, error: Optional[str])
+    """
+    topology = get_database_topology(store, database_name)
+    current_nodes = []
+    for key in ("Members", "Promotables", "Rehabs"):
+        current_nodes.extend(tag for tag in topology.get(key) or [] if tag not in current_nodes)
+
+    cluster_nodes = get_cluster_node_tags(store)
+    to_add, to_remove, error = plan_topology_changes(current_nodes, cluster_nodes, replication_factor, members)
+    changes = dict(add=to_add, remove=to_remove)
+
+    if error:
+        return False, changes, error, error
+
+    if not to_add and not to_remove:
+        return False, changes, f"Database '{database_name}' topology matches.", None
+
+    summary = f"add [{', '.join(to_add)}], remove [{', '.join(to_remove)}]"
+    if check_mode:
+        return True, changes, f"Database '{database_name}' topology would be changed: {summary}.", None
+
+    for tag in to_add:
+        store.maintenance.server.send(AddDatabaseNodeOperation(database_name, tag))
+
+    remaining_nodes = [tag for tag in current_nodes + to_add if tag not in to_remove]
+    not_members = [tag for tag in remaining_nodes if tag not in (topology.get("Members") or [])]
+    if to_remove and not_members:
+        wait = wait or {}
+        converged, _, wait_message = wait_for_topology(
+            store, database_name, wait.get('timeout') or DEFAULT_TOPOLOGY_TIMEOUT, wait.get('interval') or 1,
+            not_members)
+        if not converged:
+            error = f"{wait_message} Nodes [{', '.join(to_remove)}] were not removed."
+            return True, changes, error, error
+
+    for tag in to_remove:
+        store.maintenance.server.send(DeleteDatabaseOperation(database_name, from_node=tag))
+
+    return True, changes, f"Database '{database_name}' topology changed: {summary}.", None
+
+
+def plan_shard_placement(shards, replication_factor, cluster_nodes, placement=None):
+    """
+    Assign nodes to every shard. Without an explicit placement, replicas are dealt round-robin
+    over the cluster nodes so every node hosts the same number of shard replicas (plus or minus one).
+
+    Returns a tuple: (placement: dict, error: Optional[str])
+    """
+    if placement:
+        placement = {str(shard): list(tags) for shard, tags in placement.items()}
+        expected = {str(shard) for shard in range(shards)}
+        if set(placement) != expected:
+            return {}, f"Shard placement must list exactly the shards {', '.join(sorted(expected, key=int))}."
+        unknown = sorted({tag for tags in placement.values() for tag in tags if tag not in cluster_nodes})
+        if unknown:
+            return {}, f"Unknown cluster nodes: {', '.join(unknown)}."
+        if any(not tags or len(set(tags)) != len(tags) for tags in placement.values()):
+            return {}, "Every shard must be placed on at least one node, without duplicates."
+        return placement, None
+
+    if replication_factor > len(cluster_nodes):
+        return {}, (
+            f"Cannot place shards with replication factor {replication_factor}: "
+            f"only {len(cluster_nodes)} nodes in the cluster.")
+
+    placement = {}
+    for shard in range(shards):
+        start = shard * replication_factor
+        placement[str(shard)] = [
+            cluster_nodes[(start + replica) % len(cluster_nodes)]
+            for replica in range(replication_factor)]
+    return placement, None
+
+
+def create_sharded_database(store, database_record, placement):
+    """Create a sharded database whose shards are pinned to the given nodes."""
+    orchestrators = sorted({tag for tags in placement.values() for tag in tags})
+    sharding = dict(
+        Shards={shard: dict(Members=tags, ReplicationFactor=len(tags)) for shard, tags in placement.items()},
+        Orchestrator=dict(Topology=dict(Members=orchestrators, ReplicationFactor=len(orchestrators))))
+
+    class ShardedDatabaseRecord(DatabaseRecord):
+        def to_json(self):
+            record = super(ShardedDatabaseRecord, self).to_json()
+            record["Topology"] = None
+            record["Sharding"] = sharding
+            return record
+
+    class CreateShardedDatabaseCommand(CreateDatabaseOperation.CreateDatabaseCommand):
+        def set_response(self, response, from_cache):
+            self.result = json.loads(response) if response else None
+
+    class CreateShardedDatabaseOperation(CreateDatabaseOperation):
+        def get_command(self, conventions):
+            return CreateShardedDatabaseCommand(conventions, sharded_record, len(orchestrators))
+
+    sharded_record = ShardedDatabaseRecord(database_record.database_name)
+    sharded_record.settings = database_record.settings
+    return store.maintenance.server.send(CreateShardedDatabaseOperation(sharded_record))
+
+
+def reconcile_sharded_database(store, params, check_mode):
+    """
+    Ensure a sharded database exists with the requested number of shards.
+
+    Returns a tuple: (changed: bool, message: str, result: dict, error: Optional[str])
+    """
+    database_name = params['database_name']
+    sharding = params['sharding']
+    shards = sharding['shards']
+    settings = params.get('settings')
+    result = {}
+
+    database_record = get_raw_database_record(store, database_name)
+    if database_record:
+        existing_shards = (database_record.get("Sharding") or {}).get("Shards")
+        if not existing_shards:
+            error = f"Database '{database_name}' already exists and is not sharded."
+            return False, error, result, error
+        if len(existing_shards) != shards:
+            error = (f"Database '{database_name}' already exists with {len(existing_shards)} shards. "
+                     f"Changing the shard count is not supported.")
+            return False, error, result, error
+
+        changed = False
+        messages = [f"Database '{database_name}' already exists with {shards} shards."]
+        if settings:
+            changed, result['settings_changed'], settings_message = reconcile_settings(
+                store, database_name, settings, check_mode)
+            if changed:
+                messages.append(settings_message)
+        return changed, ' '.join(messages), result, None
+
+    placement, error = plan_shard_placement(
+        shards, params['replication_factor'], get_cluster_node_tags(store), sharding.get('placement'))
+    if error:
+        return False, error, result, error
+
+    result['shard_placement'] = placement
+    if settings:
+        result['settings_changed'] = sorted(settings)
+
+    if check_mode:
+        return True, f"Sharded database '{database_name}' would be created with {shards} shards.", result, None
+
+    database_record = DatabaseRecord(database_name)
+    if settings:
+        database_record.settings = normalize_settings(settings)
+    create_sharded_database(store, database_record, placement)
+    return True, f"Sharded database '{database_name}' created successfully with {shards} shards.", result, None
+
+
+def reconcile_present_database(store, params, check_mode):
+    """
+    Ensure the database exists, then reconcile the settings and topology of an existing database.
+
+    Returns a tuple: (changed: bool, message: str, result: dict, error: Optional[str])
+    """
+    if params.get('sharding'):
+        return reconcile_sharded_database(store, params, check_mode)
+
+    database_name = params['database_name']
+    replication_factor = params['replication_factor']
+    settings = params.get('settings')
+    members = params.get('members')
+    result = {}
+
+    created, message = handle_present_state(
+        store, database_name, replication_factor, check_mode,
+        page_size=params['page_size'], settings=settings, members=members)
+    if created:
+        if settings:
+            result['settings_changed'] = sorted(settings)
+        return True, message, result, None
+
+    changed = False
+    messages = [message]
+
+    if settings:
+        settings_changed, result['settings_changed'], settings_message = reconcile_settings(
+            store, database_name, settings, check_mode)
+        if settings_changed:
+            changed = True
+            messages.append(settings_message)
+
+    if members is not None or params.get('reconcile_topology'):
+        topology_changed, result['topology_changes'], topology_message, error = reconcile_topology(
+            store, database_name, replication_factor, check_mode, members, params.get('wait'))
+        if error:
+            return changed, error, result, error
+        if topology_changed:
+            changed = True
+            messages.append(topology_message)
+
+    return changed, ' '.join(messages), result, None
+
+
+def is_node_ready(database_maintenance, node_tag):
+    """Return True if the node answers statistics requests for the database, i.e. it has the database loaded."""
+    try:
+        send_to_node(database_maintenance, GetStatisticsOperation(), node_tag)
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_topology(store, database_name, timeout, interval, tags=None):
+    """
+    Poll the database topology with exponential backoff until every node is a member that serves the database,
+    or only until the given node tags are.
+    Membership comes from the database record; each new member is then asked for the database statistics
+    directly, since the record lists nodes as members before they have loaded the database.
+
+    Returns a tuple: (converged: bool, convergence: dict, message: str)
+    """
+    started = time.monotonic()
+    database_maintenance = get_database_maintenance(store, database_name)
+    nodes = {}
+    pending = []
+
+    while True:
+        topology = get_database_topology(store, database_name)
+
+        for tag in topology.get("Members") or []:
+            if tag not in nodes and is_node_ready(database_maintenance, tag):
+                nodes[tag] = round(time.monotonic() - started, 2)
+        if tags is None:
+            expected = {tag for key in ("Members", "Promotables", "Rehabs") for tag in topology.get(key) or []}
+        else:
+            expected = set(tags)
+        pending = sorted(expected - set(nodes))
+        elapsed = round(time.monotonic() - started, 2)
+
+        if nodes and not pending:
+            convergence = dict(elapsed=elapsed, nodes=nodes)
+            return True, convergence, f"Database '{database_name}' topology converged in {elapsed} seconds."
+
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    convergence = dict(elapsed=round(time.monotonic() - started, 2), nodes=nodes)
+    return False, convergence, (
+        f"Database '{database_name}' topology did not converge within {timeout} seconds. "
+        f"Nodes not ready: {', '.join(pending) or 'none'}.")
+
+
+def toggle_databases_state(store, database_names, disable):
+    """
+    Enable or disable many databases with a single server call.
+    The client only parses the status of the first database, so the full status list is read here.
+
+    Returns a dict: {database name: {Name, Disabled, Success, Reason}}
+    """
+    class ToggleAllDatabasesStateCommand(ToggleDatabasesStateOperation.ToggleDatabaseStateCommand):
+        def set_response(self, response, from_cache):
+            if response is None:
+                self._throw_invalid_response()
+            self.result = json.loads(response).get("Status") or []
+
+    class ToggleAllDatabasesStateOperation(ToggleDatabasesStateOperation):
+        def get_command(self, conventions):
+            return ToggleAllDatabasesStateCommand(self._parameters, self._disable)
+
+    statuses = store.maintenance.server.send(
+        ToggleAllDatabasesStateOperation.from_multiple_names(list(database_names), disable))
+    return {status["Name"]: status for status in statuses or []}
+
+
+def handle_toggle_state(store, database_name, desired_state, check_mode, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Enable or disable an existing database.
+
+    Returns a tuple: (changed: bool, message: str, error: Optional[str])
+    """
+    disable = desired_state == 'disabled'
+    action = "disable" if disable else "enable"
+
+    if not database_exists(store, database_name, page_size):
+        error = f"Database '{database_name}' does not exist. Cannot {action}."
+        return False, error, error
+
+    if is_database_disabled(store, database_name) == disable:
+        return False, f"Database '{database_name}' is already {desired_state}.", None
+
+    if check_mode:
+        return True, f"Database '{database_name}' would be {desired_state}.", None
+
+    status = toggle_databases_state(store, [database_name], disable).get(database_name) or {}
+    if not status.get("Success"):
+        error = f"Failed to {action} database '{database_name}': {status.get('Reason')}"
+        return False, error, error
+    return True, f"Database '{database_name}' {desired_state} successfully.", None
+
+
+def reconcile_database_states(store, databases, existing_databases, max_concurrency, check_mode):
+    """
+    Reconcile the enabled/disabled entries of the C(databases) list.
+    Current states are read concurrently, then every database that needs a change is toggled
+    with one server call per direction.
+
+    Returns a list of dicts: {name, state, changed, failed, msg}
+    """
+    results = {}
+    pending = []
+    for database in databases:
+        name, state = database['name'], database['state']
+        result = dict(name=name, state=state, changed=False, failed=False)
+        results[name] = result
+        if name not in existing_databases:
+            result.update(failed=True, msg=f"Database '{name}' does not exist. Cannot change its state to {state}.")
+        else:
+            pending.append(result)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        disabled_states = list(executor.map(lambda result: is_database_disabled(store, result['name']), pending))
+
+    to_toggle = dict(enabled=[], disabled=[])
+    for result, disabled in zip(pending, disabled_states):
+        if disabled == (result['state'] == 'disabled'):
+            result.update(msg=f"Database '{result['name']}' is already {result['state']}.")
+        elif check_mode:
+            result.update(changed=True, msg=f"Database '{result['name']}' would be {result['state']}.")
+        else:
+            to_toggle[result['state']].append(result['name'])
+
+    for state, names in to_toggle.items():
+        if not names:
+            continue
+        try:
+            statuses = toggle_databases_state(store, names, state == 'disabled')
+        except Exception as e:
+            statuses = {name: dict(Success=False, Reason=str(e)) for name in names}
+        for name in names:
+            status = statuses.get(name) or {}
+            if status.get("Success"):
+                results[name].update(changed=True, msg=f"Database '{name}' {state} successfully.")
+            else:
+                results[name].update(
+                    failed=True, msg=f"Failed to change the state of database '{name}' to {state}: {status.get('Reason')}")
+
+    return [results[database['name']] for database in databases]
+
+
+def summarize_compaction(node, state, elapsed):
+    """Turn a completed compaction operation state into a per-node result."""
+    compaction_result = state.get("Result") or {}
+    size_before = compaction_result.get("SizeBeforeCompactionInMb") or 0
+    size_after = compaction_result.get("SizeAfterCompactionInMb") or 0
+    return dict(
+        node=node,
+        elapsed=elapsed,
+        size_before_mb=size_before,
+        size_after_mb=size_after,
+        reclaimed_mb=max(size_before - size_after, 0))
+
+
+def handle_compacted_state(store, database_name, compaction, check_mode, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Compact the database on each of its nodes, one node at a time, waiting for every compaction to finish.
+
+    Returns a tuple: (changed: bool, message: str, results: list, error: Optional[str])
+    """
+    if not database_exists(store, database_name, page_size):
+        error = f"Database '{database_name}' does not exist. Cannot compact."
+        return False, error, [], error
+
+    nodes = compaction.get('nodes')
+    if not nodes:
+        topology = get_database_topology(store, database_name)
+        nodes = (topology.get("Members") or []) + (topology.get("Promotables") or []) + (topology.get("Rehabs") or [])
+
+    if check_mode:
+        return True, f"Database '{database_name}' would be compacted on nodes {', '.join(nodes)}.", [], None
+
+    settings = CompactSettings(database_name, compaction.get('documents', True), compaction.get('indexes') or [])
+    results = []
+    for node in nodes:
+        operation = store.maintenance.server.for_node(node).send_async(CompactDatabaseOperation(settings))
+        state, elapsed = wait_for_operation(operation, compaction.get('timeout') or 3600)
+
+        if state is None:
+            error = f"Compaction of database '{database_name}' on node {node} did not finish within {elapsed} seconds."
+            return True, error, results, error
+        if state.get("Status") != "Completed":
+            reason = (state.get("Result") or {}).get("Message") or state.get("Status")
+            error = f"Compaction of database '{database_name}' on node {node} failed: {reason}"
+            return True, error, results, error
+
+        results.append(summarize_compaction(node, state, elapsed))
+
+    reclaimed = sum(result['reclaimed_mb'] for result in results)
+    return True, f"Database '{database_name}' compacted on nodes {', '.join(nodes)}, reclaimed {reclaimed} MB.", results, None
+
+
+def reconcile_database(store, database, existing_databases, check_mode):
+    """
+    Reconcile a single entry of the C(databases) list.
+    Errors are captured in the result so that one failing database does not abort the others.
+
+    Returns a dict: {name, state, changed, failed, msg}
+    """
+    name = database['name']
+    state = database.get('state') or 'present'
+    result = dict(name=name, state=state, changed=False, failed=False)
+
+    try:
+        if state == 'present':
+            changed, message = handle_present_state(
+                store, name, database.get('replication_factor') or 1, check_mode, existing_databases)
+        else:
+            changed, message = handle_absent_state(
+                store, name, check_mode, existing_databases)
+        result.update(changed=changed, msg=message)
+    except Exception as e:
+        result.update(failed=True, msg=f"Failed to reconcile database '{name}': {str(e)}")
+
+    return result
+
+
+def reconcile_databases(store, databases, max_concurrency, check_mode, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Reconcile many databases against a single listing of the existing databases.
+    Creations and deletions are sent concurrently with at most max_concurrency in flight,
+    enabling and disabling is batched into one server call per direction.
+
+    Returns a tuple: (changed: bool, results: list)
+    """
+    existing_databases = get_existing_databases(store, page_size)
+    toggled = [database for database in databases if is_valid_toggle_state(database.get('state'))]
+    reconciled = [database for database in databases if not is_valid_toggle_state(database.get('state'))]
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(reconcile_database, store, database, existing_databases, check_mode)
+            for database in reconciled]
+        results = {result['name']: result for result in (future.result() for future in futures)}
+
+    if toggled:
+        for result in reconcile_database_states(store, toggled, existing_databases, max_concurrency, check_mode):
+            results[result['name']] = result
+
+    results = [results[database['name']] for database in databases]
+    changed = any(result['changed'] for result in results)
+    return changed, results
+
+
+def summarize_results(results):
+    """Build a human-readable summary of per-database results."""
+    changed = len([r for r in results if r['changed']])
+    failed = len([r for r in results if r['failed']])
+    return f"Reconciled {len(results)} databases: {changed} changed, {failed} failed."
 
 
 def is_valid_database_name(name):
@@ -230,40 +1170,153 @@ def is_valid_replication_factor(factor):
     return isinstance(factor, int) and factor > 0
 
 
-def is_valid_bool(value):
-    """Return True if the value is a boolean."""
-    return isinstance(value, bool)
+def is_valid_page_size(value):
+    """Return True if the page size is a positive integer."""
+    return isinstance(value, int) and value > 0
 
 
-def validate_paths(*paths):
+def is_valid_concurrency(value):
+    """Return True if the concurrency limit is a positive integer."""
+    return isinstance(value, int) and value > 0
+
+
+def validate_databases(databases):
     """
-    Validate that all given file paths exist on the filesystem.
+    Validate every entry of the databases list.
     Returns a tuple: (valid: bool, error_msg: Optional[str])
     """
-    for path in paths:
-        if path and not os.path.isfile(path):
-            return False, f"Path does not exist: {path}"
+    seen = set()
+    for database in databases:
+        name = database.get('name')
+        if not name or not is_valid_database_name(name):
+            return False, f"Invalid database name: {name}. Only letters, numbers, dashes, and underscores are allowed."
+        if name in seen:
+            return False, f"Duplicate database name: {name}."
+        seen.add(name)
+        replication_factor = database.get('replication_factor') or 1
+        if not is_valid_replication_factor(replication_factor):
+            return False, f"Invalid replication factor for database {name}: {replication_factor}. Must be a positive integer."
+        state = database.get('state') or 'present'
+        if not is_valid_state(state) and not is_valid_toggle_state(state):
+            return False, (f"Invalid state for database {name}: {database.get('state')}. "
+                           "Must be 'present', 'absent', 'enabled' or 'disabled'.")
     return True, None
 
 
+def is_valid_settings(settings):
+    """Return True if settings is None or a dictionary of scalar values keyed by strings."""
+    if settings is None:
+        return True
+    if not isinstance(settings, dict):
+        return False
+    return all(
+        isinstance(key, str) and isinstance(value, (str, int, float, bool))
+        for key, value in settings.items())
+
+
+def is_valid_wait(wait):
+    """Return True if wait is None or has a positive timeout and interval."""
+    if wait is None:
+        return True
+    timeout = wait.get('timeout')
+    interval = wait.get('interval')
+    return (isinstance(timeout, int) and timeout > 0
+            and isinstance(interval, (int, float)) and interval > 0)
+
+
+def is_valid_members(members):
+    """Return True if members is None or a non-empty list of unique uppercase alphanumeric node tags."""
+    if members is None:
+        return True
+    if not isinstance(members, list) or not members or len(set(members)) != len(members):
+        return False
+    return all(isinstance(tag, str) and tag.isalnum() and tag.isupper() for tag in members)
+
+
+def is_valid_sharding(sharding):
+    """Return True if sharding is None or requests a positive number of shards."""
+    if sharding is None:
+        return True
+    shards = sharding.get('shards')
+    placement = sharding.get('placement')
+    return isinstance(shards, int) and shards > 0 and (placement is None or isinstance(placement, dict))
+
+
+def is_valid_bool(value):
+    """Return True if the value is a boolean."""
+    return isinstance(value, bool)
+
+
 def is_valid_state(state):
     """Return True if the state is either 'present' or 'absent'."""
     return state in ['present', 'absent']
 
 
+def is_valid_toggle_state(state):
+    """Return True if the state is either 'enabled' or 'disabled'."""
+    return state in ['enabled', 'disabled']
+
+
+def is_valid_database_state(state):
+    """Return True if the state of a single database is 'present', 'absent', 'enabled', 'disabled' or 'compacted'."""
+    return is_valid_state(state) or is_valid_toggle_state(state) or state == 'compacted'
+
+
 def main():
     module_args = dict(
-        url=dict(
-            type='str', required=True), database_name=dict(
-            type='str', required=True), replication_factor=dict(
-                type='int', default=1), certificate_path=dict(
-                    type='str', required=False), ca_cert_path=dict(
-                        type='str', required=False), state=dict(
-                            type='str', choices=[
-                                'present', 'absent'], default='present'))
+        url=dict(type='str', required=True),
+        database_name=dict(type='str', required=False),
+        databases=dict(
+            type='list',
+            elements='dict',
+            required=False,
+            options=dict(
+                name=dict(type='str', required=True),
+                replication_factor=dict(type='int', default=1),
+                state=dict(type='str', choices=['present', 'absent', 'enabled', 'disabled'], default='present'))),
+        replication_factor=dict(type='int', default=1),
+        members=dict(type='list', elements='str', required=False),
+        reconcile_topology=dict(type='bool', default=False),
+        sharding=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                shards=dict(type='int', required=True),
+                placement=dict(type='dict', required=False))),
+        settings=dict(type='dict', required=False),
+        wait=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                timeout=dict(type='int', default=60),
+                interval=dict(type='float', default=1))),
+        page_size=dict(type='int', default=DEFAULT_PAGE_SIZE),
+        max_concurrency=dict(type='int', default=4),
+        certificate_path=dict(type='str', required=False),
+        ca_cert_path=dict(type='str', required=False),
+        compaction=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                documents=dict(type='bool', default=True),
+                indexes=dict(type='list', elements='str', default=[]),
+                nodes=dict(type='list', elements='str', required=False),
+                timeout=dict(type='int', default=3600))),
+        state=dict(type='str', choices=['present', 'absent', 'enabled', 'disabled', 'compacted'], default='present')
+    )
 
     module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[
+            ('database_name', 'databases'),
+            ('settings', 'databases'),
+            ('members', 'databases'),
+            ('sharding', 'databases'),
+            ('sharding', 'members'),
+            ('sharding', 'reconcile_topology'),
+            ('wait', 'databases'),
+            ('compaction', 'databases')],
+        required_one_of=[('database_name', 'databases')],
         supports_check_mode=True
     )
 
@@ -273,8 +1326,16 @@ def main():
             exception=LIB_IMP_ERR)
 
     url = module.params['url']
-    database_name = module.params['database_name']
+    database_name = module.params.get('database_name')
+    databases = module.params.get('databases')
     replication_factor = module.params['replication_factor']
+    members = module.params.get('members')
+    settings = module.params.get('settings')
+    sharding = module.params.get('sharding')
+    wait = module.params.get('wait')
+    compaction = module.params.get('compaction') or {}
+    page_size = module.params['page_size']
+    max_concurrency = module.params['max_concurrency']
     certificate_path = module.params.get('certificate_path')
     ca_cert_path = module.params.get('ca_cert_path')
     desired_state = module.params['state']
@@ -282,34 +1343,93 @@ def main():
     if not is_valid_url(url):
         module.fail_json(msg=f"Invalid URL: {url}")
 
-    if not is_valid_database_name(database_name):
+    if database_name is not None and not is_valid_database_name(database_name):
         module.fail_json(
             msg=f"Invalid database name: {database_name}. Only letters, numbers, dashes, and underscores are allowed.")
 
+    if databases is not None:
+        valid, error_msg = validate_databases(databases)
+        if not valid:
+            module.fail_json(msg=error_msg)
+
     if not is_valid_replication_factor(replication_factor):
         module.fail_json(
             msg=f"Invalid replication factor: {replication_factor}. Must be a positive integer.")
 
+    if not is_valid_members(members):
+        module.fail_json(
+            msg=f"Invalid members: {members}. Must be a non-empty list of unique uppercase alphanumeric node tags.")
+
+    if not is_valid_sharding(sharding):
+        module.fail_json(
+            msg="Invalid sharding: shards must be a positive integer and placement a dictionary.")
+
+    if not is_valid_settings(settings):
+        module.fail_json(
+            msg="Invalid settings: Must be a dictionary of setting names to scalar values.")
+
+    if not is_valid_wait(wait):
+        module.fail_json(
+            msg="Invalid wait: timeout and interval must be positive numbers.")
+
+    if not is_valid_page_size(page_size):
+        module.fail_json(
+            msg=f"Invalid page_size: {page_size}. Must be a positive integer.")
+
+    if not is_valid_concurrency(max_concurrency):
+        module.fail_json(
+            msg=f"Invalid max_concurrency: {max_concurrency}. Must be a positive integer.")
+
     valid, error_msg = validate_paths(certificate_path, ca_cert_path)
     if not valid:
         module.fail_json(msg=error_msg)
 
-    if not is_valid_state(desired_state):
+    if not is_valid_database_state(desired_state):
         module.fail_json(
-            msg=f"Invalid state: {desired_state}. Must be 'present' or 'absent'.")
+            msg=f"Invalid state: {desired_state}. Must be 'present', 'absent', 'enabled', 'disabled' or 'compacted'.")
+
+    if desired_state in ['enabled', 'disabled', 'compacted'] and database_name is None:
+        module.fail_json(msg=f"state={desired_state} requires database_name.")
 
     try:
         store = create_store(url, certificate_path, ca_cert_path)
         check_mode = module.check_mode
 
+        if databases is not None:
+            changed, results = reconcile_databases(
+                store, databases, max_concurrency, check_mode, page_size)
+            message = summarize_results(results)
+            if any(result['failed'] for result in results):
+                module.fail_json(changed=changed, msg=message, databases=results)
+            module.exit_json(changed=changed, msg=message, databases=results)
+
+        result = {}
         if desired_state == 'present':
-            changed, message = handle_present_state(
-                store, database_name, replication_factor, check_mode)
+            changed, message, result, error = reconcile_present_database(
+                store, module.params, check_mode)
+            if error:
+                module.fail_json(changed=changed, msg=error, **result)
+
+            if wait and not check_mode:
+                converged, result['convergence'], wait_message = wait_for_topology(
+                    store, database_name, wait['timeout'], wait['interval'])
+                if not converged:
+                    module.fail_json(changed=changed, msg=wait_message, **result)
         elif desired_state == 'absent':
             changed, message = handle_absent_state(
-                store, database_name, check_mode)
+                store, database_name, check_mode, page_size=page_size)
+        elif is_valid_toggle_state(desired_state):
+            changed, message, error = handle_toggle_state(
+                store, database_name, desired_state, check_mode, page_size=page_size)
+            if error:
+                module.fail_json(changed=changed, msg=error)
+        elif desired_state == 'compacted':
+            changed, message, result['compaction'], error = handle_compacted_state(
+                store, database_name, compaction, check_mode, page_size=page_size)
+            if error:
+                module.fail_json(changed=changed, msg=error, **result)
 
-        module.exit_json(changed=changed, msg=message)
+        module.exit_json(changed=changed, msg=message, **result)
 
     except RavenException as e:
         module.fail_json(msg=f"RavenDB operation failed: {str(e)}")
@@ -0,0 +1,405 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: database_import
+short_description: Import a .ravendbdump file into a RavenDB database
+description:
+    - This module imports a RavenDB export (C(.ravendbdump)) into an existing database.
+    - The file is streamed to the server in chunks and is never loaded into memory as a whole.
+    - The import runs as a server operation; the module waits for it to finish and reports its throughput.
+    - By default the import is skipped when the target already contains documents, which makes seeding idempotent.
+    - Check mode is supported to simulate the import without sending the file.
+version_added: "1.0.0"
+author: "Omer Ratsaby <omer.ratsaby@ravendb.net> (@thegoldenplatypus)"
+options:
+    url:
+        description:
+            - URL of the RavenDB server.
+            - Must include the scheme (http or https), hostname and port.
+        required: true
+        type: str
+    database_name:
+        description:
+            - Name of the database to import into. The database must exist.
+        required: true
+        type: str
+    src:
+        description:
+            - Path of the dump file on the host running the module.
+        required: true
+        type: path
+    collections:
+        description:
+            - Only import documents of these collections.
+            - Also limits the emptiness check of C(force=false) to these collections.
+        required: false
+        type: list
+        elements: str
+    include:
+        description:
+            - Types of items to import from the dump. Defaults to the server defaults.
+        required: false
+        type: list
+        elements: str
+        choices:
+          - Documents
+          - RevisionDocuments
+          - Indexes
+          - Identities
+          - Tombstones
+          - Conflicts
+          - CompareExchange
+          - CompareExchangeTombstones
+          - Counters
+          - Attachments
+          - Subscriptions
+          - TimeSeries
+          - DatabaseRecord
+    force:
+        description:
+            - Import even if the target database (or the selected collections) already contains documents.
+        required: false
+        default: false
+        type: bool
+    chunk_size:
+        description:
+            - Number of bytes read from the dump file and sent per chunk.
+        required: false
+        default: 1048576
+        type: int
+    timeout:
+        description:
+            - Maximum number of seconds to wait for the import operation to finish.
+        required: false
+        default: 3600
+        type: int
+    certificate_path:
+        description:
+            - Path to a client certificate (PEM format) for secured communication.
+            - Optional, but recommended for secure connections.
+        required: false
+        type: str
+    ca_cert_path:
+        description:
+            - Path to a trusted CA certificate file to verify the RavenDB server's certificate.
+            - Optional if the server certificate is trusted by system CA store.
+        required: false
+        type: str
+requirements:
+    - python >= 3.9
+    - ravendb python client
+notes:
+    - The module is named C(database_import) because C(import) is a reserved word in Python.
+'''
+
+EXAMPLES = '''
+- name: Seed a database from a dump file
+  ravendb.ravendb.database_import:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "staging"
+    src: "/var/backups/production.ravendbdump"
+
+- name: Import only the Orders and Companies documents, even if the database is not empty
+  ravendb.ravendb.database_import:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "load_test"
+    src: "/var/backups/production.ravendbdump"
+    collections:
+      - Orders
+      - Companies
+    include:
+      - Documents
+    force: true
+    timeout: 7200
+'''
+
+RETURN = '''
+changed:
+    description: Indicates if the dump was imported.
+    type: bool
+    returned: always
+msg:
+    description: Human-readable message describing the result of the import.
+    type: str
+    returned: always
+import_result:
+    description:
+        - Summary of the completed import.
+        - C(elapsed) is the wall-clock time of the upload and import; C(documents_per_second) is based on the
+          processing time reported by the server.
+    type: dict
+    returned: when the dump was imported
+    sample:
+      documents: 125000
+      errored: 0
+      skipped: 0
+      elapsed: 42.1
+      documents_per_second: 2969.1
+      bytes: 734003200
+'''
+
+import traceback
+import json
+import os
+import re
+import time
+import uuid
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ravendb.ravendb.plugins.module_utils.common import (
+    create_store,
+    get_database_maintenance,
+    wait_for_operation,
+    is_valid_url,
+    validate_paths)
+
+LIB_IMP_ERR = None
+try:
+    import requests
+    from ravendb.documents.commands.bulkinsert import GetNextOperationIdCommand
+    from ravendb.documents.operations.operation import Operation
+    from ravendb.documents.operations.statistics import GetCollectionStatisticsOperation
+    from ravendb.http.raven_command import VoidRavenCommand
+    from ravendb.serverwide.operations.common import GetDatabaseRecordOperation
+    from ravendb.exceptions.raven_exceptions import RavenException
+    HAS_LIB = True
+except ImportError:
+    HAS_LIB = False
+    LIB_IMP_ERR = traceback.format_exc()
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def database_exists(store, database_name):
+    """Return True if the database record exists."""
+    return store.maintenance.server.send(GetDatabaseRecordOperation(database_name)) is not None
+
+
+def count_existing_documents(store, database_name, collections=None):
+    """Return the number of documents in the database, or only in the given collections."""
+    statistics = get_database_maintenance(store, database_name).send(GetCollectionStatisticsOperation())
+    if not collections:
+        return statistics.count_of_documents
+    counts = statistics.collections or {}
+    return sum(counts.get(collection, 0) for collection in collections)
+
+
+def build_import_options(collections=None, include=None):
+    """Build the smuggler import options sent along with the dump file."""
+    options = {}
+    if collections:
+        options["Collections"] = collections
+    if include:
+        options["OperateOnTypes"] = ", ".join(include)
+    return options
+
+
+def iter_multipart_body(src, options, boundary, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield a multipart/form-data body with the import options and the dump file, reading the file chunk by chunk."""
+    yield (
+        f'--{boundary}\r\n'
+        'Content-Disposition: form-data; name="importOptions"\r\n'
+        'Content-Type: application/json\r\n\r\n'
+        f'{json.dumps(options)}\r\n'
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{os.path.basename(src)}"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n').encode()
+
+    with open(src, 'rb') as dump:
+        while True:
+            chunk = dump.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+
+def start_import(store, database_name, src, options, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream the dump file to the smuggler import endpoint of the database.
+
+    Returns an Operation that tracks the import on the server.
+    """
+    request_executor = store.get_request_executor(database_name)
+    operation_id_command = GetNextOperationIdCommand()
+    request_executor.execute_command(operation_id_command)
+    operation_id = operation_id_command.result
+    node_tag = operation_id_command.node_tag
+
+    class ImportCommand(VoidRavenCommand):
+        def __init__(self):
+            super().__init__()
+            self._selected_node_tag = node_tag
+
+        def create_request(self, node):
+            boundary = uuid.uuid4().hex
+            return requests.Request(
+                "POST",
+                f"{node.url}/databases/{node.database}/smuggler/import?operationId={operation_id}",
+                data=iter_multipart_body(src, options, boundary, chunk_size),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+
+    request_executor.execute_command(ImportCommand())
+    return Operation(request_executor, None, store.conventions, operation_id, node_tag)
+
+
+def parse_time_span(value):
+    """Convert a .NET TimeSpan string ('[d.]hh:mm:ss[.fffffff]') to seconds, or None if it cannot be parsed."""
+    match = re.match(r"^(?:(\d+)\.)?(\d+):(\d+):(\d+(?:\.\d+)?)$", value or "")
+    if not match:
+        return None
+    days, hours, minutes, seconds = match.groups()
+    return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def summarize_import(state, elapsed):
+    """
+    Turn a completed smuggler operation state into the import summary.
+    The rate uses the duration reported by the server, since the elapsed time also includes the
+    upload and the poll backoff; the elapsed time is the fallback when the server reports none.
+    """
+    result = state.get("Result") or {}
+    documents = result.get("Documents") or {}
+    imported = documents.get("ReadCount") or 0
+    duration = parse_time_span(result.get("Elapsed")) or elapsed
+    return dict(
+        documents=imported,
+        errored=documents.get("ErroredCount") or 0,
+        skipped=documents.get("SkippedCount") or 0,
+        bytes=documents.get("SizeInBytes") or 0,
+        elapsed=elapsed,
+        documents_per_second=round(imported / duration, 1) if duration > 0 else float(imported))
+
+
+def import_dump(store, params, check_mode):
+    """
+    Import the dump file unless the target already holds documents and force is not set.
+
+    Returns a tuple: (changed: bool, message: str, result: dict, error: Optional[str])
+    """
+    database_name = params['database_name']
+    src = params['src']
+    collections = params.get('collections')
+
+    if not database_exists(store, database_name):
+        error = f"Database '{database_name}' does not exist. Cannot import."
+        return False, error, {}, error
+
+    if not params.get('force'):
+        existing = count_existing_documents(store, database_name, collections)
+        if existing:
+            target = f"collections {', '.join(collections)} of database" if collections else "database"
+            return False, f"Found {existing} existing documents in {target} '{database_name}'. Import skipped.", {}, None
+
+    if check_mode:
+        return True, f"File '{src}' would be imported into database '{database_name}'.", {}, None
+
+    started = time.monotonic()
+    options = build_import_options(collections, params.get('include'))
+    operation = start_import(store, database_name, src, options, params.get('chunk_size') or DEFAULT_CHUNK_SIZE)
+    state, _ = wait_for_operation(operation, params.get('timeout') or 3600)
+    elapsed = round(time.monotonic() - started, 2)
+
+    if state is None:
+        error = f"Import into database '{database_name}' did not finish within {elapsed} seconds."
+        return True, error, {}, error
+    if state.get("Status") != "Completed":
+        reason = (state.get("Result") or {}).get("Message") or state.get("Status")
+        error = f"Import into database '{database_name}' failed: {reason}"
+        return True, error, {}, error
+
+    result = summarize_import(state, elapsed)
+    message = (f"Imported {result['documents']} documents into database '{database_name}' "
+               f"in {elapsed} seconds ({result['documents_per_second']} documents/s).")
+    return True, message, dict(import_result=result), None
+
+
+def is_valid_database_name(name):
+    """Check if the database name is valid (letters, numbers, dashes, underscores)."""
+    return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
+
+
+def is_valid_positive_int(value):
+    """Return True if the value is a positive integer."""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def main():
+    module_args = dict(
+        url=dict(type='str', required=True),
+        database_name=dict(type='str', required=True),
+        src=dict(type='path', required=True),
+        collections=dict(type='list', elements='str', required=False),
+        include=dict(
+            type='list',
+            elements='str',
+            required=False,
+            choices=[
+                'Documents', 'RevisionDocuments', 'Indexes', 'Identities', 'Tombstones', 'Conflicts',
+                'CompareExchange', 'CompareExchangeTombstones', 'Counters', 'Attachments', 'Subscriptions',
+                'TimeSeries', 'DatabaseRecord']),
+        force=dict(type='bool', default=False),
+        chunk_size=dict(type='int', default=DEFAULT_CHUNK_SIZE),
+        timeout=dict(type='int', default=3600),
+        certificate_path=dict(type='str', required=False),
+        ca_cert_path=dict(type='str', required=False)
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    if not HAS_LIB:
+        module.fail_json(
+            msg=missing_required_lib("ravendb"),
+            exception=LIB_IMP_ERR)
+
+    url = module.params['url']
+    database_name = module.params['database_name']
+    certificate_path = module.params.get('certificate_path')
+    ca_cert_path = module.params.get('ca_cert_path')
+
+    if not is_valid_url(url):
+        module.fail_json(msg=f"Invalid URL: {url}")
+
+    if not is_valid_database_name(database_name):
+        module.fail_json(
+            msg=f"Invalid database name: {database_name}. Only letters, numbers, dashes, and underscores are allowed.")
+
+    for option in ['chunk_size', 'timeout']:
+        if not is_valid_positive_int(module.params[option]):
+            module.fail_json(
+                msg=f"Invalid {option}: {module.params[option]}. Must be a positive integer.")
+
+    valid, error_msg = validate_paths(module.params['src'], certificate_path, ca_cert_path)
+    if not valid:
+        module.fail_json(msg=error_msg)
+
+    try:
+        store = create_store(url, certificate_path, ca_cert_path)
+        changed, message, result, error = import_dump(store, module.params, module.check_mode)
+        if error:
+            module.fail_json(changed=changed, msg=error, **result)
+        module.exit_json(changed=changed, msg=message, **result)
+
+    except RavenException as e:
+        module.fail_json(msg=f"RavenDB operation failed: {str(e)}")
+    except Exception as e:
+        module.fail_json(msg=f"An unexpected error occurred: {str(e)}")
+    finally:
+        if 'store' in locals():
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
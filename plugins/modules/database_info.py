@@ -0,0 +1,301 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: database_info
+short_description: Gather statistics of RavenDB databases
+description:
+    - This module collects statistics of one RavenDB database, or of every database on the server.
+    - Reports the document count, data and index size on disk, stale index count and last document etag.
+    - Statistics of many databases are collected concurrently through a single document store.
+    - The module never changes anything and supports check mode.
+version_added: "1.0.0"
+author: "Omer Ratsaby <omer.ratsaby@ravendb.net> (@thegoldenplatypus)"
+options:
+    url:
+        description:
+            - URL of the RavenDB server.
+            - Must include the scheme (http or https), hostname and port.
+        required: true
+        type: str
+    database_name:
+        description:
+            - Name of the database to collect statistics for.
+            - If omitted, statistics are collected for every database on the server.
+        required: false
+        type: str
+    max_concurrency:
+        description:
+            - Maximum number of databases whose statistics are collected in parallel.
+            - Must be a positive integer.
+        required: false
+        default: 8
+        type: int
+    page_size:
+        description:
+            - Number of database names requested per page when listing the existing databases.
+        required: false
+        default: 128
+        type: int
+    certificate_path:
+        description:
+            - Path to a client certificate (PEM format) for secured communication.
+            - Optional, but recommended for secure connections.
+        required: false
+        type: str
+    ca_cert_path:
+        description:
+            - Path to a trusted CA certificate file to verify the RavenDB server's certificate.
+            - Optional if the server certificate is trusted by system CA store.
+        required: false
+        type: str
+requirements:
+    - python >= 3.9
+    - ravendb python client
+notes:
+    - Disabled databases cannot report statistics. They are listed with C(disabled=true) and no statistics.
+    - Sizes are the space allocated on disk by the node serving the request.
+'''
+
+EXAMPLES = '''
+- name: Gather statistics of a single database
+  ravendb.ravendb.database_info:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+  register: database_info
+
+- name: Gather statistics of every database
+  ravendb.ravendb.database_info:
+    url: "http://{{ ansible_host }}:8080"
+    max_concurrency: 16
+  register: all_databases_info
+
+- name: Gather statistics from a secured server
+  ravendb.ravendb.database_info:
+    url: "https://{{ ansible_host }}:443"
+    certificate_path: "combined_raven_cert.pem"
+    ca_cert_path: "ca_certificate.pem"
+'''
+
+RETURN = '''
+changed:
+    description: Always false, the module does not change anything.
+    type: bool
+    returned: always
+msg:
+    description: Human-readable summary of the collected statistics.
+    type: str
+    returned: always
+databases:
+    description: Statistics of each database, in listing order.
+    type: list
+    elements: dict
+    returned: always
+    sample:
+      - name: my_database
+        disabled: false
+        documents_count: 125000
+        data_size_bytes: 734003200
+        index_size_bytes: 209715200
+        indexes_count: 12
+        stale_indexes_count: 1
+        last_doc_etag: 250012
+'''
+
+import traceback
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ravendb.ravendb.plugins.module_utils.common import (
+    create_store,
+    iter_database_names,
+    get_database_maintenance,
+    is_database_disabled,
+    is_valid_url,
+    validate_paths,
+    DEFAULT_PAGE_SIZE)
+
+LIB_IMP_ERR = None
+try:
+    from ravendb.documents.operations.statistics import GetStatisticsOperation
+    from ravendb.exceptions.raven_exceptions import RavenException
+    HAS_LIB = True
+except ImportError:
+    HAS_LIB = False
+    LIB_IMP_ERR = traceback.format_exc()
+
+
+def get_storage_report(store, database_name):
+    """Fetch the storage report of the database, listing the allocated space of every storage environment."""
+    class GetStorageReportCommand(GetStatisticsOperation._GetStatisticsCommand):
+        def create_request(self, node):
+            request = super().create_request(node)
+            request.url = f"{node.url}/databases/{node.database}/debug/storage/report"
+            return request
+
+        def set_response(self, response, from_cache):
+            self.result = json.loads(response) if response else None
+
+    class GetStorageReportOperation(GetStatisticsOperation):
+        def get_command(self, conventions):
+            return GetStorageReportCommand()
+
+    return get_database_maintenance(store, database_name).send(GetStorageReportOperation())
+
+
+def summarize_storage_report(report):
+    """
+    Sum the allocated space of the data file and journals per environment type.
+
+    Returns a tuple: (data_size_bytes: int, index_size_bytes: int)
+    """
+    data_size = 0
+    index_size = 0
+    for environment in (report or {}).get("Results") or []:
+        storage = environment.get("Report") or {}
+        size = (storage.get("DataFile") or {}).get("AllocatedSpaceInBytes") or 0
+        size += sum(journal.get("AllocatedSpaceInBytes") or 0 for journal in storage.get("Journals") or [])
+        if environment.get("Type") == "Index":
+            index_size += size
+        else:
+            data_size += size
+    return data_size, index_size
+
+
+def collect_database_info(store, database_name):
+    """
+    Collect the statistics of a single database.
+    Errors are captured in the result so that one failing database does not abort the others.
+
+    Returns a dict: {name, disabled, documents_count, data_size_bytes, index_size_bytes,
+    indexes_count, stale_indexes_count, last_doc_etag} or {name, failed, msg}
+    """
+    info = dict(name=database_name, disabled=False)
+    try:
+        statistics = get_database_maintenance(store, database_name).send(GetStatisticsOperation())
+        data_size, index_size = summarize_storage_report(get_storage_report(store, database_name))
+    except Exception as e:
+        try:
+            disabled = is_database_disabled(store, database_name)
+        except Exception:
+            disabled = False
+        if disabled:
+            info.update(disabled=True)
+            return info
+        info.update(failed=True, msg=f"Failed to collect statistics of database '{database_name}': {str(e)}")
+        return info
+
+    indexes = statistics.indexes or []
+    info.update(
+        documents_count=statistics.count_of_documents,
+        data_size_bytes=data_size,
+        index_size_bytes=index_size,
+        indexes_count=len(indexes),
+        stale_indexes_count=len([index for index in indexes if index.stale]),
+        last_doc_etag=statistics.last_doc_etag)
+    return info
+
+
+def collect_databases_info(store, database_names, max_concurrency):
+    """Collect the statistics of many databases concurrently, with at most max_concurrency requests in flight."""
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(executor.map(lambda name: collect_database_info(store, name), database_names))
+
+
+def summarize_info(databases):
+    """Build a human-readable summary of the collected statistics."""
+    failed = len([info for info in databases if info.get('failed')])
+    documents = sum(info.get('documents_count') or 0 for info in databases)
+    return f"Collected statistics of {len(databases)} databases: {documents} documents, {failed} failed."
+
+
+def is_valid_database_name(name):
+    """Check if the database name is valid (letters, numbers, dashes, underscores)."""
+    return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
+
+
+def is_valid_positive_int(value):
+    """Return True if the value is a positive integer."""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def main():
+    module_args = dict(
+        url=dict(type='str', required=True),
+        database_name=dict(type='str', required=False),
+        max_concurrency=dict(type='int', default=8),
+        page_size=dict(type='int', default=DEFAULT_PAGE_SIZE),
+        certificate_path=dict(type='str', required=False),
+        ca_cert_path=dict(type='str', required=False)
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    if not HAS_LIB:
+        module.fail_json(
+            msg=missing_required_lib("ravendb"),
+            exception=LIB_IMP_ERR)
+
+    url = module.params['url']
+    database_name = module.params.get('database_name')
+    max_concurrency = module.params['max_concurrency']
+    page_size = module.params['page_size']
+    certificate_path = module.params.get('certificate_path')
+    ca_cert_path = module.params.get('ca_cert_path')
+
+    if not is_valid_url(url):
+        module.fail_json(msg=f"Invalid URL: {url}")
+
+    if database_name is not None and not is_valid_database_name(database_name):
+        module.fail_json(
+            msg=f"Invalid database name: {database_name}. Only letters, numbers, dashes, and underscores are allowed.")
+
+    if not is_valid_positive_int(max_concurrency):
+        module.fail_json(
+            msg=f"Invalid max_concurrency: {max_concurrency}. Must be a positive integer.")
+
+    if not is_valid_positive_int(page_size):
+        module.fail_json(
+            msg=f"Invalid page_size: {page_size}. Must be a positive integer.")
+
+    valid, error_msg = validate_paths(certificate_path, ca_cert_path)
+    if not valid:
+        module.fail_json(msg=error_msg)
+
+    try:
+        store = create_store(url, certificate_path, ca_cert_path)
+
+        if database_name is not None:
+            database_names = [database_name]
+        else:
+            database_names = list(iter_database_names(store, page_size))
+
+        databases = collect_databases_info(store, database_names, max_concurrency)
+        message = summarize_info(databases)
+        if any(info.get('failed') for info in databases):
+            module.fail_json(changed=False, msg=message, databases=databases)
+        module.exit_json(changed=False, msg=message, databases=databases)
+
+    except RavenException as e:
+        module.fail_json(msg=f"RavenDB operation failed: {str(e)}")
+    except Exception as e:
+        module.fail_json(msg=f"An unexpected error occurred: {str(e)}")
+    finally:
+        if 'store' in locals():
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
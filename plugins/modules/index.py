@@ -16,6 +16,9 @@ description:
     - This module allows you to create, delete, pause, resume, enable, disable, or reset RavenDB indexes.
     - Supports check mode to simulate changes without applying them.
     - Can create dynamic single-map and multi-map indexes based on a provided index definition.
+    - Can deploy a whole list of indexes with a single put-indexes request, optionally removing undeclared indexes.
+    - Definitions are compared on tokens, so whitespace, line wrapping and comments in map and reduce
+      do not cause an update (and a full reindex). The reason of every update is reported.
 version_added: "1.0.0"
 author: "Omer Ratsaby <omer.ratsaby@ravendb.net> (@thegoldenplatypus)"
 options:
@@ -28,20 +31,120 @@ options:
     database_name:
         description:
             - Name of the database where the index resides/should be reside.
-        required: true
+            - One of C(database_name) or C(database_names) is required.
+        required: false
         type: str
+    database_names:
+        description:
+            - Apply the same index operation to many databases, e.g. every tenant database.
+            - Entries containing C(*), C(?) or C([) are glob patterns matched against the existing databases,
+              other entries are used as given.
+            - All databases share one connection and are processed concurrently, bounded by C(max_concurrency).
+              The outcome of every database is returned as C(databases) and one failing database does not
+              stop the others.
+            - Mutually exclusive with C(database_name). C(mode) is only supported together with C(reset_waves).
+        required: false
+        type: list
+        elements: str
+    max_concurrency:
+        description:
+            - Maximum number of databases processed in parallel when C(database_names) is used.
+            - Must be a positive integer.
+        required: false
+        default: 4
+        type: int
     index_name:
         description:
             - Name of the index to create, delete, or modify.
             - Must consist only of letters, numbers, dashes, and underscores.
-        required: true
+            - Mutually exclusive with C(indexes) and C(index_names).
+            - One of C(index_name), C(indexes), C(mode) or C(auto_indexes) is required.
+        required: false
         type: str
+    index_names:
+        description:
+            - Names of existing indexes to apply C(mode) to.
+            - The index statuses are fetched once and reused for every name.
+            - Mutually exclusive with C(index_name), C(index_definition), C(indexes) and C(state).
+        required: false
+        type: list
+        elements: str
     index_definition:
         description:
-            - Dictionary defining the index (maps and optional reduce).
+            - Dictionary defining the index.
+            - C(map) is a list of map functions, C(reduce) an optional reduce function.
+            - C(search_engine) selects the search engine of the index, C(lucene) or C(corax).
+              Defaults to the server configuration.
+            - C(fields) maps field names to their options. C(indexing) is one of C(no), C(search), C(exact),
+              C(highlighting) or C(default). C(storage) is a boolean. C(term_vector) is one of C(no), C(yes),
+              C(with_positions), C(with_offsets) or C(with_positions_and_offsets). C(spatial) is a dictionary
+              with C(type) (C(geography) or C(cartesian)), C(strategy) (C(geohash_prefix_tree),
+              C(quad_prefix_tree) or C(bounding_box)), C(max_tree_level), C(min_x), C(max_x), C(min_y),
+              C(max_y) and C(units) (C(kilometers) or C(miles)).
+            - C(additional_sources) maps source names to C# code available to the maps and reduce.
+            - C(configuration) maps per-index indexing settings (e.g. C(Indexing.MapBatchSize)) to their values.
+            - The search engine, configuration, field options and additional sources are compared along with
+              the maps and reduce to decide whether the index must be updated.
+            - C(priority) (C(low), C(normal) or C(high)) and C(lock_mode) (C(unlock), C(locked_ignore) or
+              C(locked_error)) are compared with the live index and set only when they differ, without
+              redeploying the index. When omitted they are left as they are.
             - Required when creating a new index.
         required: false
         type: dict
+    indexes:
+        description:
+            - List of indexes to deploy in a single invocation.
+            - All existing definitions are fetched once, and every new or changed definition is sent
+              in one put-indexes request.
+            - Mutually exclusive with C(index_name), C(index_definition), C(state) and C(mode).
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - Name of the index.
+                    - Must consist only of letters, numbers, dashes, and underscores.
+                required: true
+                type: str
+            index_definition:
+                description:
+                    - Dictionary defining the index, in the same format as the C(index_definition) option.
+                required: true
+                type: dict
+    auto_indexes:
+        description:
+            - Manage the auto indexes the server created for dynamic queries.
+            - Lists every auto index with its last query time (the most recent of all nodes) and idle days,
+              returned as C(auto_indexes).
+            - Mutually exclusive with C(index_name), C(index_names), C(indexes), C(index_definition),
+              C(state) and C(mode).
+            - In check mode the idle auto indexes are reported but not deleted.
+        required: false
+        type: dict
+        suboptions:
+            max_idle_days:
+                description:
+                    - Delete auto indexes that were not queried for longer than this number of days.
+                    - An auto index that was never queried is idle since its creation.
+                    - If omitted, auto indexes are only listed.
+                required: false
+                type: float
+            suggestions:
+                description:
+                    - Also return the server's index merge suggestions.
+                    - The suggestions require a license that includes them, otherwise
+                      C(suggestions_error) explains why they are missing.
+                required: false
+                default: true
+                type: bool
+    prune:
+        description:
+            - When C(indexes) is used, delete static indexes that are not declared in the list.
+            - Auto indexes created by the server are never deleted.
+        required: false
+        type: bool
+        default: false
     certificate_path:
         description:
             - Path to a client certificate (PEM format) for secured communication.
@@ -64,7 +167,9 @@ options:
           - absent
     mode:
         description:
-            - Operational mode to apply to an existing index.
+            - Operational mode to apply to an existing index, or to every index listed in C(index_names).
+            - Without C(index_name), C(index_names) and C(indexes), C(paused) and C(resumed) stop or start
+              indexing of the whole database on every node of the database group, e.g. around bulk loads.
         required: false
         type: str
         choices:
@@ -73,12 +178,115 @@ options:
           - enabled
           - disabled
           - reset
+    reset_waves:
+        description:
+            - Reset C(index_name) in waves instead of on all nodes at once, waiting until every database of a
+              wave is up to date again before the next wave starts. Requires C(mode=reset).
+            - Works with C(database_name) or with every database of C(database_names).
+            - In check mode the wave plan is returned as C(reset) and nothing is reset.
+        required: false
+        type: dict
+        suboptions:
+            per:
+                description:
+                    - C(node) resets the index on one node of one database per step,
+                      C(database) resets it on all nodes of a database per step.
+                required: false
+                default: node
+                type: str
+                choices:
+                  - node
+                  - database
+            size:
+                description:
+                    - Number of steps (nodes or databases) reset together in one wave.
+                required: false
+                default: 1
+                type: int
+            timeout:
+                description:
+                    - Maximum number of seconds to wait for a wave to become non-stale.
+                required: false
+                default: 600
+                type: int
+            interval:
+                description:
+                    - Initial number of seconds between polls, doubled after every poll up to 10 seconds.
+                required: false
+                default: 1
+                type: float
     cluster_wide:
         description:
             - Whether to apply enable/disable operations cluster-wide.
         required: false
         type: bool
         default: false
+    deployment_mode:
+        description:
+            - How a new or changed index definition is deployed across the nodes of the database group.
+            - C(rolling) builds the index on one node at a time, C(parallel) on all nodes at once.
+            - Defaults to the server configuration.
+        required: false
+        type: str
+        choices:
+          - rolling
+          - parallel
+    test_sample_size:
+        description:
+            - In check mode, run a new or changed definition on the server's test-index endpoint against
+              up to this many existing documents before reporting that the index would be created.
+            - Reports compilation errors (and fails), the number of map results and index entries, the map
+              results per document and the time taken, so that a map that fans out or is slow is caught
+              before a cluster-wide reindex.
+            - The time is measured by the client and includes compiling the index.
+            - Use C(0) to skip the test.
+        required: false
+        default: 100
+        type: int
+    wait_for_non_stale:
+        description:
+            - With C(state=present), wait until the index is up to date on every node of the database group,
+              polling index statistics with exponential backoff.
+            - Applies after the index is created or updated, and also when the existing index already
+              matches the definition but is still stale.
+            - Reports the time and the indexing throughput (mapped documents per second) of every node.
+            - Mutually exclusive with C(mode).
+        required: false
+        type: dict
+        suboptions:
+            timeout:
+                description:
+                    - Maximum number of seconds to wait.
+                required: false
+                default: 600
+                type: int
+            interval:
+                description:
+                    - Initial number of seconds between polls, doubled after every poll up to 10 seconds.
+                required: false
+                default: 1
+                type: float
+    wait_for_replacement:
+        description:
+            - After a single index is created or updated, wait until every node runs the new definition
+              and the index is no longer stale. Reports the time each node took.
+            - A node is done once its rolling deployment finished, no side-by-side replacement index
+              (C(ReplacementOf/<name>)) remains and the index is up to date.
+        required: false
+        type: dict
+        suboptions:
+            timeout:
+                description:
+                    - Maximum number of seconds to wait.
+                required: false
+                default: 600
+                type: int
+            interval:
+                description:
+                    - Initial number of seconds between polls, doubled after every poll up to 10 seconds.
+                required: false
+                default: 1
+                type: float
 requirements:
     - python >= 3.9
     - ravendb python client
@@ -135,6 +343,50 @@ EXAMPLES = '''
         }
     state: present
 
+- name: Create a Corax index that only stores the projected fields
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_name: "Users_Search"
+    index_definition:
+      map:
+        - "from u in docs.Users select new { u.Name, Bio = Helpers.Normalize(u.Bio), Location = CreateSpatialField(u.Lat, u.Lng) }"
+      search_engine: corax
+      fields:
+        Name:
+          indexing: exact
+          storage: true
+        Bio:
+          indexing: search
+          storage: false
+          term_vector: "no"
+        Location:
+          spatial:
+            type: geography
+            strategy: bounding_box
+            units: kilometers
+      additional_sources:
+        Helpers: |
+          public static class Helpers
+          {
+              public static string Normalize(string value) => value?.Trim().ToLowerInvariant();
+          }
+    state: present
+
+- name: Run a reporting index at low priority with smaller map batches and lock it against changes
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_name: "Orders_Report"
+    index_definition:
+      map:
+        - "from o in docs.Orders select new { o.Company, o.Total }"
+      priority: low
+      lock_mode: locked_error
+      configuration:
+        Indexing.MapBatchSize: 1024
+    state: present
+
 - name: Delete a RavenDB index
   ravendb.ravendb.index:
     url: "http://{{ ansible_host }}:8080"
@@ -171,6 +423,27 @@ EXAMPLES = '''
     index_name: "Orders/ByCompany"
     mode: resumed
 
+- name: Pause several indexes
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_names:
+      - "OrdersByCompany"
+      - "OrdersTotals"
+    mode: paused
+
+- name: Stop all indexing of a database before a bulk load
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    mode: paused
+
+- name: Start indexing of the database again after the bulk load
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    mode: resumed
+
 - name: Reset a RavenDB index
   ravendb.ravendb.index:
     url: "http://{{ ansible_host }}:8080"
@@ -178,6 +451,86 @@ EXAMPLES = '''
     index_name: "Orders/ByCompany"
     mode: reset
 
+- name: Reset an index in every tenant database, two databases at a time
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_names:
+      - "tenant-*"
+    index_name: "UsersByName"
+    mode: reset
+    reset_waves:
+      per: database
+      size: 2
+      timeout: 1800
+
+- name: Deploy all indexes of a database in one request and remove undeclared ones
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    prune: true
+    indexes:
+      - name: "Users_ByName"
+        index_definition:
+          map:
+            - "from u in docs.Users select new { u.Name }"
+      - name: "Orders_ByCompany"
+        index_definition:
+          map:
+            - "from o in docs.Orders select new { o.Company, Count = 1 }"
+          reduce: >
+            from result in results
+            group result by result.Company
+            into g
+            select new { Company = g.Key, Count = g.Sum(x => x.Count) }
+
+- name: Roll out a changed index one node at a time and wait for the replacement to be swapped in
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_name: "UsersByName"
+    index_definition:
+      map:
+        - "from c in docs.Users select new { c.name, c.email }"
+    deployment_mode: rolling
+    wait_for_replacement:
+      timeout: 1800
+    state: present
+
+- name: Create an index and wait until it is up to date on every node
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_name: "UsersByName"
+    index_definition:
+      map:
+        - "from c in docs.Users select new { c.name }"
+    wait_for_non_stale:
+      timeout: 900
+    state: present
+  register: index_result
+
+- name: Delete auto indexes that were not queried for 30 days and show merge suggestions
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    auto_indexes:
+      max_idle_days: 30
+  register: auto_indexes_result
+
+- name: Deploy an index to every tenant database
+  ravendb.ravendb.index:
+    url: "http://{{ ansible_host }}:8080"
+    database_names:
+      - "tenant-*"
+      - "shared"
+    max_concurrency: 8
+    index_name: "UsersByName"
+    index_definition:
+      map:
+        - "from u in docs.Users select new { u.name }"
+    state: present
+  register: tenants_result
+
 - name: Update an existing RavenDB index definition
   ravendb.ravendb.index:
     url: "http://{{ ansible_host }}:8080"
@@ -211,29 +564,216 @@ msg:
     returned: always
     sample: Index 'Products_ByName' created successfully.
     version_added: "1.0.0"
+
+indexes:
+    description:
+        - Names of the indexes grouped by the action taken when C(indexes) is used.
+        - C(reasons) explains, per updated index, why its definition was considered changed.
+        - C(settings) lists, per existing index, the priority and lock mode changes applied without redeploying it.
+    type: dict
+    returned: when C(indexes) is used
+    sample:
+      created: ["Users/ByName"]
+      updated: ["Orders/ByCompany"]
+      deleted: ["Orders/Totals"]
+      unchanged: []
+      reasons:
+        Orders/ByCompany: reduce differs
+      settings:
+        Orders/ByCompany: priority Normal -> Low
+
+indexing:
+    description:
+        - Time and indexing throughput of every node when C(wait_for_non_stale) is used.
+        - C(documents) counts the documents mapped by the new definition, or while waiting for an unchanged index.
+    type: dict
+    returned: when C(wait_for_non_stale) is used
+    sample:
+      elapsed: 42.7
+      nodes:
+        - node: A
+          elapsed: 40.1
+          documents: 1250000
+          documents_per_second: 31172.1
+
+reset:
+    description:
+        - Wave plan of a reset with C(reset_waves). Every wave lists the databases and nodes it resets.
+        - Outside check mode every finished wave also reports how long it took to become non-stale.
+    type: dict
+    returned: when C(reset_waves) is used
+    sample:
+      elapsed: 95.4
+      waves:
+        - targets:
+            - database: my_database
+              nodes: ["A"]
+          elapsed: 48.1
+        - targets:
+            - database: my_database
+              nodes: ["B"]
+          elapsed: 47.3
+
+databases:
+    description:
+        - Outcome of every database when C(database_names) is used, in the order the names were given.
+        - Besides C(name), C(changed), C(failed) and C(msg) every entry holds the values the module returns
+          for a single database (e.g. C(indexes) or C(test)).
+    type: list
+    elements: dict
+    returned: when C(database_names) is used
+    sample:
+      - name: tenant-1
+        changed: true
+        failed: false
+        msg: "Index 'UsersByName' created successfully."
+      - name: tenant-2
+        changed: false
+        failed: false
+        msg: "Index 'UsersByName' already exists and matches definition."
+
+auto_indexes:
+    description:
+        - Auto indexes with their last query time when C(auto_indexes) is used.
+        - C(deleted) lists the idle auto indexes that were (or in check mode would be) deleted.
+        - C(suggestions) holds the server's index merge suggestions, or is null with C(suggestions_error)
+          when they are unavailable.
+    type: dict
+    returned: when C(auto_indexes) is used
+    sample:
+      indexes:
+        - name: Auto/Orders/ByCompany
+          last_querying_time: "2024-05-02T08:14:55.1234567Z"
+          idle_days: 41.3
+          entries_count: 830
+          stale: false
+      deleted: ["Auto/Orders/ByCompany"]
+      suggestions:
+        merge:
+          - indexes: ["Auto/Users/ByName", "Auto/Users/ByAge"]
+            merged_maps: ["from doc in docs.Users select new { doc.Name, doc.Age }"]
+        delete:
+          - indexes: ["Auto/Users/ByName"]
+            surpassing_index: Auto/Users/ByAgeAndName
+        unmergeable: {}
+
+test:
+    description:
+        - Result of running the definition on the server's test-index endpoint in check mode.
+        - C(entries_per_document) is the number of map results per sampled document.
+    type: dict
+    returned: in check mode, when the index would be created or updated and C(test_sample_size) is not 0
+    sample:
+      compiled: true
+      errors: []
+      documents: 100
+      map_results: 300
+      index_entries: 300
+      reduce_results: 0
+      entries_per_document: 3.0
+      elapsed_ms: 2310.4
+      ms_per_document: 23.1
+
+deployment:
+    description: Time taken by each node to deploy the index when C(wait_for_replacement) is used.
+    type: dict
+    returned: when C(wait_for_replacement) is used and the index was created or updated
+    sample:
+      elapsed: 84.2
+      nodes:
+        - node: A
+          elapsed: 30.5
+        - node: B
+          elapsed: 27.9
 '''
 
 import traceback
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from enum import Enum
+from urllib.parse import quote
+import json
 import re
-import os
-import sys
+import time
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ravendb.ravendb.plugins.module_utils.common import (
+    initialize_ravendb_store,
+    iter_database_names,
+    get_database_maintenance,
+    get_database_nodes,
+    send_to_node,
+    is_valid_url,
+    validate_paths)
+
+LINQ_TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>@"(?:[^"]|"")*"|\$?"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+  | (?P<word>\w+)
+  | (?P<operator>=>|==|!=|<=|>=|&&|\|\||\?\?|\S)
+""", re.VERBOSE | re.DOTALL)
+
+SEARCH_ENGINE_SETTING = "Indexing.Static.SearchEngineType"
+SEARCH_ENGINES = ['lucene', 'corax']
+PRIORITIES = ['low', 'normal', 'high']
+LOCK_MODES = ['unlock', 'locked_ignore', 'locked_error']
+FIELD_OPTIONS = ['indexing', 'storage', 'term_vector', 'spatial']
+FIELD_INDEXING = ['no', 'search', 'exact', 'highlighting', 'default']
+FIELD_TERM_VECTORS = ['no', 'yes', 'with_positions', 'with_offsets', 'with_positions_and_offsets']
+FIELD_DEFAULTS = {"Indexing": "Default", "Storage": "No", "TermVector": "No"}
+SPATIAL_OPTIONS = ['type', 'strategy', 'max_tree_level', 'min_x', 'max_x', 'min_y', 'max_y', 'units']
+SPATIAL_TYPES = ['geography', 'cartesian']
+SPATIAL_STRATEGIES = ['geohash_prefix_tree', 'quad_prefix_tree', 'bounding_box']
+SPATIAL_UNITS = ['kilometers', 'miles']
+REPLACEMENT_PREFIX = "ReplacementOf/"
+MAX_POLL_INTERVAL = 10
+MAX_PAGE_SIZE = 2 ** 31 - 1
+TEST_INDEX_TIMEOUT = 15
+GLOB_CHARACTERS = "*?["
+COMPILATION_ERROR_PATTERN = re.compile(r"\(\d+,\d+\): error \w+: [^\r\n]*")
+SOURCE_COLLECTION_PATTERN = re.compile(r"\bdocs\.(\w+)")
 
 LIB_IMP_ERR = None
 try:
-    from ravendb import DocumentStore, AbstractIndexCreationTask
+    from ravendb import AbstractIndexCreationTask
     from ravendb.documents.indexes.abstract_index_creation_tasks import AbstractMultiMapIndexCreationTask
+    import requests
     from ravendb.documents.operations.indexes import (
-        GetIndexesOperation,
+        GetIndexNamesOperation,
+        GetIndexStatisticsOperation,
+        GetIndexesStatisticsOperation,
         DeleteIndexOperation,
         EnableIndexOperation,
         DisableIndexOperation,
         StartIndexOperation,
         StopIndexOperation,
+        StartIndexingOperation,
+        StopIndexingOperation,
         GetIndexingStatusOperation,
-        ResetIndexOperation)
-    from ravendb.documents.indexes.definitions import IndexRunningStatus
+        PutIndexesOperation,
+        ResetIndexOperation,
+        SetIndexesLockOperation,
+        SetIndexesPriorityOperation)
+    from ravendb.documents.indexes.definitions import (
+        FieldIndexing,
+        FieldStorage,
+        FieldTermVector,
+        IndexDefinition,
+        IndexFieldOptions,
+        IndexDeploymentMode,
+        IndexLockMode,
+        IndexPriority,
+        IndexRunningStatus,
+        SearchEngineType)
+    from ravendb.documents.indexes.spatial.configuration import (
+        SpatialFieldType,
+        SpatialOptions,
+        SpatialSearchStrategy)
+    from ravendb.documents.operations.definitions import MaintenanceOperation
+    from ravendb.documents.operations.statistics import GetCollectionStatisticsOperation
+    from ravendb.http.raven_command import RavenCommand
+    from ravendb.tools.utils import Utils
+    from ravendb.serverwide.operations.common import GetDatabaseRecordOperation
     from ravendb.exceptions.raven_exceptions import RavenException
     HAS_LIB = True
 except ImportError:
@@ -250,6 +790,7 @@ def create_dynamic_index(name, definition):
             reduce_def = definition.get("reduce")
             if reduce_def:
                 self.reduce = reduce_def
+            apply_index_options(self, definition)
 
     DynamicIndex.__name__ = name
     return DynamicIndex
@@ -268,30 +809,155 @@ def create_dynamic_multimap_index(name, definition):
             reduce_def = definition.get("reduce")
             if reduce_def:
                 self.reduce = reduce_def
+            apply_index_options(self, definition)
 
     DynamicIndex.__name__ = name
     return DynamicIndex
 
 
-def initialize_ravendb_store(params):
-    """Create and initialize a RavenDB DocumentStore from Ansible module parameters."""
-    url = params['url']
-    database_name = params['database_name']
-    certificate_path = params.get('certificate_path')
-    ca_cert_path = params.get('ca_cert_path')
+def apply_index_options(index, definition):
+    """
+    Apply the search engine, configuration, priority, lock mode, field options and additional sources
+    of the definition to an index creation task.
+    """
+    configuration = build_index_configuration(definition)
+    if configuration:
+        index.configuration = configuration
+    if definition.get("priority"):
+        index.priority = IndexPriority[definition["priority"].upper()]
+    if definition.get("lock_mode"):
+        index.lock_mode = IndexLockMode[definition["lock_mode"].upper()]
+
+    for field, options in build_field_options(definition.get("fields")).items():
+        if options.indexing is not None:
+            index._index(field, options.indexing)
+        if options.storage is not None:
+            index._store(field, options.storage)
+        if options.term_vector is not None:
+            index._term_vector(field, options.term_vector)
+        if options.spatial is not None:
+            index._spatial_options_strings[field] = options.spatial
+
+    additional_sources = definition.get("additional_sources")
+    if additional_sources:
+        index.additional_sources = dict(additional_sources)
+
+
+def build_index_configuration(definition):
+    """
+    Build the per-index configuration of the definition, including the search engine setting.
+    Values are sent as strings, like the server returns them.
+    """
+    configuration = {
+        key: str(value).lower() if isinstance(value, bool) else str(value)
+        for key, value in (definition.get("configuration") or {}).items()}
+    search_engine = definition.get("search_engine")
+    if search_engine:
+        configuration[SEARCH_ENGINE_SETTING] = SearchEngineType[search_engine.upper()].value
+    return configuration
 
-    store = DocumentStore(urls=[url], database=database_name)
-    if certificate_path and ca_cert_path:
-        store.certificate_pem_path = certificate_path
-        store.trust_store_path = ca_cert_path
 
-    store.initialize()
-    return store
+def build_field_options(fields):
+    """
+    Convert the fields of an index definition into IndexFieldOptions, keyed by field name.
+    Option values use the snake_case names of the client enums (e.g. term_vector: with_positions).
+    """
+    field_options = {}
+    for field, options in (fields or {}).items():
+        field_options[field] = IndexFieldOptions()
+        if options.get("indexing"):
+            field_options[field].indexing = FieldIndexing[options["indexing"].upper()]
+        if options.get("storage") is not None:
+            field_options[field].storage = FieldStorage.YES if options["storage"] else FieldStorage.NO
+        if options.get("term_vector"):
+            field_options[field].term_vector = FieldTermVector[options["term_vector"].upper()]
+        if options.get("spatial") is not None:
+            field_options[field].spatial = build_spatial_options(options["spatial"])
+    return field_options
+
+
+def build_spatial_options(spatial):
+    """Convert the spatial options of a field into SpatialOptions, using the client defaults for missing keys."""
+    kwargs = {key: spatial[key] for key in ['max_tree_level', 'min_x', 'max_x', 'min_y', 'max_y'] if key in spatial}
+    if spatial.get("type"):
+        kwargs['field_type'] = SpatialFieldType[spatial["type"].upper()]
+    if spatial.get("strategy"):
+        kwargs['strategy'] = SpatialSearchStrategy[spatial["strategy"].upper()]
+    if spatial.get("units"):
+        kwargs['units'] = spatial["units"].capitalize()
+    return SpatialOptions(**kwargs)
+
+
+def is_glob_pattern(name):
+    """Return True if the database name is a glob pattern."""
+    return any(character in name for character in GLOB_CHARACTERS)
+
+
+def resolve_database_names(store, database_names):
+    """
+    Expand the glob patterns of database_names against the existing databases (listed at most once).
+    Plain names are kept as given. Returns the names in the given order, without duplicates.
+    """
+    existing_databases = None
+    resolved = []
+    for name in database_names:
+        if is_glob_pattern(name):
+            if existing_databases is None:
+                existing_databases = list(iter_database_names(store))
+            matches = [database for database in existing_databases if fnmatchcase(database, name)]
+        else:
+            matches = [name]
+        resolved.extend(match for match in matches if match not in resolved)
+    return resolved
+
+
+def reconcile_database(store, params, database_name, check_mode):
+    """
+    Apply the index operation of the module to one database.
+    Errors are captured in the result so that one failing database does not abort the others.
+
+    Returns a dict: {name, changed, failed, msg, ...} with the extra values of the operation.
+    """
+    params = dict(params, database_name=database_name)
+    result = dict(name=database_name)
+    try:
+        if params.get('indexes') is not None:
+            status, changed, message, result['indexes'] = reconcile_indexes(store, params, check_mode)
+        elif params.get('auto_indexes') is not None:
+            status, changed, message, result['auto_indexes'] = reconcile_auto_indexes(store, params, check_mode)
+        else:
+            status, changed, message = reconcile_state(store, params, check_mode, result)
+    except Exception as e:
+        status, changed, message = "error", False, f"Failed to reconcile database '{database_name}': {str(e)}"
+    result.update(changed=changed, failed=status == "error", msg=message)
+    return result
 
 
-def reconcile_state(store, params, check_mode):
+def reconcile_databases(store, params, database_names, max_concurrency, check_mode):
+    """
+    Apply the index operation to many databases through the same store, with at most max_concurrency
+    databases in flight. Every database goes through the store's server-level request executor
+    (see get_database_maintenance), so the fan-out shares one HTTP session and topology.
+
+    Returns a tuple: (changed: bool, results: list)
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = list(executor.map(
+            lambda database_name: reconcile_database(store, params, database_name, check_mode), database_names))
+    return any(result['changed'] for result in results), results
+
+
+def summarize_results(results):
+    """Build a human-readable summary of per-database results."""
+    changed = len([result for result in results if result['changed']])
+    failed = len([result for result in results if result['failed']])
+    return f"Reconciled {len(results)} databases: {changed} changed, {failed} failed."
+
+
+def reconcile_state(store, params, check_mode, result=None):
     """
     Determine and apply the required state (present, absent, or mode-only) to an index.
+    Extra return values (e.g. deployment timings) are stored in the optional result dict.
     Returns a tuple: (status, changed, message)
     """
     database_name = params['database_name']
@@ -300,16 +966,14 @@ def reconcile_state(store, params, check_mode):
     desired_mode = params.get('mode')
     cluster_wide = params['cluster_wide']
 
-    database_maintenance = store.maintenance.for_database(database_name)
-    existing_indexes = database_maintenance.send(
-        GetIndexesOperation(0, sys.maxsize))
-    existing_index_names = [i.name for i in existing_indexes]
+    database_maintenance = get_database_maintenance(store, database_name)
+    existing_index = get_existing_index(database_maintenance, index_name)
 
     if desired_state == 'absent':
         return handle_absent_state(
             database_maintenance,
             index_name,
-            existing_index_names,
+            existing_index,
             check_mode)
 
     if desired_state == 'present':
@@ -318,9 +982,9 @@ def reconcile_state(store, params, check_mode):
             database_name,
             params,
             index_name,
-            existing_indexes,
-            existing_index_names,
-            check_mode)
+            existing_index,
+            check_mode,
+            result)
 
     if desired_mode and desired_state is None:
         return handle_mode_only(
@@ -329,18 +993,54 @@ def reconcile_state(store, params, check_mode):
             desired_mode,
             cluster_wide,
             check_mode,
-            existing_index_names)
+            existing_index)
 
     return "error", False, "Invalid state or mode combination."
 
 
+def get_index_definitions(database_maintenance, index_name=None):
+    """
+    Fetch every index definition of the database, or only the named one.
+    The client drops the field options when parsing definitions, so they are kept as returned by the server.
+    """
+    class GetIndexDefinitionsCommand(RavenCommand):
+        def __init__(self):
+            super().__init__(list)
+
+        def create_request(self, node):
+            query = f"name={quote(index_name)}" if index_name else f"start=0&pageSize={MAX_PAGE_SIZE}"
+            return requests.Request("GET", f"{node.url}/databases/{node.database}/indexes?{query}")
+
+        def set_response(self, response, from_cache):
+            self.result = []
+            for result in json.loads(response)["Results"] if response else []:
+                definition = IndexDefinition.from_json(result)
+                definition.fields = result.get("Fields") or {}
+                self.result.append(definition)
+
+        def is_read_request(self):
+            return True
+
+    class GetIndexDefinitionsOperation(MaintenanceOperation):
+        def get_command(self, conventions):
+            return GetIndexDefinitionsCommand()
+
+    return database_maintenance.send(GetIndexDefinitionsOperation())
+
+
+def get_existing_index(database_maintenance, index_name):
+    """Fetch only the definition of the named index. Returns None if the index does not exist."""
+    definitions = get_index_definitions(database_maintenance, index_name)
+    return definitions[0] if definitions else None
+
+
 def handle_absent_state(
         database_maintenance,
         index_name,
-        existing_index_names,
+        existing_index,
         check_mode):
     """Delete the index if it exists. Respect Ansible check mode."""
-    if index_name not in existing_index_names:
+    if existing_index is None:
         return "ok", False, f"Index '{index_name}' is already absent."
 
     if check_mode:
@@ -355,35 +1055,90 @@ def handle_present_state(
         database_name,
         params,
         index_name,
-        existing_indexes,
-        existing_index_names,
-        check_mode):
+        existing_index,
+        check_mode,
+        result=None):
     """Create or update the index if needed. Respect Ansible check mode."""
     index_definition = params.get('index_definition')
     desired_mode = params.get('mode')
     cluster_wide = params['cluster_wide']
-
-    if index_name in existing_index_names:
-        existing_index = next(
-            i for i in existing_indexes if i.name == index_name)
-        if index_matches(existing_index, index_definition):
+    wait = params.get('wait_for_replacement')
+    wait_non_stale = params.get('wait_for_non_stale')
+
+    database_maintenance = get_database_maintenance(store, database_name)
+    reason = ""
+    changes = {}
+    if existing_index is not None:
+        differences = index_differences(existing_index, index_definition)
+        changes = index_setting_changes(existing_index, index_definition)
+        if not differences:
+            settings = ""
+            if changes:
+                if not check_mode:
+                    apply_index_settings(database_maintenance, index_name, changes)
+                verb = "would be" if check_mode else "were"
+                settings = f" Settings {verb} changed: {describe_setting_changes(changes)}."
             if desired_mode:
-                return apply_mode(
+                status, changed, message = apply_mode(
                     store,
                     index_name,
                     desired_mode,
                     cluster_wide,
                     check_mode)
-            return "ok", False, f"Index '{index_name}' already exists and matches definition."
+                return status, changed or bool(changes), message + settings
+            if wait_non_stale:
+                converged, indexing, wait_message = wait_for_index(
+                    store, database_name, index_name, wait_non_stale.get('timeout') or 600,
+                    wait_non_stale.get('interval') or 1, deployed=False)
+                if result is not None:
+                    result['indexing'] = indexing
+                if not converged:
+                    return "error", bool(changes), wait_message
+            return "ok", bool(changes), f"Index '{index_name}' already exists and matches definition.{settings}"
+        reason = f" Definition changed: {', '.join(differences)}."
 
     if check_mode:
-        return "ok", True, f"Index '{index_name}' would be created."
+        sample_size = params.get('test_sample_size')
+        if not sample_size:
+            return "ok", True, f"Index '{index_name}' would be created.{reason}"
+
+        test = run_test_index(store, database_name, index_definition, sample_size)
+        if result is not None:
+            result['test'] = test
+        if not test['compiled']:
+            return "error", True, (f"Index '{index_name}' would be created, but fails to compile: "
+                                   f"{'; '.join(test['errors'])}")
+        return "ok", True, (f"Index '{index_name}' would be created.{reason} Tested on {test['documents']} "
+                            f"documents: {test['map_results']} map results "
+                            f"({test['entries_per_document']} per document), {test['elapsed_ms']} ms.")
+
+    if changes:
+        apply_index_settings(database_maintenance, index_name, changes, before_update=True)
+    create_index(store, database_name, index_name, index_definition, params.get('deployment_mode'))
+
+    if wait:
+        converged, deployment, wait_message = wait_for_index(
+            store, database_name, index_name, wait.get('timeout') or 600, wait.get('interval') or 1)
+        if result is not None:
+            result['deployment'] = dict(
+                elapsed=deployment['elapsed'],
+                nodes=[dict(node=node['node'], elapsed=node['elapsed']) for node in deployment['nodes']])
+        if not converged:
+            return "error", True, wait_message
+
+    if wait_non_stale:
+        converged, indexing, wait_message = wait_for_index(
+            store, database_name, index_name, wait_non_stale.get('timeout') or 600,
+            wait_non_stale.get('interval') or 1)
+        if result is not None:
+            result['indexing'] = indexing
+        if not converged:
+            return "error", True, wait_message
 
-    create_index(store, database_name, index_name, index_definition)
     if desired_mode:
         apply_mode(store, index_name, desired_mode, cluster_wide, check_mode)
 
-    return "ok", True, f"Index '{index_name}' created successfully."
+    return "ok", True, f"Index '{index_name}' created successfully.{reason}"
 
 
 def handle_mode_only(
@@ -392,9 +1147,9 @@ def handle_mode_only(
         desired_mode,
         cluster_wide,
         check_mode,
-        existing_index_names):
+        existing_index):
     """Apply only the desired index mode if the index already exists."""
-    if index_name not in existing_index_names:
+    if existing_index is None:
         return "error", False, f"Index '{index_name}' does not exist. Cannot apply mode."
 
     return apply_mode(
@@ -405,30 +1160,526 @@ def handle_mode_only(
         check_mode)
 
 
-def create_index(store, database_name, index_name, index_definition):
+def create_index(store, database_name, index_name, index_definition, deployment_mode=None):
     """Create an index, handling both single-map and multi-map definitions."""
+    definition = build_index_definition(index_name, index_definition, deployment_mode)
+    get_database_maintenance(store, database_name).send(PutIndexesOperation(definition))
+
+
+def count_source_documents(store, database_name, index_definition):
+    """
+    Count the documents the maps of the definition read: the documents of the collections they name
+    (docs.Users), or of the whole database if a map reads every document.
+    """
+    statistics = get_database_maintenance(store, database_name).send(GetCollectionStatisticsOperation())
+    collections = set()
+    for index_map in index_definition.get("map") or []:
+        map_collections = SOURCE_COLLECTION_PATTERN.findall(index_map)
+        if not map_collections:
+            return statistics.count_of_documents
+        collections.update(collection.lower() for collection in map_collections)
+    return sum(count for collection, count in (statistics.collections or {}).items()
+               if collection.lower() in collections)
+
+
+def run_test_index(store, database_name, index_definition, sample_size, timeout=TEST_INDEX_TIMEOUT):
+    """
+    Run the definition on the server's test-index endpoint against a sample of the existing documents.
+    The test index is temporary, nothing is deployed.
+    The elapsed time is measured by the client and includes compiling the index.
+
+    Returns a dict: {compiled, errors, documents, map_results, index_entries, reduce_results,
+    entries_per_document, elapsed_ms, ms_per_document}
+    """
+    definition = build_index_definition("TestIndex", index_definition)
+
+    class TestIndexCommand(RavenCommand):
+        def __init__(self):
+            super().__init__(dict)
+
+        def create_request(self, node):
+            request = requests.Request("POST", f"{node.url}/databases/{node.database}/indexes/test")
+            request.data = {
+                "IndexDefinition": definition.to_json(),
+                "Query": None,
+                "QueryParameters": None,
+                "MaxDocumentsToProcess": sample_size,
+                "WaitForNonStaleResultsTimeoutInSec": timeout,
+            }
+            request.headers["Content-type"] = "application/json"
+            return request
+
+        def set_response(self, response, from_cache):
+            self.result = json.loads(response) if response else {}
+
+        def is_read_request(self):
+            return False
+
+    class TestIndexOperation(MaintenanceOperation):
+        def get_command(self, conventions):
+            return TestIndexCommand()
+
+    started = time.monotonic()
+    try:
+        response = get_database_maintenance(store, database_name).send(TestIndexOperation())
+    except Exception as e:
+        errors = COMPILATION_ERROR_PATTERN.findall(str(e))
+        if not errors and "IndexCompilationException" not in str(e):
+            raise
+        return dict(compiled=False, errors=errors or [str(e).splitlines()[0]])
+    elapsed_ms = round((time.monotonic() - started) * 1000, 2)
+
+    documents = min(sample_size, count_source_documents(store, database_name, index_definition))
+    map_results = len(response.get("MapResults") or [])
+    return dict(
+        compiled=True,
+        errors=[],
+        documents=documents,
+        map_results=map_results,
+        index_entries=len(response.get("IndexEntries") or []),
+        reduce_results=len(response.get("ReduceResults") or []),
+        entries_per_document=round(map_results / documents, 2) if documents else 0,
+        elapsed_ms=elapsed_ms,
+        ms_per_document=round(elapsed_ms / documents, 2) if documents else 0)
+
+
+def get_rolling_deployments(store, database_name, index_name):
+    """Return the rolling deployment of the index per node tag, empty if no rolling deployment is active."""
+    database_record = store.maintenance.server.send(GetDatabaseRecordOperation(database_name))
+    rolling_indexes = (database_record.rolling_indexes if database_record else None) or {}
+    return (rolling_indexes.get(index_name) or {}).get("ActiveDeployments") or {}
+
+
+def get_current_index_stats(database_maintenance, index_name, node_tag):
+    """
+    Return the statistics of the index on the node, or None while the node does not run the current definition
+    (the index is missing or a side-by-side replacement is still being built).
+    """
+    try:
+        index_names = send_to_node(database_maintenance, GetIndexNamesOperation(0, MAX_PAGE_SIZE), node_tag)
+        if REPLACEMENT_PREFIX + index_name in index_names or index_name not in index_names:
+            return None
+        return send_to_node(database_maintenance, GetIndexStatisticsOperation(index_name), node_tag)
+    except Exception:
+        return None
+
+
+def wait_for_index(store, database_name, index_name, timeout, interval=1, deployed=True):
+    """
+    Wait until every node of the database group runs the current index definition and the index is not stale.
+    A node's time is measured from the moment its deployment started (immediately for parallel deployments).
+    Throughput counts the documents mapped by the current definition when it was just deployed,
+    otherwise the documents mapped while waiting.
+
+    Returns a tuple: (converged: bool, report: dict, message: str)
+    """
+    database_maintenance = get_database_maintenance(store, database_name)
+    nodes = get_database_nodes(store, database_name) or [None]
+    started = time.monotonic()
+    node_started = {}
+    node_baseline = {}
+    node_reports = {}
+
+    while True:
+        deployments = get_rolling_deployments(store, database_name, index_name)
+        for node in nodes:
+            if node in node_reports:
+                continue
+            state = (deployments.get(node) or {}).get("State")
+            if state == "Pending":
+                continue
+            node_started.setdefault(node, time.monotonic())
+            if state not in (None, "Done"):
+                continue
+            stats = get_current_index_stats(database_maintenance, index_name, node)
+            if stats is None:
+                continue
+            node_baseline.setdefault(node, 0 if deployed else stats.map_successes or 0)
+            if not stats.stale:
+                node_elapsed = round(time.monotonic() - node_started[node], 2)
+                documents = max((stats.map_successes or 0) - node_baseline[node], 0)
+                node_reports[node] = dict(
+                    node=node,
+                    elapsed=node_elapsed,
+                    documents=documents,
+                    documents_per_second=round(documents / node_elapsed, 1) if node_elapsed > 0 else float(documents))
+
+        elapsed = round(time.monotonic() - started, 2)
+        report = dict(elapsed=elapsed, nodes=[node_reports[node] for node in nodes if node in node_reports])
+        if len(node_reports) == len(nodes):
+            return True, report, f"Index '{index_name}' is up to date on all nodes after {elapsed} seconds."
+
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            pending = [node for node in nodes if node not in node_reports]
+            return False, report, (
+                f"Timed out after {elapsed} seconds waiting for index '{index_name}' "
+                f"to be up to date on nodes: {', '.join(str(node) for node in pending)}.")
+
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+
+def build_index_definition(index_name, index_definition, deployment_mode=None):
+    """Build the IndexDefinition that create_index would deploy for the given name and definition."""
     if len(index_definition.get("map")) > 1:
         DynamicIndexClass = create_dynamic_multimap_index(
             index_name, index_definition)
     else:
         DynamicIndexClass = create_dynamic_index(index_name, index_definition)
     index = DynamicIndexClass()
-    index.execute(store, database_name)
+    if deployment_mode:
+        index.deployment_mode = IndexDeploymentMode(deployment_mode.capitalize())
+    return index.create_index_definition()
+
+
+def is_auto_index(index_name):
+    """Return True if the index was created automatically by the server for a dynamic query."""
+    return index_name.startswith("Auto/")
+
+
+def plan_indexes(existing_indexes, declared_indexes, prune):
+    """
+    Compare the declared indexes with the existing definitions in one pass.
+    declared_indexes is a list of (IndexDefinition, index_definition dict) pairs.
+
+    Returns a dict: {created, updated, deleted, unchanged} of index names plus the reasons of every update
+    and the priority or lock mode changes of existing indexes, the definitions to put and the setting changes.
+    """
+    existing_by_name = {index.name: index for index in existing_indexes}
+    plan = dict(created=[], updated=[], deleted=[], unchanged=[], reasons={}, settings={})
+    to_put = []
+    to_configure = {}
+
+    for definition, index_definition in declared_indexes:
+        existing_index = existing_by_name.get(definition.name)
+        if existing_index is None:
+            plan['created'].append(definition.name)
+            to_put.append(definition)
+            continue
+
+        changes = index_setting_changes(existing_index, index_definition)
+        if changes:
+            plan['settings'][definition.name] = describe_setting_changes(changes)
+            to_configure[definition.name] = changes
+
+        differences = index_differences(existing_index, index_definition)
+        if differences:
+            plan['updated'].append(definition.name)
+            plan['reasons'][definition.name] = ', '.join(differences)
+            to_put.append(definition)
+        else:
+            plan['unchanged'].append(definition.name)
+
+    if prune:
+        declared_names = {definition.name for definition, _ in declared_indexes}
+        plan['deleted'] = [
+            name for name in existing_by_name
+            if name not in declared_names and not is_auto_index(name)]
+
+    return plan, to_put, to_configure
+
+
+def reconcile_indexes(store, params, check_mode):
+    """
+    Deploy a list of indexes: new or changed definitions are sent in a single put-indexes request,
+    undeclared static indexes are deleted when prune is set.
+    This is the only path that fetches every index definition of the database.
+    Returns a tuple: (status, changed, message, plan)
+    """
+    database_maintenance = get_database_maintenance(store, params['database_name'])
+    existing_indexes = get_index_definitions(database_maintenance)
+
+    declared_indexes = [
+        (build_index_definition(index['name'], index['index_definition'], params.get('deployment_mode')),
+         index['index_definition'])
+        for index in params['indexes']]
+    plan, to_put, to_configure = plan_indexes(existing_indexes, declared_indexes, params.get('prune'))
+
+    changed = bool(to_put or plan['deleted'] or to_configure)
+    summary = (f"{len(plan['created'])} created, {len(plan['updated'])} updated, "
+               f"{len(plan['deleted'])} deleted, {len(plan['unchanged'])} unchanged, "
+               f"{len(to_configure)} reconfigured")
+
+    if not changed:
+        return "ok", False, f"All {len(declared_indexes)} indexes up to date: {summary}.", plan
+    if check_mode:
+        return "ok", True, f"Would deploy {len(declared_indexes)} indexes: {summary}.", plan
+
+    for index_name, changes in to_configure.items():
+        apply_index_settings(
+            database_maintenance, index_name, changes, before_update=index_name in plan['updated'])
+    if to_put:
+        database_maintenance.send(PutIndexesOperation(*to_put))
+    for index_name in plan['deleted']:
+        database_maintenance.send(DeleteIndexOperation(index_name))
+
+    return "ok", True, f"Deployed {len(declared_indexes)} indexes: {summary}.", plan
+
+
+def get_auto_indexes(store, database_name):
+    """
+    List the auto indexes of the database with their last query time.
+    Queries are served by any node of the database group, so the most recent query time of all nodes is used.
+    An index that was never queried is considered idle since its creation.
+
+    Returns a list of dicts: {name, last_querying_time, idle_days, entries_count, stale}, sorted by name.
+    """
+    database_maintenance = get_database_maintenance(store, database_name)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    auto_indexes = {}
+    for node_tag in get_database_nodes(store, database_name) or [None]:
+        for stats in send_to_node(database_maintenance, GetIndexesStatisticsOperation(), node_tag):
+            if not is_auto_index(stats["Name"]):
+                continue
+            last_used = stats.get("LastQueryingTime") or stats.get("CreatedTimestamp")
+            last_used = Utils.string_to_datetime(last_used) if last_used else None
+            known = auto_indexes.get(stats["Name"])
+            if known is not None and (last_used is None or (known['last_used'] and known['last_used'] >= last_used)):
+                continue
+            auto_indexes[stats["Name"]] = dict(
+                name=stats["Name"],
+                last_used=last_used,
+                last_querying_time=stats.get("LastQueryingTime"),
+                entries_count=stats.get("EntriesCount"),
+                stale=stats.get("IsStale"))
+
+    result = []
+    for name in sorted(auto_indexes):
+        info = auto_indexes[name]
+        last_used = info.pop('last_used')
+        info['idle_days'] = (now - last_used).total_seconds() / 86400 if last_used else None
+        result.append(info)
+    return result
+
+
+def get_index_merge_suggestions(store, database_name):
+    """
+    Fetch the server's index merge suggestions.
+
+    Returns a tuple: (suggestions: Optional[dict], error: Optional[str]).
+    Suggestions are unavailable (with the reason as error) when the license does not include them.
+    """
+    class SuggestIndexMergeCommand(RavenCommand):
+        def __init__(self):
+            super().__init__(dict)
+
+        def create_request(self, node):
+            return requests.Request("GET", f"{node.url}/databases/{node.database}/indexes/suggest-index-merge")
+
+        def set_response(self, response, from_cache):
+            self.result = json.loads(response) if response else {}
+
+        def is_read_request(self):
+            return True
+
+    class SuggestIndexMergeOperation(MaintenanceOperation):
+        def get_command(self, conventions):
+            return SuggestIndexMergeCommand()
+
+    try:
+        response = get_database_maintenance(store, database_name).send(SuggestIndexMergeOperation())
+    except Exception as e:
+        if "license" not in str(e).lower():
+            raise
+        return None, f"Index merge suggestions are unavailable: {str(e).splitlines()[0]}"
+    return summarize_merge_suggestions(response), None
+
+
+def summarize_merge_suggestions(response):
+    """
+    Convert the server's index merge suggestions into indexes that can be merged (with the maps of the
+    merged index), indexes that can be deleted because another index surpasses them, and unmergeable indexes.
+    """
+    merge = []
+    delete = []
+    for suggestion in response.get("Suggestions") or []:
+        if suggestion.get("CanMerge"):
+            merged_index = suggestion.get("MergedIndex") or {}
+            merge.append(dict(
+                indexes=suggestion["CanMerge"],
+                merged_maps=merged_index.get("Maps") or []))
+        if suggestion.get("CanDelete"):
+            delete.append(dict(
+                indexes=suggestion["CanDelete"],
+                surpassing_index=suggestion.get("SurpassingIndex")))
+    return dict(merge=merge, delete=delete, unmergeable=response.get("Unmergables") or {})
+
+
+def reconcile_auto_indexes(store, params, check_mode):
+    """
+    List the auto indexes, delete the ones idle for longer than max_idle_days (if set)
+    and collect the index merge suggestions. In check mode the idle indexes are only reported.
+    Returns a tuple: (status, changed, message, report)
+    """
+    database_name = params['database_name']
+    options = params['auto_indexes']
+    max_idle_days = options.get('max_idle_days')
+
+    auto_indexes = get_auto_indexes(store, database_name)
+    idle = [] if max_idle_days is None else [
+        info['name'] for info in auto_indexes
+        if info['idle_days'] is not None and info['idle_days'] > max_idle_days]
+    for info in auto_indexes:
+        if info['idle_days'] is not None:
+            info['idle_days'] = round(info['idle_days'], 2)
+    report = dict(indexes=auto_indexes, deleted=idle)
+
+    if options.get('suggestions'):
+        report['suggestions'], error = get_index_merge_suggestions(store, database_name)
+        if error:
+            report['suggestions_error'] = error
+
+    if idle and not check_mode:
+        database_maintenance = get_database_maintenance(store, database_name)
+        for index_name in idle:
+            database_maintenance.send(DeleteIndexOperation(index_name))
+
+    verb = "would be" if check_mode else "were"
+    message = f"Found {len(auto_indexes)} auto indexes."
+    if max_idle_days is not None:
+        message += f" {len(idle)} idle for more than {max_idle_days} days {verb} deleted."
+    return "ok", bool(idle), message, report
+
+
+def tokenize_linq(text):
+    """
+    Split LINQ (or JavaScript) index source into tokens, dropping whitespace and comments.
+    String literals are kept as single tokens, so whitespace inside them still matters.
+    """
+    return tuple(
+        match.group() for match in LINQ_TOKEN_PATTERN.finditer(text or "")
+        if match.lastgroup != 'comment')
+
+
+def normalize_field_options(fields):
+    """
+    Reduce field options (as sent to or returned by the server) to their non-default values,
+    dropping fields without any option. Enum values are replaced by their server names.
+    The server does not keep options set to their default value, so those are dropped as well.
+    """
+    normalized = {}
+    for field, options in (fields or {}).items():
+        options = {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in (options or {}).items()}
+        options = {
+            key: value for key, value in options.items()
+            if value is not None and FIELD_DEFAULTS.get(key) != value}
+        if options:
+            normalized[field] = options
+    return normalized
+
+
+def index_differences(existing_index, index_definition):
+    """
+    Compare an existing index with the expected definition on tokens,
+    so that re-indenting, re-wrapping or commenting a definition is not a change.
+    The search engine, configuration, field options and additional sources are compared as well.
+    Priority and lock mode are not part of the comparison, they are changed without redeploying the index.
+    Returns a list of human-readable differences, empty if the definitions match.
+    """
+    differences = []
+
+    existing_maps = {tokenize_linq(index_map) for index_map in existing_index.maps or []}
+    expected_maps = {tokenize_linq(index_map) for index_map in index_definition.get("map") or []}
+    if existing_maps != expected_maps:
+        differences.append(
+            f"maps differ ({len(expected_maps - existing_maps)} new, {len(existing_maps - expected_maps)} removed)")
+
+    existing_reduce = tokenize_linq(getattr(existing_index, 'reduce', None))
+    expected_reduce = tokenize_linq(index_definition.get("reduce"))
+    if existing_reduce != expected_reduce:
+        if not existing_reduce:
+            differences.append("reduce added")
+        elif not expected_reduce:
+            differences.append("reduce removed")
+        else:
+            differences.append("reduce differs")
+
+    existing_engine = (getattr(existing_index, 'configuration', None) or {}).get(SEARCH_ENGINE_SETTING)
+    expected_engine = index_definition.get("search_engine")
+    if expected_engine:
+        expected_engine = SearchEngineType[expected_engine.upper()].value
+    if existing_engine != expected_engine:
+        differences.append(f"search engine differs ({existing_engine or 'default'} -> {expected_engine or 'default'})")
+
+    existing_configuration = {
+        key: value for key, value in (getattr(existing_index, 'configuration', None) or {}).items()
+        if key != SEARCH_ENGINE_SETTING}
+    expected_configuration = {
+        key: value for key, value in build_index_configuration(index_definition).items()
+        if key != SEARCH_ENGINE_SETTING}
+    changed_settings = sorted(
+        key for key in set(existing_configuration) | set(expected_configuration)
+        if existing_configuration.get(key) != expected_configuration.get(key))
+    if changed_settings:
+        differences.append(f"configuration differs ({', '.join(changed_settings)})")
+
+    existing_fields = normalize_field_options(getattr(existing_index, 'fields', None))
+    expected_fields = normalize_field_options(
+        {field: options.to_json() for field, options in build_field_options(index_definition.get("fields")).items()})
+    changed_fields = sorted(
+        field for field in set(existing_fields) | set(expected_fields)
+        if existing_fields.get(field) != expected_fields.get(field))
+    if changed_fields:
+        differences.append(f"field options differ ({', '.join(changed_fields)})")
+
+    existing_sources = {
+        name: tokenize_linq(source)
+        for name, source in (getattr(existing_index, 'additional_sources', None) or {}).items()}
+    expected_sources = {
+        name: tokenize_linq(source)
+        for name, source in (index_definition.get("additional_sources") or {}).items()}
+    if existing_sources != expected_sources:
+        differences.append("additional sources differ")
+
+    return differences
 
 
 def index_matches(existing_index, index_definition):
-    """Check if an existing index matches the expected definition (map/reduce)."""
-    existing_maps = set(map(str.strip, existing_index.maps)
-                        ) if existing_index.maps else set()
-    existing_reduce = getattr(existing_index, 'reduce', None)
+    """Check if an existing index matches the expected definition, ignoring formatting."""
+    return not index_differences(existing_index, index_definition)
 
-    expected_maps = set(map(str.strip, index_definition.get("map", [])))
-    normalized_existing_reduce = existing_reduce.strip() if existing_reduce else None
-    normalized_expected_reduce = (index_definition.get("reduce") or "").strip()
-    if not normalized_expected_reduce:
-        normalized_expected_reduce = None
 
-    return existing_maps == expected_maps and normalized_existing_reduce == normalized_expected_reduce
+def index_setting_changes(existing_index, index_definition):
+    """
+    Compare the declared priority and lock mode with the live state of the index.
+    Settings that are not declared are left alone.
+
+    Returns a dict: {setting: (current, desired)} of the settings that differ.
+    """
+    changes = {}
+    for setting, setting_type in [('priority', IndexPriority), ('lock_mode', IndexLockMode)]:
+        desired = index_definition.get(setting)
+        if not desired:
+            continue
+        desired = setting_type[desired.upper()]
+        current = getattr(existing_index, setting, None)
+        if current != desired:
+            changes[setting] = (current, desired)
+    return changes
+
+
+def describe_setting_changes(changes):
+    """Build a human-readable description of priority and lock mode changes."""
+    return ', '.join(
+        f"{setting.replace('_', ' ')} {current.value if current else 'unset'} -> {desired.value}"
+        for setting, (current, desired) in changes.items())
+
+
+def apply_index_settings(database_maintenance, index_name, changes, before_update=False):
+    """
+    Set the changed priority and lock mode of an index without redeploying it.
+    Before an update, only an unlock is applied: the new definition carries the other settings,
+    and locking the index first would reject (or ignore) the update.
+    """
+    lock_mode = changes.get('lock_mode')
+    if lock_mode and (not before_update or lock_mode[1] == IndexLockMode.UNLOCK):
+        database_maintenance.send(SetIndexesLockOperation(lock_mode[1], index_name))
+    priority = changes.get('priority')
+    if priority and not before_update:
+        database_maintenance.send(SetIndexesPriorityOperation(priority[1], index_name))
 
 
 def enable_index(store, index_name, cluster_wide, check_mode):
@@ -453,11 +1704,22 @@ def disable_index(store, index_name, cluster_wide, check_mode):
     return "ok", True, f"Index '{index_name}' disbaled successfully {' cluster-wide' if cluster_wide else ''}."
 
 
-def resume_index(store, index_name, check_mode):
-    """Resume a paused RavenDB index. Respect check mode."""
+def get_index_statuses(store):
+    """Fetch the running status of every index with a single request, keyed by index name."""
     indexing_status = store.maintenance.send(GetIndexingStatusOperation())
-    index = [x for x in indexing_status.indexes if x.name == index_name][0]
-    if index.status == IndexRunningStatus.RUNNING:
+    return {index.name: index.status for index in indexing_status.indexes or []}
+
+
+def resume_index(store, index_name, check_mode, index_statuses=None):
+    """
+    Resume a paused RavenDB index. Respect check mode.
+    index_statuses (from get_index_statuses) can be passed to avoid fetching them again.
+    """
+    if index_statuses is None:
+        index_statuses = get_index_statuses(store)
+    if index_name not in index_statuses:
+        return "error", False, f"Index '{index_name}' does not exist. Cannot apply mode."
+    if index_statuses[index_name] == IndexRunningStatus.RUNNING:
         return "ok", False, f"Index '{index_name}' is already resumed and executing."
 
     if check_mode:
@@ -469,11 +1731,16 @@ def resume_index(store, index_name, check_mode):
     return "ok", True, f"Index '{index_name}' resumed successfully."
 
 
-def pause_index(store, index_name, check_mode):
-    """Pause a running RavenDB index. Respect check mode."""
-    indexing_status = store.maintenance.send(GetIndexingStatusOperation())
-    index = [x for x in indexing_status.indexes if x.name == index_name][0]
-    if index.status == IndexRunningStatus.PAUSED:
+def pause_index(store, index_name, check_mode, index_statuses=None):
+    """
+    Pause a running RavenDB index. Respect check mode.
+    index_statuses (from get_index_statuses) can be passed to avoid fetching them again.
+    """
+    if index_statuses is None:
+        index_statuses = get_index_statuses(store)
+    if index_name not in index_statuses:
+        return "error", False, f"Index '{index_name}' does not exist. Cannot apply mode."
+    if index_statuses[index_name] == IndexRunningStatus.PAUSED:
         return "ok", False, f"Index '{index_name}' is already paused."
 
     if check_mode:
@@ -496,26 +1763,158 @@ def reset_index(store, index_name, check_mode):
     return "ok", True, f"Index '{index_name}' reset successfully."
 
 
-def apply_mode(store, index_name, mode, cluster_wide, check_mode):
+def plan_reset_waves(store, database_names, per, size):
+    """
+    Split the reset into waves of size steps. A step is one node of one database (per='node')
+    or all nodes of one database (per='database').
+    Returns a list of waves: [{targets: [{database, nodes}]}]
+    """
+    steps = []
+    for database_name in database_names:
+        nodes = get_database_nodes(store, database_name) or [None]
+        if per == 'database':
+            steps.append((database_name, nodes))
+        else:
+            steps.extend((database_name, [node]) for node in nodes)
+
+    waves = []
+    for start in range(0, len(steps), size):
+        targets = []
+        for database_name, nodes in steps[start:start + size]:
+            if targets and targets[-1]['database'] == database_name:
+                targets[-1]['nodes'].extend(nodes)
+            else:
+                targets.append(dict(database=database_name, nodes=list(nodes)))
+        waves.append(dict(targets=targets))
+    return waves
+
+
+def describe_wave(wave):
+    """Describe the targets of a wave, e.g. "db1 (A, B), db2 (C)"."""
+    return ", ".join(
+        f"{target['database']} ({', '.join(str(node) for node in target['nodes'])})" for target in wave['targets'])
+
+
+def reset_index_in_waves(store, database_names, index_name, reset_waves, check_mode):
+    """
+    Reset the index wave by wave. Every wave resets its nodes and then waits until the index
+    is up to date on all nodes of its databases before the next wave starts, so only a part of the
+    cluster is reindexing at any time. Stops at the first wave that does not become non-stale in time.
+    Returns a tuple: (status, changed, message, report)
+    """
+    missing = [
+        database_name for database_name in database_names
+        if get_existing_index(get_database_maintenance(store, database_name), index_name) is None]
+    if missing:
+        return "error", False, f"Index '{index_name}' does not exist in databases: {', '.join(missing)}. Cannot reset.", None
+
+    waves = plan_reset_waves(store, database_names, reset_waves['per'], reset_waves['size'])
+    report = dict(waves=waves)
+    if check_mode:
+        plan = "; ".join(f"wave {number}: {describe_wave(wave)}" for number, wave in enumerate(waves, 1))
+        return "ok", True, f"Index '{index_name}' would be reset in {len(waves)} waves ({plan}).", report
+
+    started = time.monotonic()
+    for number, wave in enumerate(waves, 1):
+        wave_started = time.monotonic()
+        for target in wave['targets']:
+            database_maintenance = get_database_maintenance(store, target['database'])
+            for node in target['nodes']:
+                send_to_node(database_maintenance, ResetIndexOperation(index_name), node)
+
+        for target in wave['targets']:
+            remaining = reset_waves['timeout'] - (time.monotonic() - wave_started)
+            converged, _, message = wait_for_index(
+                store, target['database'], index_name, max(remaining, 0), reset_waves['interval'])
+            if not converged:
+                report['elapsed'] = round(time.monotonic() - started, 2)
+                return "error", True, f"Wave {number} of {len(waves)} ({describe_wave(wave)}): {message}", report
+        wave['elapsed'] = round(time.monotonic() - wave_started, 2)
+
+    report['elapsed'] = round(time.monotonic() - started, 2)
+    return "ok", True, (
+        f"Index '{index_name}' was reset in {len(waves)} waves and is up to date after {report['elapsed']} seconds."), report
+
+
+def apply_mode(store, index_name, mode, cluster_wide, check_mode, index_statuses=None):
     """Dispatch index mode operation based on the given mode string."""
     if mode == 'enabled':
         return enable_index(store, index_name, cluster_wide, check_mode)
     elif mode == 'disabled':
         return disable_index(store, index_name, cluster_wide, check_mode)
     elif mode == 'resumed':
-        return resume_index(store, index_name, check_mode)
+        return resume_index(store, index_name, check_mode, index_statuses)
     elif mode == 'paused':
-        return pause_index(store, index_name, check_mode)
+        return pause_index(store, index_name, check_mode, index_statuses)
     elif mode == 'reset':
         return reset_index(store, index_name, check_mode)
     else:
         return "error", False, f"Unsupported mode '{mode}' specified."
 
 
-def is_valid_url(url):
-    """Return True if the URL has a valid scheme and network location."""
-    parsed = urlparse(url)
-    return all([parsed.scheme, parsed.netloc])
+def apply_mode_to_indexes(store, index_names, mode, cluster_wide, check_mode):
+    """
+    Apply the mode to every listed index. The index statuses are fetched once and reused for every name.
+    Stops at the first error. Returns a tuple: (status, changed, message)
+    """
+    index_statuses = get_index_statuses(store)
+    missing = [index_name for index_name in index_names if index_name not in index_statuses]
+    if missing:
+        return "error", False, f"Indexes do not exist: {', '.join(missing)}. Cannot apply mode."
+
+    changed_names = []
+    for index_name in index_names:
+        status, changed, message = apply_mode(store, index_name, mode, cluster_wide, check_mode, index_statuses)
+        if status == "error":
+            return status, bool(changed_names), message
+        if changed:
+            changed_names.append(index_name)
+
+    if not changed_names:
+        return "ok", False, f"All {len(index_names)} indexes are already {mode}."
+    verb = "would be" if check_mode else "were"
+    return "ok", True, f"{len(changed_names)} of {len(index_names)} indexes {verb} {mode}: {', '.join(changed_names)}."
+
+
+def apply_database_mode(store, database_name, mode, check_mode):
+    """
+    Stop or start indexing of the whole database on every node of the database group,
+    with one request per node whose indexing is not already in the desired state.
+    Returns a tuple: (status, changed, message)
+    """
+    if mode not in ['paused', 'resumed']:
+        return "error", False, f"Mode '{mode}' requires index_name or index_names."
+
+    database_maintenance = get_database_maintenance(store, database_name)
+    desired_status = IndexRunningStatus.PAUSED if mode == 'paused' else IndexRunningStatus.RUNNING
+    node_tags = get_database_nodes(store, database_name) or [None]
+
+    changed_nodes = []
+    for node_tag in node_tags:
+        indexing_status = send_to_node(database_maintenance, GetIndexingStatusOperation(), node_tag)
+        if indexing_status.status == desired_status:
+            continue
+        changed_nodes.append(node_tag)
+        if not check_mode:
+            operation = StopIndexingOperation() if mode == 'paused' else StartIndexingOperation()
+            send_to_node(database_maintenance, operation, node_tag)
+
+    if not changed_nodes:
+        return "ok", False, f"Indexing of database '{database_name}' is already {mode}."
+    verb = "would be" if check_mode else "was"
+    nodes = ', '.join(node_tag for node_tag in changed_nodes if node_tag)
+    return "ok", True, f"Indexing of database '{database_name}' {verb} {mode}{f' on nodes {nodes}' if nodes else ''}."
+
+
+def reconcile_mode(store, params, check_mode):
+    """
+    Apply the mode to the listed indexes, or to indexing of the whole database when no index is named.
+    Returns a tuple: (status, changed, message)
+    """
+    index_names = params.get('index_names')
+    if index_names:
+        return apply_mode_to_indexes(store, index_names, params['mode'], params['cluster_wide'], check_mode)
+    return apply_database_mode(store, params['database_name'], params['mode'], check_mode)
 
 
 def is_valid_name(name):
@@ -523,6 +1922,16 @@ def is_valid_name(name):
     return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
 
 
+def is_valid_database_pattern(name):
+    """Check if the database name or glob pattern is valid (letters, numbers, dashes, underscores, *, ?, [])."""
+    return bool(re.match(r"^[a-zA-Z0-9_\-*?\[\]!]+$", name))
+
+
+def is_valid_concurrency(value):
+    """Return True if the concurrency limit is a positive integer."""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
 def is_valid_dict(value):
     """Return True if the value is a dictionary or None."""
     return isinstance(value, dict) or value is None
@@ -533,14 +1942,120 @@ def is_valid_bool(value):
     return isinstance(value, bool)
 
 
-def validate_paths(*paths):
-    """Check if all provided file paths exist. Return (True, None) or (False, error message)."""
-    for path in paths:
-        if path and not os.path.isfile(path):
-            return False, f"Path does not exist: {path}"
+def validate_indexes(indexes):
+    """
+    Validate every entry of the indexes list.
+    Returns a tuple: (valid: bool, error_msg: Optional[str])
+    """
+    seen = set()
+    for index in indexes:
+        name = index.get('name')
+        if not name or not is_valid_name(name):
+            return False, f"Invalid index name: {name}. Only letters, numbers, dashes, and underscores are allowed."
+        if name in seen:
+            return False, f"Duplicate index name: {name}."
+        seen.add(name)
+        index_definition = index.get('index_definition')
+        if not isinstance(index_definition, dict) or not index_definition.get('map'):
+            return False, f"Invalid index definition for index {name}: Must be a dictionary with at least one map."
+        valid, error_msg = validate_index_definition(index_definition)
+        if not valid:
+            return False, f"Invalid index definition for index {name}: {error_msg}"
     return True, None
 
 
+def validate_index_definition(index_definition):
+    """
+    Validate the search engine, settings, field options and additional sources of an index definition.
+    Returns a tuple: (valid: bool, error_msg: Optional[str])
+    """
+    search_engine = index_definition.get('search_engine')
+    if search_engine is not None and search_engine not in SEARCH_ENGINES:
+        return False, f"Invalid search_engine: {search_engine}. Must be one of: {', '.join(SEARCH_ENGINES)}."
+
+    for setting, choices in [('priority', PRIORITIES), ('lock_mode', LOCK_MODES)]:
+        if index_definition.get(setting) is not None and index_definition[setting] not in choices:
+            return False, f"Invalid {setting}: {index_definition[setting]}. Must be one of: {', '.join(choices)}."
+
+    configuration = index_definition.get('configuration')
+    if configuration is not None and (
+            not isinstance(configuration, dict)
+            or not all(isinstance(value, (str, int, float, bool)) for value in configuration.values())):
+        return False, "Invalid configuration: Must be a dictionary of indexing settings to values."
+    if configuration and SEARCH_ENGINE_SETTING in configuration:
+        return False, f"Invalid configuration: Use search_engine instead of {SEARCH_ENGINE_SETTING}."
+
+    fields = index_definition.get('fields')
+    if fields is not None and not isinstance(fields, dict):
+        return False, "Invalid fields: Must be a dictionary of field names to field options."
+    for field, options in (fields or {}).items():
+        valid, error_msg = validate_field_options(options)
+        if not valid:
+            return False, f"Invalid options for field {field}: {error_msg}"
+
+    additional_sources = index_definition.get('additional_sources')
+    if additional_sources is not None and (
+            not isinstance(additional_sources, dict)
+            or not all(isinstance(source, str) for source in additional_sources.values())):
+        return False, "Invalid additional_sources: Must be a dictionary of source names to source code."
+    return True, None
+
+
+def validate_field_options(options):
+    """
+    Validate the options of a single index field.
+    Returns a tuple: (valid: bool, error_msg: Optional[str])
+    """
+    if not isinstance(options, dict):
+        return False, "Must be a dictionary."
+    unknown = [key for key in options if key not in FIELD_OPTIONS]
+    if unknown:
+        return False, f"Unknown options: {', '.join(unknown)}. Supported: {', '.join(FIELD_OPTIONS)}."
+    if options.get('indexing') is not None and options['indexing'] not in FIELD_INDEXING:
+        return False, f"Invalid indexing: {options['indexing']}. Must be one of: {', '.join(FIELD_INDEXING)}."
+    if options.get('storage') is not None and not isinstance(options['storage'], bool):
+        return False, f"Invalid storage: {options['storage']}. Must be a boolean."
+    if options.get('term_vector') is not None and options['term_vector'] not in FIELD_TERM_VECTORS:
+        return False, f"Invalid term_vector: {options['term_vector']}. Must be one of: {', '.join(FIELD_TERM_VECTORS)}."
+
+    spatial = options.get('spatial')
+    if spatial is None:
+        return True, None
+    if not isinstance(spatial, dict):
+        return False, "Invalid spatial: Must be a dictionary."
+    unknown = [key for key in spatial if key not in SPATIAL_OPTIONS]
+    if unknown:
+        return False, f"Unknown spatial options: {', '.join(unknown)}. Supported: {', '.join(SPATIAL_OPTIONS)}."
+    for key, choices in [('type', SPATIAL_TYPES), ('strategy', SPATIAL_STRATEGIES), ('units', SPATIAL_UNITS)]:
+        if spatial.get(key) is not None and spatial[key] not in choices:
+            return False, f"Invalid spatial {key}: {spatial[key]}. Must be one of: {', '.join(choices)}."
+    return True, None
+
+
+def is_valid_wait(wait):
+    """Return True if wait is None or has a positive timeout and interval."""
+    if wait is None:
+        return True
+    timeout = wait.get('timeout')
+    interval = wait.get('interval')
+    return (isinstance(timeout, int) and timeout > 0
+            and isinstance(interval, (int, float)) and interval > 0)
+
+
+def is_valid_reset_waves(reset_waves):
+    """Return True if reset_waves is None or its size, timeout and interval are positive."""
+    if reset_waves is None:
+        return True
+    return (is_valid_concurrency(reset_waves.get('size'))
+            and (reset_waves.get('timeout') or 0) > 0
+            and (reset_waves.get('interval') or 0) > 0)
+
+
+def is_valid_sample_size(value):
+    """Return True if the value is a non-negative integer."""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
 def is_valid_state(state):
     """Return True if the state is one of: None, 'present', 'absent'."""
     return state in [None, 'present', 'absent']
@@ -554,18 +2069,78 @@ def is_valid_mode(mode):
 def main():
     module_args = dict(
         url=dict(type='str', required=True),
-        database_name=dict(type='str', required=True),
-        index_name=dict(type='str', required=True),
+        database_name=dict(type='str', required=False),
+        database_names=dict(type='list', elements='str', required=False),
+        max_concurrency=dict(type='int', default=4),
+        index_name=dict(type='str', required=False),
+        index_names=dict(type='list', elements='str', required=False),
         index_definition=dict(type='dict', required=False),
+        indexes=dict(
+            type='list',
+            elements='dict',
+            required=False,
+            options=dict(
+                name=dict(type='str', required=True),
+                index_definition=dict(type='dict', required=True))),
+        prune=dict(type='bool', default=False),
+        auto_indexes=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                max_idle_days=dict(type='float', required=False),
+                suggestions=dict(type='bool', default=True))),
+        deployment_mode=dict(type='str', choices=['rolling', 'parallel'], required=False),
+        test_sample_size=dict(type='int', default=100),
+        wait_for_non_stale=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                timeout=dict(type='int', default=600),
+                interval=dict(type='float', default=1))),
+        wait_for_replacement=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                timeout=dict(type='int', default=600),
+                interval=dict(type='float', default=1))),
         certificate_path=dict(type='str', required=False),
         ca_cert_path=dict(type='str', required=False),
         state=dict(type='str', choices=['present', 'absent'], required=False),
         mode=dict(type='str', choices=['resumed', 'paused', 'enabled', 'disabled', 'reset'], required=False),
+        reset_waves=dict(
+            type='dict',
+            required=False,
+            options=dict(
+                per=dict(type='str', choices=['node', 'database'], default='node'),
+                size=dict(type='int', default=1),
+                timeout=dict(type='int', default=600),
+                interval=dict(type='float', default=1))),
         cluster_wide=dict(type='bool', default=False)
     )
 
     module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[
+            ('database_name', 'database_names'),
+            ('index_name', 'indexes'),
+            ('index_name', 'index_names'),
+            ('index_names', 'indexes'),
+            ('index_names', 'index_definition'),
+            ('index_names', 'state'),
+            ('index_definition', 'indexes'),
+            ('state', 'indexes'),
+            ('mode', 'indexes'),
+            ('wait_for_replacement', 'indexes'),
+            ('wait_for_non_stale', 'indexes'),
+            ('wait_for_non_stale', 'mode'),
+            ('auto_indexes', 'index_name'),
+            ('auto_indexes', 'index_names'),
+            ('auto_indexes', 'indexes'),
+            ('auto_indexes', 'index_definition'),
+            ('auto_indexes', 'state'),
+            ('auto_indexes', 'mode')],
+        required_one_of=[('database_name', 'database_names'), ('index_name', 'indexes', 'mode', 'auto_indexes')],
+        required_by={'index_names': 'mode', 'reset_waves': ('index_name', 'mode')},
         supports_check_mode=True
     )
 
@@ -575,30 +2150,81 @@ def main():
             exception=LIB_IMP_ERR)
 
     url = module.params['url']
-    database_name = module.params['database_name']
-    index_name = module.params['index_name']
+    database_name = module.params.get('database_name')
+    database_names = module.params.get('database_names')
+    max_concurrency = module.params['max_concurrency']
+    index_name = module.params.get('index_name')
+    index_names = module.params.get('index_names')
+    indexes = module.params.get('indexes')
+    auto_indexes = module.params.get('auto_indexes')
     index_definition = module.params.get('index_definition')
     certificate_path = module.params.get('certificate_path')
     ca_cert_path = module.params.get('ca_cert_path')
     state = module.params.get('state')
     mode = module.params.get('mode')
     cluster_wide = module.params['cluster_wide']
+    wait_for_replacement = module.params.get('wait_for_replacement')
+    wait_for_non_stale = module.params.get('wait_for_non_stale')
+    test_sample_size = module.params['test_sample_size']
+    reset_waves = module.params.get('reset_waves')
 
     if not is_valid_url(url):
         module.fail_json(msg=f"Invalid URL: {url}")
 
-    if not is_valid_name(database_name):
+    if database_name is not None and not is_valid_name(database_name):
         module.fail_json(
             msg=f"Invalid database name: {database_name}. Only letters, numbers, dashes, and underscores are allowed.")
 
-    if not is_valid_name(index_name):
+    for name in database_names or []:
+        if not is_valid_database_pattern(name):
+            module.fail_json(
+                msg=f"Invalid database name: {name}. Only letters, numbers, dashes, underscores "
+                    f"and glob patterns are allowed.")
+
+    if database_names is not None and mode is not None and reset_waves is None:
+        module.fail_json(msg="mode with database_names requires reset_waves.")
+
+    if reset_waves is not None and mode != 'reset':
+        module.fail_json(msg="reset_waves requires mode reset.")
+
+    if not is_valid_reset_waves(reset_waves):
+        module.fail_json(
+            msg="Invalid reset_waves: size, timeout and interval must be positive numbers.")
+
+    if not is_valid_concurrency(max_concurrency):
+        module.fail_json(
+            msg=f"Invalid max_concurrency: {max_concurrency}. Must be a positive integer.")
+
+    if index_name is not None and not is_valid_name(index_name):
         module.fail_json(
             msg=f"Invalid index name: {index_name}. Only letters, numbers, dashes, and underscores are allowed.")
 
+    for name in index_names or []:
+        if not is_valid_name(name):
+            module.fail_json(
+                msg=f"Invalid index name: {name}. Only letters, numbers, dashes, and underscores are allowed.")
+
+    if auto_indexes and auto_indexes.get('max_idle_days') is not None and auto_indexes['max_idle_days'] < 0:
+        module.fail_json(
+            msg=f"Invalid max_idle_days: {auto_indexes['max_idle_days']}. Must not be negative.")
+
+    if index_name is None and indexes is None and (state or index_definition):
+        module.fail_json(msg="state and index_definition require index_name.")
+
+    if indexes is not None:
+        valid, error_msg = validate_indexes(indexes)
+        if not valid:
+            module.fail_json(msg=error_msg)
+
     if not is_valid_dict(index_definition):
         module.fail_json(
             msg="Invalid index definition: Must be a dictionary.")
 
+    if index_definition is not None:
+        valid, error_msg = validate_index_definition(index_definition)
+        if not valid:
+            module.fail_json(msg=f"Invalid index definition: {error_msg}")
+
     valid, error_msg = validate_paths(certificate_path, ca_cert_path)
     if not valid:
         module.fail_json(msg=error_msg)
@@ -615,17 +2241,60 @@ def main():
         module.fail_json(
             msg=f"Invalid cluster_wide flag: {cluster_wide}. Must be a boolean.")
 
+    if not is_valid_sample_size(test_sample_size):
+        module.fail_json(
+            msg=f"Invalid test_sample_size: {test_sample_size}. Must be a non-negative integer.")
+
+    if not is_valid_wait(wait_for_replacement):
+        module.fail_json(
+            msg="Invalid wait_for_replacement: timeout and interval must be positive numbers.")
+
+    if not is_valid_wait(wait_for_non_stale):
+        module.fail_json(
+            msg="Invalid wait_for_non_stale: timeout and interval must be positive numbers.")
+
     try:
         store = initialize_ravendb_store(module.params)
         check_mode = module.check_mode
 
+        if reset_waves is not None:
+            names = resolve_database_names(store, database_names) if database_names is not None else [database_name]
+            type, changed, message, report = reset_index_in_waves(store, names, index_name, reset_waves, check_mode)
+            if type == "error":
+                module.fail_json(changed=changed, msg=message, reset=report)
+            module.exit_json(changed=changed, msg=message, reset=report)
+
+        if database_names is not None:
+            names = resolve_database_names(store, database_names)
+            changed, results = reconcile_databases(store, module.params, names, max_concurrency, check_mode)
+            message = summarize_results(results)
+            if any(result['failed'] for result in results):
+                module.fail_json(changed=changed, msg=message, databases=results)
+            module.exit_json(changed=changed, msg=message, databases=results)
+
+        if indexes is not None:
+            type, changed, message, plan = reconcile_indexes(
+                store, module.params, check_mode)
+            module.exit_json(changed=changed, msg=message, indexes=plan)
+
+        if auto_indexes is not None:
+            type, changed, message, report = reconcile_auto_indexes(store, module.params, check_mode)
+            module.exit_json(changed=changed, msg=message, auto_indexes=report)
+
+        if index_name is None:
+            type, changed, message = reconcile_mode(store, module.params, check_mode)
+            if type == "error":
+                module.fail_json(changed=changed, msg=message)
+            module.exit_json(changed=changed, msg=message)
+
+        result = {}
         type, changed, message = reconcile_state(
-            store, module.params, check_mode)
+            store, module.params, check_mode, result)
 
         if type == "error":
-            module.fail_json(changed=changed, msg=message)
+            module.fail_json(changed=changed, msg=message, **result)
         else:
-            module.exit_json(changed=changed, msg=message)
+            module.exit_json(changed=changed, msg=message, **result)
 
     except RavenException as e:
         module.fail_json(msg=f"RavenDB operation failed: {str(e)}")
@@ -0,0 +1,393 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: index_info
+short_description: Gather performance statistics of RavenDB indexes
+description:
+    - This module collects performance statistics of the indexes of a RavenDB database,
+      on every node of the database group.
+    - Reports, per index and node, the map and reduce durations and batch sizes of the recent indexing batches,
+      the memory they allocated, the indexing errors and the entries count.
+    - Reports the slowest indexes, so that a deployment can be gated on index cost.
+    - The module never changes anything and supports check mode.
+version_added: "1.0.0"
+author: "Omer Ratsaby <omer.ratsaby@ravendb.net> (@thegoldenplatypus)"
+options:
+    url:
+        description:
+            - URL of the RavenDB server.
+            - Must include the scheme (http or https), hostname and port.
+        required: true
+        type: str
+    database_name:
+        description:
+            - Name of the database whose indexes are inspected.
+        required: true
+        type: str
+    index_names:
+        description:
+            - Names of the indexes to collect statistics for.
+            - If omitted, statistics are collected for every index of the database.
+        required: false
+        type: list
+        elements: str
+    top:
+        description:
+            - Number of slowest indexes to report in C(slowest).
+            - Indexes are ranked by the total duration of their recent indexing batches on the slowest node.
+            - Use C(0) to skip the report.
+        required: false
+        default: 5
+        type: int
+    certificate_path:
+        description:
+            - Path to a client certificate (PEM format) for secured communication.
+            - Optional, but recommended for secure connections.
+        required: false
+        type: str
+    ca_cert_path:
+        description:
+            - Path to a trusted CA certificate file to verify the RavenDB server's certificate.
+            - Optional if the server certificate is trusted by system CA store.
+        required: false
+        type: str
+requirements:
+    - python >= 3.9
+    - ravendb python client
+notes:
+    - Durations, batch sizes and allocated memory cover the recent indexing batches the server keeps in memory
+      for every index, not the whole lifetime of the index.
+    - Nodes that cannot be reached are reported with C(failed=true) and no statistics.
+      The task only fails when no node of the database group can be reached.
+'''
+
+EXAMPLES = '''
+- name: Gather performance statistics of every index
+  ravendb.ravendb.index_info:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+  register: index_info
+
+- name: Report the three slowest of some indexes
+  ravendb.ravendb.index_info:
+    url: "http://{{ ansible_host }}:8080"
+    database_name: "my_database"
+    index_names:
+      - "Orders/ByCompany"
+      - "Orders/Totals"
+    top: 3
+
+- name: Fail the deployment if an index spends more than a minute per batch window
+  ansible.builtin.assert:
+    that: index_info.slowest | selectattr('indexing_duration_ms', 'gt', 60000) | list | length == 0
+
+- name: Gather index statistics from a secured server
+  ravendb.ravendb.index_info:
+    url: "https://{{ ansible_host }}:443"
+    database_name: "my_database"
+    certificate_path: "combined_raven_cert.pem"
+    ca_cert_path: "ca_certificate.pem"
+'''
+
+RETURN = '''
+changed:
+    description: Always false, the module does not change anything.
+    type: bool
+    returned: always
+msg:
+    description: Human-readable summary of the collected statistics.
+    type: str
+    returned: always
+nodes:
+    description: Indexing status of the database on every node of the database group.
+    type: list
+    elements: dict
+    returned: always
+    sample:
+      - node: A
+        indexing_status: Running
+indexes:
+    description: Statistics of each index on each node.
+    type: list
+    elements: dict
+    returned: always
+    sample:
+      - name: Orders/ByCompany
+        node: A
+        type: MapReduce
+        state: Normal
+        status: Running
+        stale: false
+        entries_count: 830
+        errors_count: 0
+        map_errors: 0
+        reduce_errors: 0
+        mapped_per_second: 1520.4
+        reduced_per_second: 1498.2
+        batches: 12
+        indexing_duration_ms: 5230.4
+        map_duration_ms: 3120.7
+        reduce_duration_ms: 1840.2
+        average_batch_size: 4096
+        max_batch_size: 16384
+        allocated_bytes: 33554432
+slowest:
+    description: The C(top) slowest indexes, slowest first, with the node they are slowest on.
+    type: list
+    elements: dict
+    returned: always
+    sample:
+      - name: Orders/ByCompany
+        node: A
+        indexing_duration_ms: 5230.4
+        map_duration_ms: 3120.7
+        reduce_duration_ms: 1840.2
+        batches: 12
+'''
+
+import traceback
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ravendb.ravendb.plugins.module_utils.common import (
+    initialize_ravendb_store,
+    get_database_maintenance,
+    get_database_nodes,
+    send_to_node,
+    is_valid_url,
+    validate_paths)
+
+LIB_IMP_ERR = None
+try:
+    import requests
+    from ravendb.documents.operations.definitions import MaintenanceOperation
+    from ravendb.documents.operations.indexes import GetIndexesStatisticsOperation, GetIndexingStatusOperation
+    from ravendb.http.raven_command import RavenCommand
+    from ravendb.exceptions.raven_exceptions import RavenException
+    HAS_LIB = True
+except ImportError:
+    HAS_LIB = False
+    LIB_IMP_ERR = traceback.format_exc()
+
+DEFAULT_TOP = 5
+
+
+def get_index_performance(database_maintenance, index_names, node_tag):
+    """
+    Fetch the recent indexing batches of the indexes on a node, keyed by index name.
+    The client has no operation for the index performance endpoint.
+    """
+    class GetIndexPerformanceCommand(RavenCommand):
+        def __init__(self):
+            super().__init__(dict)
+
+        def create_request(self, node):
+            query = "&".join(f"name={quote(name)}" for name in index_names or [])
+            return requests.Request(
+                "GET", f"{node.url}/databases/{node.database}/indexes/performance?{query}")
+
+        def set_response(self, response, from_cache):
+            results = json.loads(response)["Results"] if response else []
+            self.result = {result["Name"]: result.get("Performance") or [] for result in results}
+
+        def is_read_request(self):
+            return True
+
+    class GetIndexPerformanceOperation(MaintenanceOperation):
+        def get_command(self, conventions):
+            return GetIndexPerformanceCommand()
+
+    return send_to_node(database_maintenance, GetIndexPerformanceOperation(), node_tag)
+
+
+def summarize_performance(batches):
+    """
+    Sum the durations of the recent indexing batches of an index and describe their sizes and allocations.
+
+    Returns a dict: {batches, indexing_duration_ms, map_duration_ms, reduce_duration_ms,
+    average_batch_size, max_batch_size, allocated_bytes}
+    """
+    durations = dict(Map=0.0, Reduce=0.0)
+    sizes = []
+    allocated = 0
+    for batch in batches:
+        for operation in (batch.get("Details") or {}).get("Operations") or []:
+            if operation.get("Name") in durations:
+                durations[operation["Name"]] += operation.get("DurationInMs") or 0
+        sizes.append(batch.get("InputCount") or 0)
+        allocated = max(allocated, sum(
+            (batch.get(key) or {}).get("SizeInBytes") or 0
+            for key in ["AllocatedManagedBytes", "AllocatedUnmanagedBytes"]))
+
+    return dict(
+        batches=len(batches),
+        indexing_duration_ms=round(sum(batch.get("DurationInMs") or 0 for batch in batches), 2),
+        map_duration_ms=round(durations["Map"], 2),
+        reduce_duration_ms=round(durations["Reduce"], 2),
+        average_batch_size=round(sum(sizes) / len(sizes)) if sizes else 0,
+        max_batch_size=max(sizes) if sizes else 0,
+        allocated_bytes=allocated)
+
+
+def collect_node_index_info(database_maintenance, index_names, node_tag):
+    """
+    Collect the statistics of the indexes on a single node.
+    Errors are captured in the result so that one unreachable node does not abort the others.
+
+    Returns a tuple: (node: dict, indexes: list of dict)
+    """
+    node = dict(node=node_tag)
+    try:
+        status = send_to_node(database_maintenance, GetIndexingStatusOperation(), node_tag)
+        statistics = send_to_node(database_maintenance, GetIndexesStatisticsOperation(), node_tag)
+        performance = get_index_performance(database_maintenance, index_names, node_tag)
+    except Exception as e:
+        node.update(failed=True, msg=f"Failed to collect index statistics on node '{node_tag}': {str(e)}")
+        return node, []
+
+    node.update(indexing_status=status.status.value)
+    indexes = []
+    for stats in statistics:
+        if index_names and stats["Name"] not in index_names:
+            continue
+        info = dict(
+            name=stats["Name"],
+            node=node_tag,
+            type=stats.get("Type"),
+            state=stats.get("State"),
+            status=stats.get("Status"),
+            stale=stats.get("IsStale"),
+            entries_count=stats.get("EntriesCount"),
+            errors_count=stats.get("ErrorsCount"),
+            map_errors=stats.get("MapErrors"),
+            reduce_errors=stats.get("ReduceErrors"),
+            mapped_per_second=round(stats.get("MappedPerSecondRate") or 0, 2),
+            reduced_per_second=round(stats.get("ReducedPerSecondRate") or 0, 2))
+        info.update(summarize_performance(performance.get(stats["Name"]) or []))
+        indexes.append(info)
+    return node, indexes
+
+
+def collect_index_info(store, database_name, index_names):
+    """Collect the statistics of the indexes on every node of the database group concurrently."""
+    database_maintenance = get_database_maintenance(store, database_name)
+    node_tags = get_database_nodes(store, database_name) or [None]
+    with ThreadPoolExecutor(max_workers=len(node_tags)) as executor:
+        results = list(executor.map(
+            lambda node_tag: collect_node_index_info(database_maintenance, index_names, node_tag), node_tags))
+
+    nodes = [node for node, _ in results]
+    indexes = [info for _, node_indexes in results for info in node_indexes]
+    return nodes, indexes
+
+
+def find_slowest_indexes(indexes, top):
+    """
+    Rank the indexes by the total duration of their recent batches on their slowest node.
+    Returns the top entries, slowest first.
+    """
+    slowest_by_name = {}
+    for info in indexes:
+        slowest = slowest_by_name.get(info['name'])
+        if slowest is None or info['indexing_duration_ms'] > slowest['indexing_duration_ms']:
+            slowest_by_name[info['name']] = info
+
+    ranked = sorted(slowest_by_name.values(), key=lambda info: info['indexing_duration_ms'], reverse=True)
+    return [
+        dict((key, info[key]) for key in
+             ['name', 'node', 'indexing_duration_ms', 'map_duration_ms', 'reduce_duration_ms', 'batches'])
+        for info in ranked[:top]]
+
+
+def summarize_info(nodes, indexes):
+    """Build a human-readable summary of the collected statistics."""
+    names = {info['name'] for info in indexes}
+    errors = sum(info['errors_count'] or 0 for info in indexes)
+    failed = len([node for node in nodes if node.get('failed')])
+    return (f"Collected statistics of {len(names)} indexes on {len(nodes)} nodes: "
+            f"{errors} indexing errors, {failed} nodes failed.")
+
+
+def is_valid_database_name(name):
+    """Check if the database name is valid (letters, numbers, dashes, underscores)."""
+    return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
+
+
+def is_valid_top(value):
+    """Return True if the value is a non-negative integer."""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def main():
+    module_args = dict(
+        url=dict(type='str', required=True),
+        database_name=dict(type='str', required=True),
+        index_names=dict(type='list', elements='str', required=False),
+        top=dict(type='int', default=DEFAULT_TOP),
+        certificate_path=dict(type='str', required=False),
+        ca_cert_path=dict(type='str', required=False)
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    if not HAS_LIB:
+        module.fail_json(
+            msg=missing_required_lib("ravendb"),
+            exception=LIB_IMP_ERR)
+
+    url = module.params['url']
+    database_name = module.params['database_name']
+    index_names = module.params.get('index_names')
+    top = module.params['top']
+    certificate_path = module.params.get('certificate_path')
+    ca_cert_path = module.params.get('ca_cert_path')
+
+    if not is_valid_url(url):
+        module.fail_json(msg=f"Invalid URL: {url}")
+
+    if not is_valid_database_name(database_name):
+        module.fail_json(
+            msg=f"Invalid database name: {database_name}. Only letters, numbers, dashes, and underscores are allowed.")
+
+    if not is_valid_top(top):
+        module.fail_json(msg=f"Invalid top: {top}. Must be a non-negative integer.")
+
+    valid, error_msg = validate_paths(certificate_path, ca_cert_path)
+    if not valid:
+        module.fail_json(msg=error_msg)
+
+    try:
+        store = initialize_ravendb_store(module.params)
+
+        nodes, indexes = collect_index_info(store, database_name, index_names)
+        slowest = find_slowest_indexes(indexes, top)
+        message = summarize_info(nodes, indexes)
+        if all(node.get('failed') for node in nodes):
+            module.fail_json(changed=False, msg=message, nodes=nodes, indexes=indexes, slowest=slowest)
+        module.exit_json(changed=False, msg=message, nodes=nodes, indexes=indexes, slowest=slowest)
+
+    except RavenException as e:
+        module.fail_json(msg=f"RavenDB operation failed: {str(e)}")
+    except Exception as e:
+        module.fail_json(msg=f"An unexpected error occurred: {str(e)}")
+    finally:
+        if 'store' in locals():
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,13 @@ module: node
 short_description: Add a RavenDB node to an existing cluster
 description:
     - This module adds a RavenDB node to a cluster, either as a member or a watcher.
-    - Requires specifying the leader node's URL.
+    - The URL of any cluster member can be given, the cluster topology is read from it to find the current leader.
+    - Idempotent, a node that is already in the cluster with the requested role is left untouched.
+      A member is demoted to a watcher, and a watcher promoted to a member, when the other role is requested.
+    - Several nodes can be added in one invocation with C(nodes). They share one keep-alive HTTP session
+      and every node is awaited in the cluster topology before the next one is added.
+    - Requests use connect and read timeouts and are retried with exponential backoff while the cluster
+      answers 503 (e.g. during a leader election) or has no leader.
     - Supports check mode to simulate the addition without applying changes.
 version_added: "1.0.0"
 author: "Omer Ratsaby <omer.ratsaby@ravendb.net> (@thegoldenplatypus)"
@@ -23,9 +29,46 @@ options:
         description:
             - Dictionary containing the node details to add.
             - Must include C(tag), C(url), and C(leader_url).
+            - C(leader_url) may be the URL of any cluster member, requests are sent to the leader it reports.
+              If the topology cannot be read from it, or it is a passive node that is not part of a cluster yet
+              (which forms a new cluster), the URL is used as the leader.
             - Optionally, set C(type) to "Watcher" to add the node as a watcher instead of a full member.
-        required: true
+            - One of C(node) or C(nodes) is required.
+        required: false
         type: dict
+    nodes:
+        description:
+            - List of nodes to add one after another, each with the same keys as C(node).
+            - Stops at the first node that fails. The outcome of every processed node is returned as C(nodes).
+            - Mutually exclusive with C(node).
+        required: false
+        type: list
+        elements: dict
+    connect_timeout:
+        description:
+            - Seconds to wait for a connection to a cluster node.
+        required: false
+        default: 5
+        type: float
+    read_timeout:
+        description:
+            - Seconds to wait for a cluster node to answer a request.
+        required: false
+        default: 60
+        type: float
+    retries:
+        description:
+            - Number of times a request is retried while the cluster answers 503 or has no leader.
+            - The delay starts at one second and doubles after every retry, up to 30 seconds.
+        required: false
+        default: 5
+        type: int
+    wait_timeout:
+        description:
+            - Seconds to wait for every node added with C(nodes) to appear in the cluster topology.
+        required: false
+        default: 120
+        type: int
 requirements:
     - python >= 3.9
     - requests
@@ -38,6 +81,7 @@ notes:
     - The node C(tag) must be an uppercase, non-empty alphanumeric string.
     - URLs must be valid HTTP or HTTPS addresses.
     - Check mode is fully supported and simulates joining the node without actually performing the action.
+    - A node that joined as a member may be reported as a promotable until it caught up, it counts as a member.
 '''
 
 EXAMPLES = '''
@@ -56,6 +100,28 @@ EXAMPLES = '''
       url: "http://192.168.118.77:8080"
       leader_url: "http://192.168.117.90:8080"
 
+- name: Join Node E as a Member through any member of the cluster
+  ravendb.ravendb.node:
+    node:
+      tag: E
+      url: "http://192.168.118.78:8080"
+      leader_url: "http://192.168.118.77:8080"
+
+- name: Form a cluster of three nodes in one task
+  ravendb.ravendb.node:
+    nodes:
+      - tag: B
+        url: "http://192.168.118.120:8080"
+        leader_url: "http://192.168.117.90:8080"
+      - tag: C
+        url: "http://192.168.118.77:8080"
+        leader_url: "http://192.168.117.90:8080"
+      - tag: D
+        type: "Watcher"
+        url: "http://192.168.118.200:8080"
+        leader_url: "http://192.168.117.90:8080"
+    retries: 8
+
 - name: Simulate adding Node D (check mode)
   ravendb.ravendb.node:
     node:
@@ -78,11 +144,38 @@ msg:
     returned: always
     sample: Node B added to the cluster
     version_added: "1.0.0"
+
+leader:
+    description: Tag of the cluster leader the request was sent to.
+    type: str
+    returned: when the cluster topology could be read
+    sample: A
+
+nodes:
+    description: Outcome of every processed node when C(nodes) is used, in the given order.
+    type: list
+    elements: dict
+    returned: when C(nodes) is used
+    sample:
+      - tag: B
+        changed: true
+        msg: Node B added to the cluster
+        leader: A
+      - tag: C
+        changed: false
+        msg: Node C is already a Member of the cluster
+        leader: A
 '''
 
+import time
 from urllib.parse import urlparse
 from ansible.module_utils.basic import AnsibleModule
 
+DEFAULT_TIMEOUT = (5, 60)
+INITIAL_BACKOFF = 1
+MAX_BACKOFF = 30
+WAIT_INTERVAL = 1
+
 
 def is_valid_url(url):
     """Return True if the given URL is a string with a valid HTTP or HTTPS scheme and a network location."""
@@ -97,22 +190,137 @@ def is_valid_tag(tag):
     return isinstance(tag, str) and tag.isalnum() and tag.isupper()
 
 
-def add_node(node, check_mode):
+def backoff_delays(retries):
+    """Yield the delay before every retry: 1, 2, 4, ... seconds, capped at MAX_BACKOFF."""
+    delay = INITIAL_BACKOFF
+    for _ in range(retries):
+        yield delay
+        delay = min(delay * 2, MAX_BACKOFF)
+
+
+def send_request(http, method, url, timeout=DEFAULT_TIMEOUT, retries=0):
+    """
+    Send a request through the session (or the requests module), retrying with exponential backoff
+    while the server answers 503 Service Unavailable, e.g. during a leader election.
+    Returns the last response.
+    """
+    headers = {"Content-Type": "application/json"}
+    response = getattr(http, method)(url, headers=headers, timeout=timeout)
+    for delay in backoff_delays(retries):
+        if response.status_code != 503:
+            break
+        time.sleep(delay)
+        response = getattr(http, method)(url, headers=headers, timeout=timeout)
+    return response
+
+
+def get_cluster_topology(url, http=None, timeout=DEFAULT_TIMEOUT, retries=0):
+    """
+    Read the cluster topology (nodes, roles and current leader) from any node of the cluster.
+    While the node answers 503 or the cluster has no leader (an election is in progress), the topology
+    is read again with exponential backoff, at most retries times in total. A passive node is returned at once.
+    """
+    import requests
+    http = http or requests
+    delays = backoff_delays(retries)
+    while True:
+        response = send_request(http, "get", f"{url}/cluster/topology", timeout)
+        cluster = None
+        if response.status_code != 503:
+            response.raise_for_status()
+            cluster = response.json()
+            if cluster.get("Leader") or is_passive_node(cluster):
+                return cluster
+        delay = next(delays, None)
+        if delay is None:
+            response.raise_for_status()
+            return cluster
+        time.sleep(delay)
+
+
+def wait_for_node(http, url, tag, role, timeout, request_timeout=DEFAULT_TIMEOUT):
+    """
+    Wait until the node appears in the cluster topology with the role.
+    Returns True once it is there, False on timeout.
+    """
+    import requests
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = send_request(http, "get", f"{url}/cluster/topology", request_timeout)
+            response.raise_for_status()
+            if get_node_role(response.json().get("Topology") or {}, tag) == role:
+                return True
+        except (requests.RequestException, ValueError):
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(WAIT_INTERVAL)
+
+
+def get_node_role(topology, tag):
+    """
+    Return the role of the node in the cluster topology: "Member" (including promotables), "Watcher",
+    or None if the tag is not part of the cluster.
+    """
+    if tag in (topology.get("Members") or {}) or tag in (topology.get("Promotables") or {}):
+        return "Member"
+    if tag in (topology.get("Watchers") or {}):
+        return "Watcher"
+    return None
+
+
+def is_passive_node(cluster):
+    """
+    Return True if the node is not part of any cluster yet. A passive node has no leader and no members
+    (at most the '?' placeholder of its own URL). Adding a node through it forms a new cluster.
+    """
+    topology = cluster.get("Topology") or {}
+    if "Passive" in (cluster.get("CurrentState"), topology.get("CurrentState")):
+        return True
+    members = [tag for tag in (topology.get("Members") or {}) if tag != "?"]
+    return not cluster.get("Leader") and not members
+
+
+def same_url(first, second):
+    """Return True if both URLs point to the same server, ignoring case and a trailing slash."""
+    return first.rstrip("/").lower() == second.rstrip("/").lower()
+
+
+def get_error_message(response, e):
+    """Extract the server's error message from a failed response."""
+    if response is None or not response.content:
+        return str(e)
+    try:
+        return response.json().get("Message", response.text)
+    except ValueError:
+        return response.text
+
+
+def add_node(node, check_mode, http=None, timeout=DEFAULT_TIMEOUT, retries=0, wait_timeout=None):
     """
     Add a new node to a RavenDB cluster by making an HTTP PUT request to the leader node.
+    The leader is discovered from the topology reported by 'leader_url', which may be any cluster member.
+    A node already in the cluster with the requested role is not changed, one with the other role
+    is promoted or demoted instead.
 
     Args:
         node (dict): Dictionary containing 'url', 'tag', 'leader_url', and 'type' fields.
         check_mode (bool): If True, simulate adding the node without making changes.
+        http: requests.Session to send the requests through (the requests module if omitted).
+        timeout (tuple): Connect and read timeout of every request.
+        retries (int): Number of retries while the cluster answers 503 or has no leader.
+        wait_timeout (int): If set, wait up to this many seconds for the node to appear in the topology.
 
     Returns:
-        dict: Result dictionary with keys 'changed', 'msg', and optionally 'error'.
+        dict: Result dictionary with keys 'changed', 'msg', and optionally 'leader' and 'error'.
     """
     import requests
+    http = http or requests
     url = node.get("url")
     tag = node.get("tag")
     leader_url = node.get("leader_url")
-    is_watcher = node.get("type") == "Watcher"
+    role = "Watcher" if node.get("type") == "Watcher" else "Member"
 
     if not leader_url:
         return {"changed": False, "msg": "Leader URL must be specified"}
@@ -130,49 +338,150 @@ def add_node(node, check_mode):
             "changed": False,
             "msg": "Invalid URL: must be a valid HTTP(S) URL"}
 
-    headers = {"Content-Type": "application/json"}
+    result = {}
+    current_role = None
 
-    if check_mode:
-        return {
-            "changed": True,
-            "msg": f"Node {tag} would be added to the cluster"}
     try:
+        cluster = get_cluster_topology(leader_url, http, timeout, retries)
+    except (requests.RequestException, ValueError):
+        cluster = None
+
+    if cluster is not None and is_passive_node(cluster):
+        cluster = None
+
+    if cluster is not None:
+        topology = cluster.get("Topology") or {}
+        all_nodes = topology.get("AllNodes") or {}
+        leader = cluster.get("Leader")
+        if not leader or leader not in all_nodes:
+            return {
+                "changed": False,
+                "msg": f"Failed to add node {tag}",
+                "error": "The cluster has no leader at the moment, retry once a leader was elected."}
+        leader_url = all_nodes[leader]
+        result["leader"] = leader
+
+        if tag in all_nodes and not same_url(all_nodes[tag], url):
+            return dict(result, **{
+                "changed": False,
+                "msg": f"Failed to add node {tag}",
+                "error": f"Node {tag} is already in the cluster with URL {all_nodes[tag]}."})
+        other_tags = [other for other, other_url in all_nodes.items() if other != tag and same_url(other_url, url)]
+        if other_tags:
+            return dict(result, **{
+                "changed": False,
+                "msg": f"Failed to add node {tag}",
+                "error": f"URL {url} already belongs to node {other_tags[0]}."})
+
+        current_role = get_node_role(topology, tag)
+        if current_role == role:
+            return dict(result, changed=False, msg=f"Node {tag} is already a {role} of the cluster")
+
+    action = "added to the cluster" if current_role is None else (
+        "demoted to a Watcher" if role == "Watcher" else "promoted to a Member")
 
-        add_url = f"{leader_url}/admin/cluster/node?url={url}&tag={tag}"
-        if is_watcher:
-            add_url += "&watcher=true"
+    if check_mode:
+        return dict(result, changed=True, msg=f"Node {tag} would be {action}")
 
-        response = requests.put(add_url, headers=headers)
+    failure = f"Failed to {'add' if current_role is None else 'change the role of'} node {tag}"
+    response = None
+    try:
+        if current_role is None:
+            add_url = f"{leader_url}/admin/cluster/node?url={url}&tag={tag}"
+            if role == "Watcher":
+                add_url += "&watcher=true"
+            response = send_request(http, "put", add_url, timeout, retries)
+        else:
+            command = "demote" if role == "Watcher" else "promote"
+            response = send_request(
+                http, "post", f"{leader_url}/admin/cluster/{command}?nodeTag={tag}", timeout, retries)
         response.raise_for_status()
 
     except requests.HTTPError as e:
-        error_message = response.json().get(
-            "Message", response.text) if response.content else str(e)
-        return {
+        return dict(result, **{
             "changed": False,
-            "msg": f"Failed to add node {tag}",
-            "error": error_message}
+            "msg": failure,
+            "error": get_error_message(response, e)})
 
     except requests.RequestException as e:
-        return {
+        return dict(result, **{
             "changed": False,
-            "msg": f"Failed to add node {tag}",
-            "error": str(e)}
+            "msg": failure,
+            "error": str(e)})
+
+    if wait_timeout and not wait_for_node(http, leader_url, tag, role, wait_timeout, timeout):
+        return dict(result, **{
+            "changed": True,
+            "msg": f"Node {tag} {action}",
+            "error": f"Node {tag} did not appear in the cluster topology as a {role} within {wait_timeout} seconds."})
+
+    return dict(result, changed=True, msg=f"Node {tag} {action}")
+
 
-    return {"changed": True, "msg": f"Node {tag} added to the cluster"}
+def add_nodes(nodes, check_mode, http, timeout=DEFAULT_TIMEOUT, retries=0, wait_timeout=None):
+    """
+    Add the nodes one after another through one HTTP session, waiting for every node to reach
+    the cluster topology before the next one is added. Stops at the first failing node.
+
+    Returns:
+        dict: Result dictionary with keys 'changed', 'msg', 'nodes' and optionally 'error'.
+    """
+    results = []
+    for node in nodes:
+        result = dict(add_node(node, check_mode, http, timeout, retries, wait_timeout), tag=node.get("tag"))
+        results.append(result)
+        if "error" in result:
+            break
+
+    changed = any(result["changed"] for result in results)
+    added = len([result for result in results if result["changed"]])
+    verb = "would be" if check_mode else "were"
+    summary = {"changed": changed, "msg": f"{added} of {len(nodes)} nodes {verb} added or changed", "nodes": results}
+    if "error" in results[-1]:
+        summary["error"] = f"Node {results[-1]['tag']}: {results[-1]['error']}"
+    return summary
 
 
 def main():
     module_args = {
-        "node": {"type": "dict", "required": True},
+        "node": {"type": "dict", "required": False},
+        "nodes": {"type": "list", "elements": "dict", "required": False},
+        "connect_timeout": {"type": "float", "default": DEFAULT_TIMEOUT[0]},
+        "read_timeout": {"type": "float", "default": DEFAULT_TIMEOUT[1]},
+        "retries": {"type": "int", "default": 5},
+        "wait_timeout": {"type": "int", "default": 120},
     }
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        mutually_exclusive=[("node", "nodes")],
+        required_one_of=[("node", "nodes")],
+        supports_check_mode=True)
     node = module.params["node"]
+    nodes = module.params["nodes"]
+    timeout = (module.params["connect_timeout"], module.params["read_timeout"])
+    retries = module.params["retries"]
+    wait_timeout = module.params["wait_timeout"]
+
+    if min(timeout) <= 0:
+        module.fail_json(msg="Invalid timeouts: connect_timeout and read_timeout must be positive.")
+
+    if retries < 0:
+        module.fail_json(msg=f"Invalid retries: {retries}. Must not be negative.")
+
+    if not nodes and node is None:
+        module.fail_json(msg="nodes must not be empty.")
 
     try:
-        changed, message = add_node(node, module.check_mode)
-        module.exit_json(changed=changed, msg=message)
+        import requests
+        with requests.Session() as session:
+            if nodes:
+                result = add_nodes(nodes, module.check_mode, session, timeout, retries, wait_timeout)
+            else:
+                result = add_node(node, module.check_mode, session, timeout, retries)
+        if "error" in result:
+            module.fail_json(**result)
+        module.exit_json(**result)
 
     except Exception as e:
         module.fail_json(msg=f"An error occurred: {str(e)}")
@@ -4,14 +4,37 @@
 
 from unittest import TestCase
 from unittest.mock import patch, Mock
-from ansible_collections.ravendb.ravendb.plugins.modules.node import add_node, is_valid_url, is_valid_tag
+from ansible_collections.ravendb.ravendb.plugins.modules.node import (
+    add_node,
+    add_nodes,
+    get_cluster_topology,
+    send_request,
+    is_valid_url,
+    is_valid_tag
+)
 import requests
 
 
+PASSIVE_TOPOLOGY = {
+    "Leader": None,
+    "CurrentState": "Passive",
+    "Topology": {
+        "AllNodes": {"?": "http://localhost:8080"},
+        "Members": {"?": "http://localhost:8080"},
+        "Promotables": {},
+        "Watchers": {}}}
+
+
 class TestAddNodeWithRavenDB(TestCase):
 
     def setUp(self):
         self.leader_url = "http://localhost:8080"
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json.return_value = PASSIVE_TOPOLOGY
+        get_patcher = patch("requests.get", return_value=mock_response)
+        self.mock_get = get_patcher.start()
+        self.addCleanup(get_patcher.stop)
 
     def test_add_node_success(self):
         node = {
@@ -118,6 +141,167 @@ class TestAddNodeWithRavenDB(TestCase):
             self.assertIn("Failed to add node A", result["msg"])
 
 
+class TestAddNodeWithTopology(TestCase):
+
+    def setUp(self):
+        self.member_url = "http://localhost:8081"
+        self.topology = {
+            "Leader": "A",
+            "Topology": {
+                "AllNodes": {"A": "http://localhost:8080", "B": "http://localhost:8081", "C": "http://localhost:8082"},
+                "Members": {"A": "http://localhost:8080", "B": "http://localhost:8081"},
+                "Promotables": {},
+                "Watchers": {"C": "http://localhost:8082"}}}
+
+    def mock_get(self, topology):
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json.return_value = topology
+        return patch("requests.get", return_value=mock_response)
+
+    def test_add_node_through_member_sends_to_leader(self):
+        node = {"url": "http://localhost:8083", "tag": "D", "leader_url": self.member_url}
+        with self.mock_get(self.topology), patch("requests.put") as mock_put:
+            mock_put.return_value = Mock(raise_for_status=Mock())
+            result = add_node(node, check_mode=False)
+            self.assertTrue(result["changed"])
+            self.assertEqual(result["leader"], "A")
+            self.assertTrue(mock_put.call_args[0][0].startswith("http://localhost:8080/admin/cluster/node?"))
+
+    def test_add_existing_member_is_unchanged(self):
+        node = {"url": "http://localhost:8081/", "tag": "B", "leader_url": self.member_url}
+        with self.mock_get(self.topology), patch("requests.put") as mock_put:
+            result = add_node(node, check_mode=False)
+            self.assertFalse(result["changed"])
+            self.assertEqual(result["msg"], "Node B is already a Member of the cluster")
+            mock_put.assert_not_called()
+
+    def test_promote_watcher_to_member(self):
+        node = {"url": "http://localhost:8082", "tag": "C", "leader_url": self.member_url, "type": "Member"}
+        with self.mock_get(self.topology), patch("requests.post") as mock_post, patch("requests.put") as mock_put:
+            self.assertEqual(add_node(node, check_mode=True)["msg"], "Node C would be promoted to a Member")
+            mock_post.return_value = Mock(raise_for_status=Mock())
+            result = add_node(node, check_mode=False)
+            self.assertTrue(result["changed"])
+            mock_post.assert_called_once()
+            self.assertEqual(mock_post.call_args[0][0], "http://localhost:8080/admin/cluster/promote?nodeTag=C")
+            mock_put.assert_not_called()
+
+    def test_add_node_with_tag_of_other_url(self):
+        node = {"url": "http://localhost:9090", "tag": "B", "leader_url": self.member_url}
+        with self.mock_get(self.topology), patch("requests.put") as mock_put:
+            result = add_node(node, check_mode=False)
+            self.assertFalse(result["changed"])
+            self.assertIn("already in the cluster with URL http://localhost:8081", result["error"])
+            mock_put.assert_not_called()
+
+    def test_add_node_to_passive_node_forms_cluster(self):
+        node = {"url": "http://localhost:8081", "tag": "B", "leader_url": "http://localhost:8080"}
+        with self.mock_get(PASSIVE_TOPOLOGY), patch("requests.put") as mock_put:
+            mock_put.return_value = Mock(raise_for_status=Mock())
+            result = add_node(node, check_mode=False)
+            self.assertTrue(result["changed"])
+            self.assertEqual(result["msg"], "Node B added to the cluster")
+            self.assertEqual(
+                mock_put.call_args[0][0], "http://localhost:8080/admin/cluster/node?url=http://localhost:8081&tag=B")
+
+    def test_add_node_during_leader_election(self):
+        node = {"url": "http://localhost:8083", "tag": "D", "leader_url": self.member_url}
+        with self.mock_get(dict(self.topology, Leader=None, CurrentState="Candidate")), \
+                patch("requests.put") as mock_put:
+            result = add_node(node, check_mode=False)
+            self.assertFalse(result["changed"])
+            self.assertIn("no leader", result["error"])
+            mock_put.assert_not_called()
+
+
+class TestAddNodesWithSession(TestCase):
+
+    def setUp(self):
+        self.leader_url = "http://localhost:8080"
+        self.topology = {
+            "Leader": "A",
+            "Topology": {
+                "AllNodes": {"A": self.leader_url},
+                "Members": {"A": self.leader_url},
+                "Promotables": {},
+                "Watchers": {}}}
+
+    def response(self, status_code=200, json=None):
+        response = Mock(status_code=status_code)
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error")
+            json = json or {"Message": f"{status_code} Error"}
+        response.json.return_value = json
+        return response
+
+    def test_retry_on_service_unavailable(self):
+        session = Mock()
+        session.put.side_effect = [self.response(503), self.response(503), self.response(200)]
+        with patch("ansible_collections.ravendb.ravendb.plugins.modules.node.time.sleep") as mock_sleep:
+            response = send_request(session, "put", f"{self.leader_url}/admin/cluster/node", (1, 2), retries=5)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(session.put.call_count, 3)
+            self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1, 2])
+            self.assertEqual(session.put.call_args[1]["timeout"], (1, 2))
+
+        session.put.side_effect = [self.response(503)] * 3
+        with patch("ansible_collections.ravendb.ravendb.plugins.modules.node.time.sleep"):
+            response = send_request(session, "put", f"{self.leader_url}/admin/cluster/node", retries=2)
+            self.assertEqual(response.status_code, 503)
+
+    def test_topology_retries_share_one_budget(self):
+        election = dict(self.topology, Leader=None, CurrentState="Candidate")
+        session = Mock()
+        session.get.side_effect = [self.response(503), self.response(json=election), self.response(json=election)]
+        with patch("ansible_collections.ravendb.ravendb.plugins.modules.node.time.sleep") as mock_sleep:
+            cluster = get_cluster_topology(self.leader_url, session, retries=2)
+            self.assertIsNone(cluster["Leader"])
+            self.assertEqual(session.get.call_count, 3)
+            self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1, 2])
+
+        session.get.side_effect = [self.response(json=PASSIVE_TOPOLOGY)]
+        with patch("ansible_collections.ravendb.ravendb.plugins.modules.node.time.sleep") as mock_sleep:
+            self.assertEqual(get_cluster_topology(self.leader_url, session, retries=5), PASSIVE_TOPOLOGY)
+            mock_sleep.assert_not_called()
+
+    def test_add_nodes_waits_for_topology(self):
+        topology_with_b = {
+            "Leader": "A",
+            "Topology": dict(self.topology["Topology"], AllNodes={"A": self.leader_url, "B": "http://localhost:8081"},
+                             Promotables={"B": "http://localhost:8081"})}
+        session = Mock()
+        session.get.side_effect = [
+            self.response(json=self.topology), self.response(json=self.topology), self.response(json=topology_with_b),
+            self.response(json=topology_with_b)]
+        session.put.return_value = self.response()
+        nodes = [
+            {"tag": "B", "url": "http://localhost:8081", "leader_url": self.leader_url},
+            {"tag": "B", "url": "http://localhost:8081", "leader_url": self.leader_url}]
+
+        with patch("ansible_collections.ravendb.ravendb.plugins.modules.node.time.sleep"):
+            result = add_nodes(nodes, False, session, wait_timeout=10)
+
+        self.assertTrue(result["changed"])
+        self.assertEqual([node["changed"] for node in result["nodes"]], [True, False])
+        self.assertEqual(result["msg"], "1 of 2 nodes were added or changed")
+        self.assertEqual(session.put.call_count, 1)
+        self.assertEqual(session.get.call_count, 4)
+
+    def test_add_nodes_stops_at_first_failure(self):
+        session = Mock()
+        session.get.return_value = self.response(json=self.topology)
+        session.put.return_value = self.response(400)
+        nodes = [
+            {"tag": "B", "url": "http://localhost:8081", "leader_url": self.leader_url},
+            {"tag": "C", "url": "http://localhost:8082", "leader_url": self.leader_url}]
+
+        result = add_nodes(nodes, False, session)
+        self.assertFalse(result["changed"])
+        self.assertEqual(len(result["nodes"]), 1)
+        self.assertIn("Node B", result["error"])
+
+
 class TestValidationFunctions(TestCase):
     def test_valid_url(self):
         self.assertTrue(is_valid_url("https://example.com"))
@@ -4,10 +4,37 @@
 
 import os
 from ravendb_test_driver import RavenTestDriver
+from ravendb import GetDatabaseNamesOperation
 from unittest import TestCase
+from unittest.mock import patch, Mock
 from ansible_collections.ravendb.ravendb.plugins.modules.database import (
     handle_present_state,
     handle_absent_state,
+    reconcile_databases,
+    get_existing_databases,
+    iter_database_names,
+    database_exists,
+    reconcile_settings,
+    get_database_record,
+    wait_for_topology,
+    plan_topology_changes,
+    reconcile_topology,
+    get_database_topology,
+    get_raw_database_record,
+    plan_shard_placement,
+    reconcile_sharded_database,
+    handle_compacted_state,
+    handle_toggle_state,
+    is_database_disabled,
+    is_valid_toggle_state,
+    validate_databases,
+    is_valid_database_state,
+    is_valid_concurrency,
+    is_valid_page_size,
+    is_valid_settings,
+    is_valid_wait,
+    is_valid_members,
+    is_valid_sharding,
     is_valid_url,
     is_valid_database_name,
     is_valid_replication_factor,
@@ -85,6 +112,446 @@ class TestDBStateValidator(TestCase):
         self.assertFalse(changed)
         self.assertIn(f"Database '{db_name}' does not exist.", message)
 
+    def test_reconcile_databases(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_reconcile_databases")
+
+        handle_present_state(store, "bulk_db_to_delete", 1, False)
+        handle_present_state(store, "bulk_db_existing", 1, False)
+
+        databases = [
+            {"name": "bulk_db_new", "replication_factor": 1, "state": "present"},
+            {"name": "bulk_db_existing", "replication_factor": 1, "state": "present"},
+            {"name": "bulk_db_to_delete", "state": "absent"},
+            {"name": "bulk_db_missing", "state": "absent"},
+        ]
+
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=2, check_mode=False)
+
+        self.assertTrue(changed)
+        self.assertEqual([r["name"] for r in results], [d["name"] for d in databases])
+        self.assertEqual([r["changed"] for r in results], [True, False, True, False])
+        self.assertFalse(any(r["failed"] for r in results))
+
+        existing_databases = get_existing_databases(store)
+        self.assertIn("bulk_db_new", existing_databases)
+        self.assertNotIn("bulk_db_to_delete", existing_databases)
+
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=2, check_mode=False)
+        self.assertFalse(changed)
+
+    def test_reconcile_databases_check_mode(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_reconcile_databases_check_mode")
+
+        databases = [{"name": "bulk_db_check", "replication_factor": 1, "state": "present"}]
+
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=1, check_mode=True)
+
+        self.assertTrue(changed)
+        self.assertIn("Database 'bulk_db_check' would be created.", results[0]["msg"])
+        self.assertNotIn("bulk_db_check", get_existing_databases(store))
+
+    def test_disable_and_enable_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_disable_and_enable_database")
+
+        handle_present_state(store, "toggle_db", 1, False)
+
+        changed, message, error = handle_toggle_state(store, "toggle_db", "disabled", check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("would be disabled", message)
+        self.assertFalse(is_database_disabled(store, "toggle_db"))
+
+        changed, message, error = handle_toggle_state(store, "toggle_db", "disabled", check_mode=False)
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertTrue(is_database_disabled(store, "toggle_db"))
+
+        changed, message, error = handle_toggle_state(store, "toggle_db", "disabled", check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("already disabled", message)
+
+        changed, message, error = handle_toggle_state(store, "toggle_db", "enabled", check_mode=False)
+        self.assertTrue(changed)
+        self.assertFalse(is_database_disabled(store, "toggle_db"))
+
+        changed, message, error = handle_toggle_state(store, "toggle_db_missing", "enabled", check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("does not exist", error)
+
+    def test_reconcile_databases_toggle_state(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_reconcile_databases_toggle_state")
+
+        for name in ["cold_db_1", "cold_db_2", "warm_db"]:
+            handle_present_state(store, name, 1, False)
+
+        databases = [
+            {"name": "cold_db_1", "state": "disabled"},
+            {"name": "cold_db_2", "state": "disabled"},
+            {"name": "warm_db", "state": "enabled"},
+            {"name": "cold_db_missing", "state": "disabled"},
+        ]
+
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=2, check_mode=False)
+
+        self.assertTrue(changed)
+        self.assertEqual([r["name"] for r in results], [d["name"] for d in databases])
+        self.assertEqual([r["changed"] for r in results], [True, True, False, False])
+        self.assertEqual([r["failed"] for r in results], [False, False, False, True])
+        self.assertTrue(is_database_disabled(store, "cold_db_1"))
+        self.assertTrue(is_database_disabled(store, "cold_db_2"))
+
+        databases = [{"name": "cold_db_1", "state": "enabled"}, {"name": "cold_db_2", "state": "enabled"}]
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=2, check_mode=False)
+        self.assertTrue(changed)
+        self.assertFalse(is_database_disabled(store, "cold_db_1"))
+
+        changed, results = reconcile_databases(
+            store, databases, max_concurrency=2, check_mode=False)
+        self.assertFalse(changed)
+
+    def test_list_databases_across_pages(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_list_databases_across_pages")
+
+        for db_name in ["paged_db_1", "paged_db_2", "paged_db_3"]:
+            handle_present_state(store, db_name, 1, False)
+
+        all_names = store.maintenance.server.send(GetDatabaseNamesOperation(0, 1024))
+        all_names = list(dict.fromkeys(name.split("$")[0] for name in all_names))
+        self.assertGreater(len(all_names), 2)
+
+        self.assertEqual(list(iter_database_names(store, page_size=2)), all_names)
+        self.assertEqual(get_existing_databases(store, page_size=2), set(all_names))
+        self.assertTrue(database_exists(store, all_names[-1], page_size=1))
+        self.assertFalse(database_exists(store, "paged_db_missing", page_size=2))
+
+        changed, message = handle_present_state(
+            store, all_names[-1], 1, False, page_size=1)
+        self.assertFalse(changed)
+        self.assertIn("already exists.", message)
+
+    def test_reconcile_settings(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_reconcile_settings")
+
+        db_name = "settings_db"
+        settings = {"Indexing.MapBatchSize": 1024, "Indexing.MapTimeoutInSec": 30}
+
+        changed, message = handle_present_state(
+            store, db_name, 1, False, settings=settings)
+        self.assertTrue(changed)
+        self.assertEqual(
+            get_database_record(store, db_name).settings.get("Indexing.MapBatchSize"), "1024")
+
+        changed, changed_keys, message = reconcile_settings(store, db_name, settings, False)
+        self.assertFalse(changed)
+        self.assertEqual(changed_keys, [])
+
+        settings["Indexing.MapBatchSize"] = 2048
+        changed, changed_keys, message = reconcile_settings(store, db_name, settings, True)
+        self.assertTrue(changed)
+        self.assertEqual(changed_keys, ["Indexing.MapBatchSize"])
+        self.assertIn("would be updated", message)
+
+        changed, changed_keys, message = reconcile_settings(store, db_name, settings, False)
+        self.assertTrue(changed)
+        self.assertEqual(changed_keys, ["Indexing.MapBatchSize"])
+
+        record_settings = get_database_record(store, db_name).settings
+        self.assertEqual(record_settings.get("Indexing.MapBatchSize"), "2048")
+        self.assertEqual(record_settings.get("Indexing.MapTimeoutInSec"), "30")
+
+    def test_wait_for_topology(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_wait_for_topology")
+
+        db_name = "wait_db"
+        handle_present_state(store, db_name, 1, False)
+
+        converged, convergence, message = wait_for_topology(
+            store, db_name, timeout=30, interval=0.1)
+
+        self.assertTrue(converged)
+        self.assertEqual(len(convergence["nodes"]), 1)
+        self.assertIn(f"Database '{db_name}' topology converged", message)
+
+    def test_wait_for_topology_timeout(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_wait_for_topology_timeout")
+
+        converged, convergence, message = wait_for_topology(
+            store, "wait_db_missing", timeout=1, interval=0.2)
+
+        self.assertFalse(converged)
+        self.assertEqual(convergence["nodes"], {})
+        self.assertIn("did not converge within 1 seconds", message)
+
+    def test_wait_for_topology_waits_for_members_to_serve_the_database(self):
+        module = "ansible_collections.ravendb.ravendb.plugins.modules.database"
+        readiness = {"A": [True], "B": [False, False, True]}
+
+        with patch(f"{module}.get_database_topology", return_value={"Members": ["A", "B"]}), \
+                patch(f"{module}.is_node_ready", side_effect=lambda maintenance, tag: readiness[tag].pop(0)) as ready, \
+                patch(f"{module}.time.sleep") as sleep:
+            converged, convergence, message = wait_for_topology(
+                Mock(), "wait_db", timeout=30, interval=0.1)
+
+        self.assertTrue(converged)
+        self.assertEqual(sorted(convergence["nodes"]), ["A", "B"])
+        self.assertEqual([call.args[1] for call in ready.call_args_list], ["A", "B", "B", "B"])
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_create_database_with_members(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_create_database_with_members")
+
+        db_name = "members_db"
+        changed, message = handle_present_state(
+            store, db_name, 1, False, members=["A"])
+        self.assertTrue(changed)
+        self.assertEqual(get_database_topology(store, db_name)["Members"], ["A"])
+
+        changed, changes, message, error = reconcile_topology(
+            store, db_name, 1, False, members=["A"])
+        self.assertFalse(changed)
+        self.assertIsNone(error)
+        self.assertEqual(changes, {"add": [], "remove": []})
+
+    def test_reconcile_topology_with_unreachable_replication_factor(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_reconcile_topology_with_unreachable_replication_factor")
+
+        db_name = "topology_db"
+        handle_present_state(store, db_name, 1, False)
+
+        changed, changes, message, error = reconcile_topology(store, db_name, 1, False)
+        self.assertFalse(changed)
+        self.assertIsNone(error)
+
+        changed, changes, message, error = reconcile_topology(store, db_name, 2, False)
+        self.assertFalse(changed)
+        self.assertIn("Cannot reach replication factor 2", error)
+
+        changed, changes, message, error = reconcile_topology(store, db_name, 1, False, members=["Z"])
+        self.assertFalse(changed)
+        self.assertIn("Unknown cluster nodes: Z", error)
+
+    def test_reconcile_topology_member_swap_waits_before_removal(self):
+        module = "ansible_collections.ravendb.ravendb.plugins.modules.database"
+        store = Mock()
+        sent = []
+        store.maintenance.server.send.side_effect = lambda operation: sent.append(type(operation).__name__)
+        topologies = [{"Members": ["A"]}, {"Members": ["A"], "Promotables": ["B"]}, {"Members": ["A", "B"]}]
+
+        def get_topology(store, database_name):
+            sent.append("GetTopology")
+            return topologies.pop(0)
+
+        with patch(f"{module}.get_database_topology", side_effect=get_topology), \
+                patch(f"{module}.get_cluster_node_tags", return_value=["A", "B"]), \
+                patch(f"{module}.time.sleep"):
+            changed, changes, message, error = reconcile_topology(
+                store, "swap_db", 1, False, members=["B"], wait={"timeout": 30, "interval": 0.1})
+
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertEqual(changes, {"add": ["B"], "remove": ["A"]})
+        self.assertEqual(
+            sent, ["GetTopology", "AddDatabaseNodeOperation", "GetTopology", "GetTopology", "DeleteDatabaseOperation"])
+
+    def test_reconcile_topology_member_swap_keeps_nodes_on_timeout(self):
+        module = "ansible_collections.ravendb.ravendb.plugins.modules.database"
+        store = Mock()
+        sent = []
+        store.maintenance.server.send.side_effect = lambda operation: sent.append(type(operation).__name__)
+
+        topologies = [{"Members": ["A"]}]
+        promotable = {"Members": ["A"], "Promotables": ["B"]}
+
+        with patch(f"{module}.get_database_topology",
+                   side_effect=lambda store, database_name: topologies.pop(0) if topologies else promotable), \
+                patch(f"{module}.get_cluster_node_tags", return_value=["A", "B"]), \
+                patch(f"{module}.time.sleep"):
+            changed, changes, message, error = reconcile_topology(
+                store, "swap_db", 1, False, members=["B"], wait={"timeout": 0.01, "interval": 0.01})
+
+        self.assertTrue(changed)
+        self.assertIn("Nodes [A] were not removed", error)
+        self.assertEqual(sent, ["AddDatabaseNodeOperation"])
+
+    def test_reconcile_topology_waits_for_promotable_member_before_removal(self):
+        module = "ansible_collections.ravendb.ravendb.plugins.modules.database"
+        store = Mock()
+        sent = []
+        store.maintenance.server.send.side_effect = lambda operation: sent.append(type(operation).__name__)
+
+        topologies = [{"Members": ["A"], "Promotables": ["B"]}]
+        promotable = {"Members": ["A"], "Promotables": ["B"]}
+
+        with patch(f"{module}.get_database_topology",
+                   side_effect=lambda store, database_name: topologies.pop(0) if topologies else promotable), \
+                patch(f"{module}.get_cluster_node_tags", return_value=["A", "B"]), \
+                patch(f"{module}.time.sleep"):
+            changed, changes, message, error = reconcile_topology(
+                store, "promotable_db", 1, False, members=["B"], wait={"timeout": 0.01, "interval": 0.01})
+
+        self.assertTrue(changed)
+        self.assertEqual(changes, {"add": [], "remove": ["A"]})
+        self.assertIn("Nodes [A] were not removed", error)
+        self.assertEqual(sent, [])
+
+    def test_create_sharded_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_create_sharded_database")
+
+        params = {
+            "database_name": "sharded_db",
+            "replication_factor": 1,
+            "sharding": {"shards": 2, "placement": None},
+        }
+
+        changed, message, result, error = reconcile_sharded_database(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("would be created with 2 shards", message)
+        self.assertIsNone(get_raw_database_record(store, "sharded_db"))
+
+        changed, message, result, error = reconcile_sharded_database(store, params, check_mode=False)
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertEqual(result["shard_placement"], {"0": ["A"], "1": ["A"]})
+
+        shards = get_raw_database_record(store, "sharded_db")["Sharding"]["Shards"]
+        self.assertEqual(sorted(shards), ["0", "1"])
+        self.assertEqual(get_database_topology(store, "sharded_db")["Members"], ["A"])
+        self.assertIn("sharded_db", get_existing_databases(store))
+        self.assertTrue(database_exists(store, "sharded_db"))
+
+        changed, message, result, error = reconcile_sharded_database(store, params, check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("already exists with 2 shards", message)
+
+        params["sharding"]["shards"] = 3
+        changed, message, result, error = reconcile_sharded_database(store, params, check_mode=False)
+        self.assertIn("Changing the shard count is not supported", error)
+
+    def test_sharding_existing_non_sharded_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_sharding_existing_non_sharded_database")
+
+        handle_present_state(store, "not_sharded_db", 1, False)
+        params = {
+            "database_name": "not_sharded_db",
+            "replication_factor": 1,
+            "sharding": {"shards": 2, "placement": None},
+        }
+
+        changed, message, result, error = reconcile_sharded_database(store, params, check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("already exists and is not sharded", error)
+
+    def test_compact_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_compact_database")
+
+        handle_present_state(store, "compact_db", 1, False)
+        compaction = {"documents": True, "indexes": [], "nodes": None, "timeout": 120}
+
+        changed, message, results, error = handle_compacted_state(store, "compact_db", compaction, check_mode=True)
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertEqual(results, [])
+        self.assertIn("would be compacted on nodes A", message)
+
+        changed, message, results, error = handle_compacted_state(store, "compact_db", compaction, check_mode=False)
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertEqual([result["node"] for result in results], ["A"])
+        self.assertGreaterEqual(results[0]["reclaimed_mb"], 0)
+        self.assertIn("reclaimed", message)
+
+    def test_compact_non_exist_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_compact_non_exist_database")
+
+        compaction = {"documents": True, "indexes": [], "nodes": None, "timeout": 120}
+        changed, message, results, error = handle_compacted_state(store, "missing_db", compaction, check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("does not exist", error)
+
+
+class TestPlanShardPlacement(TestCase):
+
+    def test_even_spread(self):
+        placement, error = plan_shard_placement(3, 2, ["A", "B", "C"])
+        self.assertIsNone(error)
+        self.assertEqual(placement, {"0": ["A", "B"], "1": ["C", "A"], "2": ["B", "C"]})
+
+    def test_explicit_placement(self):
+        placement, error = plan_shard_placement(2, 1, ["A", "B"], {0: ["A"], "1": ["B", "A"]})
+        self.assertIsNone(error)
+        self.assertEqual(placement, {"0": ["A"], "1": ["B", "A"]})
+
+    def test_explicit_placement_missing_shard(self):
+        placement, error = plan_shard_placement(3, 1, ["A", "B"], {"0": ["A"], "1": ["B"]})
+        self.assertIn("must list exactly the shards 0, 1, 2", error)
+
+    def test_explicit_placement_unknown_node(self):
+        placement, error = plan_shard_placement(1, 1, ["A"], {"0": ["X"]})
+        self.assertIn("Unknown cluster nodes: X", error)
+
+    def test_replication_factor_larger_than_cluster(self):
+        placement, error = plan_shard_placement(2, 3, ["A", "B"])
+        self.assertIn("replication factor 3", error)
+
+
+class TestPlanTopologyChanges(TestCase):
+
+    def test_scale_out(self):
+        self.assertEqual(
+            plan_topology_changes(["A"], ["A", "B", "C"], 3),
+            (["B", "C"], [], None))
+
+    def test_scale_in_removes_non_members_first(self):
+        self.assertEqual(
+            plan_topology_changes(["A", "B", "C"], ["A", "B", "C"], 2),
+            ([], ["C"], None))
+
+    def test_matching_replication_factor(self):
+        self.assertEqual(
+            plan_topology_changes(["A", "B"], ["A", "B", "C"], 2),
+            ([], [], None))
+
+    def test_explicit_members(self):
+        self.assertEqual(
+            plan_topology_changes(["A", "B"], ["A", "B", "C"], 1, members=["B", "C"]),
+            (["C"], ["A"], None))
+
+    def test_not_enough_nodes(self):
+        to_add, to_remove, error = plan_topology_changes(["A"], ["A", "B"], 3)
+        self.assertIn("Cannot reach replication factor 3", error)
+
 
 class TestValidationFunctions(TestCase):
 
@@ -127,3 +594,59 @@ class TestValidationFunctions(TestCase):
         self.assertTrue(is_valid_state("absent"))
         self.assertFalse(is_valid_state("running"))
         self.assertFalse(is_valid_state(""))
+
+    def test_valid_toggle_state(self):
+        self.assertTrue(is_valid_toggle_state("enabled"))
+        self.assertTrue(is_valid_toggle_state("disabled"))
+        self.assertFalse(is_valid_toggle_state("present"))
+
+    def test_valid_database_state(self):
+        self.assertTrue(is_valid_database_state("present"))
+        self.assertTrue(is_valid_database_state("compacted"))
+        self.assertTrue(is_valid_database_state("disabled"))
+        self.assertFalse(is_valid_database_state("running"))
+
+    def test_valid_concurrency(self):
+        self.assertTrue(is_valid_concurrency(1))
+        self.assertTrue(is_valid_concurrency(16))
+        self.assertFalse(is_valid_concurrency(0))
+        self.assertFalse(is_valid_concurrency("4"))
+
+    def test_valid_databases(self):
+        self.assertEqual(validate_databases([{"name": "db1"}, {"name": "db2", "state": "absent"}]), (True, None))
+        self.assertFalse(validate_databases([{"name": "Invalid DB!"}])[0])
+        self.assertFalse(validate_databases([{"name": "db1"}, {"name": "db1"}])[0])
+        self.assertFalse(validate_databases([{"name": "db1", "replication_factor": -1}])[0])
+        self.assertFalse(validate_databases([{"name": "db1", "state": "running"}])[0])
+        self.assertEqual(validate_databases([{"name": "db1", "state": "disabled"}]), (True, None))
+
+    def test_valid_page_size(self):
+        self.assertTrue(is_valid_page_size(1))
+        self.assertTrue(is_valid_page_size(1024))
+        self.assertFalse(is_valid_page_size(0))
+        self.assertFalse(is_valid_page_size(None))
+
+    def test_valid_settings(self):
+        self.assertTrue(is_valid_settings(None))
+        self.assertTrue(is_valid_settings({"Indexing.MapBatchSize": 1024, "Storage.ForceUsing32BitsPager": True}))
+        self.assertFalse(is_valid_settings(["Indexing.MapBatchSize"]))
+        self.assertFalse(is_valid_settings({"Indexing.MapBatchSize": [1, 2]}))
+
+    def test_valid_wait(self):
+        self.assertTrue(is_valid_wait(None))
+        self.assertTrue(is_valid_wait({"timeout": 60, "interval": 0.5}))
+        self.assertFalse(is_valid_wait({"timeout": 0, "interval": 1}))
+        self.assertFalse(is_valid_wait({"timeout": 60, "interval": -1}))
+
+    def test_valid_members(self):
+        self.assertTrue(is_valid_members(None))
+        self.assertTrue(is_valid_members(["A", "B"]))
+        self.assertFalse(is_valid_members([]))
+        self.assertFalse(is_valid_members(["A", "A"]))
+        self.assertFalse(is_valid_members(["a"]))
+
+    def test_valid_sharding(self):
+        self.assertTrue(is_valid_sharding(None))
+        self.assertTrue(is_valid_sharding({"shards": 3, "placement": None}))
+        self.assertFalse(is_valid_sharding({"shards": 0, "placement": None}))
+        self.assertFalse(is_valid_sharding({"shards": 2, "placement": ["A"]}))
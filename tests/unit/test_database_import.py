@@ -0,0 +1,136 @@
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import gzip
+import json
+import os
+import tempfile
+from ravendb_test_driver import RavenTestDriver
+from ravendb.documents.operations.statistics import GetCollectionStatisticsOperation
+from unittest import TestCase
+from ansible_collections.ravendb.ravendb.plugins.modules.database_import import (
+    import_dump,
+    build_import_options,
+    iter_multipart_body,
+    summarize_import,
+    parse_time_span,
+    is_valid_positive_int
+)
+
+
+def write_dump(path, documents_per_collection):
+    """Write a minimal gzipped .ravendbdump with the given number of documents per collection."""
+    docs = []
+    for collection, count in documents_per_collection.items():
+        for i in range(count):
+            docs.append({"Name": f"{collection}-{i}",
+                         "@metadata": {"@collection": collection, "@id": f"{collection.lower()}/{i}"}})
+    with gzip.open(path, "wt") as dump:
+        json.dump({"BuildVersion": 71000, "Docs": docs}, dump)
+
+
+class TestDatabaseImport(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+        handle, self.dump_path = tempfile.mkstemp(suffix=".ravendbdump")
+        os.close(handle)
+        write_dump(self.dump_path, {"Users": 30, "Orders": 20})
+
+    def tearDown(self):
+        os.remove(self.dump_path)
+        super().tearDown()
+
+    def params(self, database, **overrides):
+        params = dict(database_name=database, src=self.dump_path, collections=None, include=None,
+                      force=False, chunk_size=1024, timeout=120)
+        params.update(overrides)
+        return params
+
+    def test_import_dump(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_import_dump")
+
+        changed, message, result, error = import_dump(store, self.params(store.database), check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("would be imported", message)
+
+        changed, message, result, error = import_dump(store, self.params(store.database), check_mode=False)
+        self.assertTrue(changed)
+        self.assertIsNone(error)
+        self.assertEqual(result["import_result"]["documents"], 50)
+        self.assertGreater(result["import_result"]["documents_per_second"], 0)
+
+        changed, message, result, error = import_dump(store, self.params(store.database), check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("Import skipped", message)
+
+    def test_import_dump_with_collection_filter(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_import_dump_with_collection_filter")
+
+        params = self.params(store.database, collections=["Users"], include=["Documents"])
+        changed, message, result, error = import_dump(store, params, check_mode=False)
+        self.assertTrue(changed)
+        self.assertEqual(result["import_result"]["documents"], 30)
+
+        statistics = store.maintenance.send(GetCollectionStatisticsOperation())
+        self.assertEqual(statistics.collections.get("Users"), 30)
+        self.assertNotIn("Orders", statistics.collections)
+
+        params = self.params(store.database, collections=["Orders"])
+        changed, message, result, error = import_dump(store, params, check_mode=False)
+        self.assertTrue(changed)
+        self.assertEqual(result["import_result"]["documents"], 20)
+
+    def test_import_into_missing_database(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_import_into_missing_database")
+
+        changed, message, result, error = import_dump(store, self.params("import_db_missing"), check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("does not exist", error)
+
+
+class TestImportHelpers(TestCase):
+
+    def test_build_import_options(self):
+        self.assertEqual(build_import_options(), {})
+        self.assertEqual(build_import_options(["Users"], ["Documents", "Indexes"]),
+                         {"Collections": ["Users"], "OperateOnTypes": "Documents, Indexes"})
+
+    def test_iter_multipart_body_streams_file_in_chunks(self):
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, "wb") as dump:
+            dump.write(b"x" * 10)
+
+        parts = list(iter_multipart_body(path, {}, "boundary", chunk_size=4))
+        os.remove(path)
+
+        self.assertEqual(parts[1:-1], [b"xxxx", b"xxxx", b"xx"])
+        self.assertIn(b'name="importOptions"', parts[0])
+        self.assertEqual(parts[-1], b"\r\n--boundary--\r\n")
+
+    def test_summarize_import(self):
+        state = {"Status": "Completed", "Result": {"Documents": {"ReadCount": 100, "ErroredCount": 1, "SizeInBytes": 2048}}}
+        self.assertEqual(summarize_import(state, 2.0), dict(
+            documents=100, errored=1, skipped=0, bytes=2048, elapsed=2.0, documents_per_second=50.0))
+
+    def test_summarize_import_uses_server_duration(self):
+        state = {"Status": "Completed", "Result": {"Documents": {"ReadCount": 100}, "Elapsed": "00:00:00.5000000"}}
+        self.assertEqual(summarize_import(state, 10.0)["documents_per_second"], 200.0)
+        self.assertEqual(parse_time_span("1.00:01:30.25"), 86490.25)
+        self.assertIsNone(parse_time_span(None))
+
+
+class TestValidationFunctions(TestCase):
+
+    def test_valid_positive_int(self):
+        self.assertTrue(is_valid_positive_int(1024))
+        self.assertFalse(is_valid_positive_int(0))
+        self.assertFalse(is_valid_positive_int(False))
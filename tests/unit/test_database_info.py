@@ -0,0 +1,118 @@
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from ravendb_test_driver import RavenTestDriver
+from ravendb.documents.indexes.definitions import IndexDefinition
+from ravendb.documents.operations.indexes import PutIndexesOperation
+from unittest import TestCase
+from unittest.mock import patch
+from ansible_collections.ravendb.ravendb.plugins.modules.database import (
+    handle_present_state,
+    handle_toggle_state
+)
+from ansible_collections.ravendb.ravendb.plugins.modules.database_info import (
+    collect_database_info,
+    collect_databases_info,
+    iter_database_names,
+    summarize_storage_report,
+    summarize_info,
+    is_valid_positive_int
+)
+
+
+class TestDatabaseInfo(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_collect_database_info(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_collect_database_info")
+
+        with store.open_session() as session:
+            session.store({"name": "John"}, "users/1")
+            session.store({"name": "Jane"}, "users/2")
+            session.save_changes()
+
+        index_definition = IndexDefinition()
+        index_definition.name = "Users/ByName"
+        index_definition.maps = {"from u in docs select new { u.name }"}
+        store.maintenance.send(PutIndexesOperation(index_definition))
+
+        info = collect_database_info(store, store.database)
+
+        self.assertEqual(info["name"], store.database)
+        self.assertFalse(info["disabled"])
+        self.assertEqual(info["documents_count"], 2)
+        self.assertEqual(info["indexes_count"], 1)
+        self.assertGreater(info["data_size_bytes"], 0)
+        self.assertGreater(info["index_size_bytes"], 0)
+        self.assertGreaterEqual(info["last_doc_etag"], 2)
+
+    def test_collect_databases_info(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_collect_databases_info")
+
+        handle_present_state(store, "info_db_enabled", 1, False)
+        handle_present_state(store, "info_db_disabled", 1, False)
+        handle_toggle_state(store, "info_db_disabled", "disabled", False)
+
+        names = list(iter_database_names(store))
+        with patch.object(store, "get_request_executor", wraps=store.get_request_executor) as get_request_executor:
+            databases = collect_databases_info(store, names, max_concurrency=4)
+
+        get_request_executor.assert_not_called()
+
+        self.assertEqual([info["name"] for info in databases], names)
+        by_name = {info["name"]: info for info in databases}
+        self.assertEqual(by_name["info_db_enabled"]["documents_count"], 0)
+        self.assertTrue(by_name["info_db_disabled"]["disabled"])
+        self.assertNotIn("documents_count", by_name["info_db_disabled"])
+
+    def test_collect_missing_database_info(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_collect_missing_database_info")
+
+        info = collect_database_info(store, "info_db_missing")
+        self.assertTrue(info["failed"])
+        self.assertIn("info_db_missing", info["msg"])
+
+        info = collect_database_info(store, "disabled_tenants")
+        self.assertTrue(info["failed"])
+        self.assertFalse(info["disabled"])
+
+
+class TestSummaries(TestCase):
+
+    def test_summarize_storage_report(self):
+        report = {"Results": [
+            {"Type": "Documents", "Report": {"DataFile": {"AllocatedSpaceInBytes": 100},
+                                             "Journals": [{"AllocatedSpaceInBytes": 10}]}},
+            {"Type": "Configuration", "Report": {"DataFile": {"AllocatedSpaceInBytes": 5}, "Journals": []}},
+            {"Type": "Index", "Report": {"DataFile": {"AllocatedSpaceInBytes": 40},
+                                         "Journals": [{"AllocatedSpaceInBytes": 2}]}},
+        ]}
+        self.assertEqual(summarize_storage_report(report), (115, 42))
+        self.assertEqual(summarize_storage_report(None), (0, 0))
+
+    def test_summarize_info(self):
+        databases = [
+            {"name": "a", "documents_count": 3},
+            {"name": "b", "disabled": True},
+            {"name": "c", "failed": True, "msg": "error"},
+        ]
+        self.assertEqual(summarize_info(databases), "Collected statistics of 3 databases: 3 documents, 1 failed.")
+
+
+class TestValidationFunctions(TestCase):
+
+    def test_valid_positive_int(self):
+        self.assertTrue(is_valid_positive_int(1))
+        self.assertFalse(is_valid_positive_int(0))
+        self.assertFalse(is_valid_positive_int(True))
+        self.assertFalse(is_valid_positive_int("8"))
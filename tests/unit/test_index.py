@@ -4,19 +4,41 @@
 
 import os
 import sys
+from types import SimpleNamespace
 from ravendb_test_driver import RavenTestDriver
 from unittest import TestCase
+from unittest.mock import patch
 from ansible_collections.ravendb.ravendb.plugins.modules.index import (
     reconcile_state,
+    reconcile_indexes,
+    reconcile_mode,
+    reconcile_databases,
+    reset_index_in_waves,
+    resolve_database_names,
+    reconcile_auto_indexes,
+    summarize_merge_suggestions,
+    get_existing_index,
+    tokenize_linq,
+    index_differences,
+    index_matches,
+    is_valid_wait,
+    validate_indexes,
+    validate_index_definition,
     is_valid_url,
     is_valid_name,
+    is_valid_database_pattern,
     is_valid_dict,
     validate_paths,
     is_valid_state,
     is_valid_mode,
     is_valid_bool
 )
-from ravendb.documents.operations.indexes import GetIndexesOperation
+from ravendb.documents.indexes.definitions import IndexLockMode, IndexPriority
+from ravendb.documents.operations.indexes import (
+    GetIndexesOperation,
+    GetIndexingStatusOperation,
+    GetIndexNamesOperation,
+    GetIndexStatisticsOperation)
 
 
 INDEX_DEFINITION = {
@@ -53,6 +75,21 @@ MULTI_MAP_INDEX_DEFINITION = {
             ]
 }
 
+CORAX_INDEX_DEFINITION = {
+    "map": [
+        "from u in docs.Users select new { u.Name, Bio = Helpers.Normalize(u.Bio), "
+        "Location = CreateSpatialField(u.Lat, u.Lng) }"],
+    "search_engine": "corax",
+    "fields": {
+        "Name": {"indexing": "exact", "storage": True},
+        "Bio": {"indexing": "search", "storage": False},
+        "Location": {"spatial": {"type": "geography", "units": "kilometers"}},
+    },
+    "additional_sources": {
+        "Helpers": "public static class Helpers { public static string Normalize(string value) => value?.Trim(); }"
+    },
+}
+
 
 class TestReconcileState(TestCase):
 
@@ -259,6 +296,609 @@ class TestReconcileState(TestCase):
         self.assertFalse(changed)
         self.assertIn("Index 'test/index' is already absent.", message)
 
+    def test_reformatted_definition_is_not_a_change(self):
+        store = self.test_driver.get_document_store(
+            database="test_reformatted_definition_is_not_a_change")
+
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersTotals",
+            "index_definition": MAP_REDUCE_INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+        }
+        reconcile_state(store, params, check_mode=False)
+
+        params["index_definition"] = {
+            "map": MAP_REDUCE_INDEX_DEFINITION["map"],
+            "reduce": "// totals per name\n" + " ".join(MAP_REDUCE_INDEX_DEFINITION["reduce"].split()),
+        }
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertFalse(changed)
+
+        params["index_definition"] = INDEX_DEFINITION
+        status, changed, message = reconcile_state(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("Definition changed: reduce removed.", message)
+
+    def test_rolling_update_waits_for_replacement(self):
+        store = self.test_driver.get_document_store(
+            database="test_rolling_update_waits_for_replacement")
+
+        with store.open_session() as session:
+            for i in range(100):
+                session.store({"name": f"user-{i}"}, f"users/{i}")
+            session.save_changes()
+
+        params = {
+            "database_name": store.database,
+            "index_name": "RollingIndex",
+            "index_definition": INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+            "deployment_mode": "rolling",
+            "wait_for_replacement": {"timeout": 60, "interval": 0.2},
+        }
+
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=False, result=result)
+        self.assertEqual(status, "ok")
+        self.assertEqual([node["node"] for node in result["deployment"]["nodes"]], ["A"])
+
+        params["index_definition"] = UPDATED_INDEX_DEFINITION
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=False, result=result)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertGreaterEqual(result["deployment"]["elapsed"], 0)
+
+        index_names = store.maintenance.send(GetIndexNamesOperation(0, 10))
+        self.assertEqual(index_names, ["RollingIndex"])
+        self.assertFalse(store.maintenance.send(GetIndexStatisticsOperation("RollingIndex")).stale)
+
+    def test_search_engine_and_field_options(self):
+        store = self.test_driver.get_document_store(database="test_search_engine_and_field_options")
+
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersSearch",
+            "index_definition": CORAX_INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+        }
+
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+
+        existing_index = get_existing_index(store.maintenance.for_database(store.database), "UsersSearch")
+        self.assertEqual(existing_index.configuration["Indexing.Static.SearchEngineType"], "Corax")
+        self.assertEqual(existing_index.fields["Name"]["Storage"], "Yes")
+        self.assertEqual(existing_index.fields["Location"]["Spatial"]["Type"], "Geography")
+        self.assertIn("Helpers", existing_index.additional_sources)
+
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertFalse(changed, message)
+
+        params["index_definition"] = dict(CORAX_INDEX_DEFINITION, fields=dict(
+            CORAX_INDEX_DEFINITION["fields"], Name={"indexing": "exact", "storage": False}))
+        status, changed, message = reconcile_state(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("field options differ (Name)", message)
+
+    def test_priority_lock_mode_and_configuration(self):
+        store = self.test_driver.get_document_store(database="test_priority_lock_mode_and_configuration")
+        database_maintenance = store.maintenance.for_database(store.database)
+
+        index_definition = dict(
+            INDEX_DEFINITION, priority="low", lock_mode="locked_error",
+            configuration={"Indexing.MapBatchSize": 1024})
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersReport",
+            "index_definition": index_definition,
+            "state": "present",
+            "cluster_wide": False,
+        }
+
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertTrue(changed)
+        existing_index = get_existing_index(database_maintenance, "UsersReport")
+        self.assertEqual(existing_index.priority, IndexPriority.LOW)
+        self.assertEqual(existing_index.lock_mode, IndexLockMode.LOCKED_ERROR)
+        self.assertEqual(existing_index.configuration["Indexing.MapBatchSize"], "1024")
+
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertFalse(changed, message)
+
+        params["index_definition"] = dict(index_definition, priority="high")
+        status, changed, message = reconcile_state(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertIn("priority Low -> High", message)
+        self.assertIn("matches definition", message)
+        self.assertEqual(get_existing_index(database_maintenance, "UsersReport").priority, IndexPriority.HIGH)
+
+        params["index_definition"] = dict(
+            UPDATED_INDEX_DEFINITION, priority="high", lock_mode="unlock",
+            configuration={"Indexing.MapBatchSize": 512})
+        params["wait_for_replacement"] = {"timeout": 60, "interval": 0.2}
+        status, changed, message = reconcile_state(store, params, check_mode=False, result={})
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertIn("configuration differs (Indexing.MapBatchSize)", message)
+        existing_index = get_existing_index(database_maintenance, "UsersReport")
+        self.assertEqual(existing_index.lock_mode, IndexLockMode.UNLOCK)
+        self.assertEqual(existing_index.configuration["Indexing.MapBatchSize"], "512")
+
+    def test_check_mode_tests_index_on_sample(self):
+        store = self.test_driver.get_document_store(database="test_check_mode_tests_index_on_sample")
+
+        with store.open_session() as session:
+            for i in range(300):
+                session.store({"name": f"user-{i}", "tags": ["a", "b", "c"]}, f"users/{i}")
+            session.save_changes()
+
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersByTag",
+            "index_definition": {"map": ["from u in docs.Users from t in u.tags select new { u.name, Tag = t }"]},
+            "state": "present",
+            "cluster_wide": False,
+            "test_sample_size": 50,
+        }
+
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=True, result=result)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertTrue(result["test"]["compiled"])
+        self.assertEqual(result["test"]["documents"], 50)
+        self.assertEqual(result["test"]["map_results"], 150)
+        self.assertEqual(result["test"]["entries_per_document"], 3.0)
+        self.assertIn("Tested on 50 documents: 150 map results (3.0 per document)", message)
+        self.assertEqual(store.maintenance.send(GetIndexNamesOperation(0, 10)), [])
+
+        params["index_definition"] = {"map": ["from u in docs.Users select new { u.name "]}
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=True, result=result)
+        self.assertEqual(status, "error")
+        self.assertFalse(result["test"]["compiled"])
+        self.assertTrue(result["test"]["errors"])
+        self.assertIn("fails to compile", message)
+
+    def test_wait_for_non_stale_reports_throughput(self):
+        store = self.test_driver.get_document_store(
+            database="test_wait_for_non_stale_reports_throughput")
+
+        with store.open_session() as session:
+            for i in range(500):
+                session.store({"name": f"user-{i}"}, f"users/{i}")
+            session.save_changes()
+
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersIndex",
+            "index_definition": INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+            "wait_for_non_stale": {"timeout": 60, "interval": 0.2},
+        }
+
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=False, result=result)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertEqual(len(result["indexing"]["nodes"]), 1)
+        self.assertEqual(result["indexing"]["nodes"][0]["documents"], 500)
+        self.assertGreater(result["indexing"]["nodes"][0]["documents_per_second"], 0)
+        self.assertFalse(store.maintenance.send(GetIndexStatisticsOperation("UsersIndex")).stale)
+
+        result = {}
+        status, changed, message = reconcile_state(store, params, check_mode=False, result=result)
+        self.assertEqual(status, "ok")
+        self.assertFalse(changed)
+        self.assertEqual(result["indexing"]["nodes"][0]["documents"], 0)
+
+    def test_get_existing_index(self):
+        store = self.test_driver.get_document_store(
+            database="test_get_existing_index")
+
+        params = {
+            "database_name": store.database,
+            "index_name": "LookupIndex",
+            "index_definition": INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+        }
+        reconcile_state(store, params, check_mode=False)
+
+        database_maintenance = store.maintenance.for_database(store.database)
+        existing_index = get_existing_index(database_maintenance, "LookupIndex")
+        self.assertEqual(existing_index.name, "LookupIndex")
+        self.assertIsNone(get_existing_index(database_maintenance, "missing_index"))
+
+    def test_mode_on_nonexistent_index(self):
+        store = self.test_driver.get_document_store(
+            database="test_mode_on_nonexistent_index")
+
+        params = {
+            "database_name": store.database,
+            "index_name": "missing_index",
+            "state": None,
+            "mode": "paused",
+            "cluster_wide": False,
+        }
+
+        status, changed, message = reconcile_state(
+            store, params, check_mode=False)
+        self.assertEqual(status, "error")
+        self.assertFalse(changed)
+        self.assertIn("Index 'missing_index' does not exist. Cannot apply mode.", message)
+
+
+class TestReconcileIndexes(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_deploy_indexes_in_one_request(self):
+        store = self.test_driver.get_document_store(
+            database="test_deploy_indexes_in_one_request")
+
+        params = {
+            "database_name": store.database,
+            "indexes": [
+                {"name": "Users_ByName", "index_definition": INDEX_DEFINITION},
+                {"name": "Users_Totals", "index_definition": MAP_REDUCE_INDEX_DEFINITION},
+                {"name": "Users_AndOrders", "index_definition": MULTI_MAP_INDEX_DEFINITION},
+            ],
+            "prune": False,
+        }
+
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertIn("Would deploy 3 indexes", message)
+        self.assertEqual(store.maintenance.send(GetIndexesOperation(0, 10)), [])
+
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertEqual(sorted(plan["created"]), ["Users/AndOrders", "Users/ByName", "Users/Totals"])
+
+        existing_index_names = {i.name for i in store.maintenance.send(GetIndexesOperation(0, 10))}
+        self.assertEqual(existing_index_names, {"Users/ByName", "Users/Totals", "Users/AndOrders"})
+
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=False)
+        self.assertFalse(changed)
+        self.assertIn("All 3 indexes up to date", message)
+        self.assertEqual(len(plan["unchanged"]), 3)
+
+    def test_deploy_indexes_with_update_and_prune(self):
+        store = self.test_driver.get_document_store(
+            database="test_deploy_indexes_with_update_and_prune")
+
+        params = {
+            "database_name": store.database,
+            "indexes": [
+                {"name": "Users_ByName", "index_definition": INDEX_DEFINITION},
+                {"name": "Users_Obsolete", "index_definition": MULTI_MAP_INDEX_DEFINITION},
+            ],
+            "prune": False,
+        }
+        reconcile_indexes(store, params, check_mode=False)
+
+        with store.open_session() as session:
+            list(session.query_collection("Users").where_equals("name", "John"))
+
+        params["indexes"] = [{"name": "Users_ByName", "index_definition": UPDATED_INDEX_DEFINITION}]
+        params["prune"] = True
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=False)
+
+        self.assertTrue(changed)
+        self.assertEqual(plan["updated"], ["Users/ByName"])
+        self.assertEqual(plan["deleted"], ["Users/Obsolete"])
+
+        existing_indexes = store.maintenance.send(GetIndexesOperation(0, 10))
+        existing_index_names = {i.name for i in existing_indexes}
+        self.assertIn("Users/ByName", existing_index_names)
+        self.assertNotIn("Users/Obsolete", existing_index_names)
+        self.assertTrue(any(name.startswith("Auto/") for name in existing_index_names))
+
+    def test_deploy_indexes_changes_priority_without_update(self):
+        store = self.test_driver.get_document_store(
+            database="test_deploy_indexes_changes_priority_without_update")
+
+        params = {
+            "database_name": store.database,
+            "indexes": [{"name": "Users_ByName", "index_definition": INDEX_DEFINITION}],
+            "prune": False,
+        }
+        reconcile_indexes(store, params, check_mode=False)
+
+        params["indexes"] = [{"name": "Users_ByName", "index_definition": dict(INDEX_DEFINITION, priority="low")}]
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=False)
+
+        self.assertTrue(changed)
+        self.assertEqual(plan["updated"], [])
+        self.assertEqual(plan["settings"], {"Users/ByName": "priority Normal -> Low"})
+        self.assertEqual(
+            get_existing_index(store.maintenance.for_database(store.database), "Users/ByName").priority,
+            IndexPriority.LOW)
+
+        status, changed, message, plan = reconcile_indexes(store, params, check_mode=False)
+        self.assertFalse(changed)
+
+
+class TestReconcileMode(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_mode_for_index_names(self):
+        store = self.test_driver.get_document_store(database="test_mode_for_index_names")
+        reconcile_indexes(store, {
+            "database_name": store.database,
+            "indexes": [{"name": "UsersA", "index_definition": INDEX_DEFINITION},
+                        {"name": "UsersB", "index_definition": MULTI_MAP_INDEX_DEFINITION}],
+            "prune": False,
+        }, check_mode=False)
+
+        params = {
+            "database_name": store.database,
+            "index_names": ["UsersA", "UsersB"],
+            "mode": "paused",
+            "cluster_wide": False,
+        }
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertEqual(message, "2 of 2 indexes were paused: UsersA, UsersB.")
+        statuses = {index.name: index.status.value
+                    for index in store.maintenance.send(GetIndexingStatusOperation()).indexes}
+        self.assertEqual(statuses, {"UsersA": "Paused", "UsersB": "Paused"})
+
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertFalse(changed)
+
+        params["index_names"] = ["UsersA", "Missing"]
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertEqual(status, "error")
+        self.assertIn("Missing", message)
+
+    def test_database_mode(self):
+        store = self.test_driver.get_document_store(database="test_database_mode")
+        reconcile_indexes(store, {
+            "database_name": store.database,
+            "indexes": [{"name": "UsersA", "index_definition": INDEX_DEFINITION}],
+            "prune": False,
+        }, check_mode=False)
+
+        params = {"database_name": store.database, "mode": "paused", "cluster_wide": False}
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertEqual(store.maintenance.send(GetIndexingStatusOperation()).status.value, "Paused")
+
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertFalse(changed)
+
+        params["mode"] = "resumed"
+        status, changed, message = reconcile_mode(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertEqual(store.maintenance.send(GetIndexingStatusOperation()).status.value, "Paused")
+
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertTrue(changed)
+        self.assertEqual(store.maintenance.send(GetIndexingStatusOperation()).status.value, "Running")
+
+        params["mode"] = "reset"
+        status, changed, message = reconcile_mode(store, params, check_mode=False)
+        self.assertEqual(status, "error")
+
+
+class TestReconcileDatabases(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_deploy_index_to_many_databases(self):
+        store = self.test_driver.get_document_store(database="test_fan_out_tenant_1")
+        other_store = self.test_driver.get_document_store(database="test_fan_out_tenant_2")
+
+        pattern = "test_fan_out_tenant_*"
+        database_names = resolve_database_names(store, [pattern, store.database, "missing-tenant"])
+        self.assertEqual(sorted(database_names[:2]), sorted([store.database, other_store.database]))
+        self.assertEqual(database_names[2], "missing-tenant")
+
+        params = {
+            "index_name": "UsersByName",
+            "index_definition": INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+            "test_sample_size": 0,
+        }
+        with patch.object(store, "get_request_executor", wraps=store.get_request_executor) as get_request_executor:
+            changed, results = reconcile_databases(store, params, database_names, 2, check_mode=False)
+        get_request_executor.assert_not_called()
+        self.assertTrue(changed)
+        self.assertEqual([result["name"] for result in results], database_names)
+        self.assertEqual([result["changed"] for result in results], [True, True, False])
+        self.assertEqual([result["failed"] for result in results], [False, False, True])
+        self.assertIn("missing-tenant", results[2]["msg"])
+        self.assertEqual(other_store.maintenance.send(GetIndexNamesOperation(0, 10)), ["UsersByName"])
+
+        changed, results = reconcile_databases(store, params, database_names[:2], 2, check_mode=False)
+        self.assertFalse(changed)
+
+
+class TestResetIndexInWaves(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_reset_index_in_waves(self):
+        stores = [self.test_driver.get_document_store(database=f"test_reset_waves_{i}") for i in range(3)]
+        for store in stores:
+            with store.open_session() as session:
+                for i in range(20):
+                    session.store({"name": f"user-{i}"}, f"users/{i}")
+                session.save_changes()
+            reconcile_state(store, {
+                "database_name": store.database,
+                "index_name": "UsersByName",
+                "index_definition": INDEX_DEFINITION,
+                "state": "present",
+                "cluster_wide": False,
+                "test_sample_size": 0,
+            }, check_mode=False)
+
+        database_names = [store.database for store in stores]
+        reset_waves = {"per": "database", "size": 2, "timeout": 60, "interval": 0.1}
+        status, changed, message, report = reset_index_in_waves(
+            stores[0], database_names, "UsersByName", reset_waves, check_mode=True)
+        self.assertEqual(status, "ok")
+        self.assertTrue(changed)
+        self.assertEqual([[target["database"] for target in wave["targets"]] for wave in report["waves"]],
+                         [database_names[:2], database_names[2:]])
+        self.assertIn("would be reset in 2 waves", message)
+
+        status, changed, message, report = reset_index_in_waves(
+            stores[0], database_names, "UsersByName", reset_waves, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertTrue(all("elapsed" in wave for wave in report["waves"]))
+        for store in stores:
+            stats = store.maintenance.send(GetIndexStatisticsOperation("UsersByName"))
+            self.assertFalse(stats.stale)
+            self.assertEqual(stats.entries_count, 20)
+
+        status, changed, message, report = reset_index_in_waves(
+            stores[0], database_names, "Missing", reset_waves, check_mode=False)
+        self.assertEqual(status, "error")
+        self.assertFalse(changed)
+
+
+class TestReconcileAutoIndexes(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_prune_idle_auto_indexes(self):
+        store = self.test_driver.get_document_store(database="test_prune_idle_auto_indexes")
+        with store.open_session() as session:
+            session.store({"name": "John"}, "users/1")
+            session.save_changes()
+        with store.open_session() as session:
+            list(session.query_collection("Users").wait_for_non_stale_results().where_equals("name", "John"))
+
+        params = {"database_name": store.database, "auto_indexes": {"max_idle_days": None, "suggestions": True}}
+        status, changed, message, report = reconcile_auto_indexes(store, params, check_mode=False)
+        self.assertEqual(status, "ok")
+        self.assertFalse(changed)
+        self.assertEqual([info["name"] for info in report["indexes"]], ["Auto/Users/Byname"])
+        self.assertIsNotNone(report["indexes"][0]["last_querying_time"])
+        self.assertEqual(report["deleted"], [])
+        self.assertTrue(report["suggestions"] is not None or report["suggestions_error"])
+
+        params["auto_indexes"] = {"max_idle_days": 0, "suggestions": False}
+        status, changed, message, report = reconcile_auto_indexes(store, params, check_mode=True)
+        self.assertTrue(changed)
+        self.assertEqual(report["deleted"], ["Auto/Users/Byname"])
+        self.assertNotIn("suggestions", report)
+        self.assertEqual(store.maintenance.send(GetIndexNamesOperation(0, 10)), ["Auto/Users/Byname"])
+
+        status, changed, message, report = reconcile_auto_indexes(store, params, check_mode=False)
+        self.assertTrue(changed)
+        self.assertEqual(message, "Found 1 auto indexes. 1 idle for more than 0 days were deleted.")
+        self.assertEqual(store.maintenance.send(GetIndexNamesOperation(0, 10)), [])
+
+    def test_summarize_merge_suggestions(self):
+        response = {
+            "Suggestions": [
+                {"CanMerge": ["Auto/Users/Byname", "Auto/Users/Byage"],
+                 "MergedIndex": {"Maps": ["from doc in docs.Users select new { doc.name, doc.age }"]},
+                 "CanDelete": [], "SurpassingIndex": None},
+                {"CanMerge": [], "CanDelete": ["Auto/Users/Byname"], "SurpassingIndex": "Auto/Users/ByageAndname"}],
+            "Unmergables": {"UsersByTag": "Cannot merge indexes that have a where clause"}}
+        self.assertEqual(summarize_merge_suggestions(response), {
+            "merge": [{"indexes": ["Auto/Users/Byname", "Auto/Users/Byage"],
+                       "merged_maps": ["from doc in docs.Users select new { doc.name, doc.age }"]}],
+            "delete": [{"indexes": ["Auto/Users/Byname"], "surpassing_index": "Auto/Users/ByageAndname"}],
+            "unmergeable": {"UsersByTag": "Cannot merge indexes that have a where clause"}})
+
+
+class TestIndexMatches(TestCase):
+
+    def test_tokenize_ignores_whitespace_and_comments(self):
+        compact = "from u in docs.Users select new { u.Name, Count = 1 }"
+        reformatted = """
+            from u in docs.Users // all users
+            select new
+            {
+                u.Name, /* grouped later */
+                Count = 1
+            }
+        """
+        self.assertEqual(tokenize_linq(compact), tokenize_linq(reformatted))
+
+    def test_tokenize_keeps_string_literals(self):
+        self.assertNotEqual(
+            tokenize_linq('from u in docs.Users where u.Name == "a  b" select new { u.Name }'),
+            tokenize_linq('from u in docs.Users where u.Name == "a b" select new { u.Name }'))
+        self.assertEqual(
+            tokenize_linq('from u in docs.Users select new { Url = "http://example.com" }'),
+            tokenize_linq('from u in docs.Users select new { Url =  "http://example.com" }'))
+
+    def test_index_differences(self):
+        existing_index = SimpleNamespace(
+            maps={MAP_REDUCE_INDEX_DEFINITION["map"][0]},
+            reduce=MAP_REDUCE_INDEX_DEFINITION["reduce"])
+
+        reindented = {
+            "map": ["  " + MAP_REDUCE_INDEX_DEFINITION["map"][0].replace(" select ", "\n    select ")],
+            "reduce": " ".join(MAP_REDUCE_INDEX_DEFINITION["reduce"].split()),
+        }
+        self.assertEqual(index_differences(existing_index, reindented), [])
+        self.assertTrue(index_matches(existing_index, reindented))
+
+        self.assertEqual(index_differences(existing_index, INDEX_DEFINITION), ["reduce removed"])
+        self.assertEqual(
+            index_differences(existing_index, {"map": UPDATED_INDEX_DEFINITION["map"],
+                                               "reduce": MAP_REDUCE_INDEX_DEFINITION["reduce"]}),
+            ["maps differ (1 new, 1 removed)"])
+
+    def test_index_differences_compares_options(self):
+        existing_index = SimpleNamespace(
+            maps=set(CORAX_INDEX_DEFINITION["map"]),
+            reduce=None,
+            configuration={"Indexing.Static.SearchEngineType": "Corax"},
+            fields={
+                "Name": {"Indexing": "Exact", "Storage": "Yes", "TermVector": None, "Spatial": None},
+                "Bio": {"Indexing": "Search", "Storage": "No", "TermVector": None, "Spatial": None},
+                "Location": {"Indexing": None, "Storage": None, "TermVector": None, "Spatial": {
+                    "Type": "Geography", "Strategy": "GeohashPrefixTree", "MaxTreeLevel": 9,
+                    "MinX": -180, "MaxX": 180, "MinY": -90, "MaxY": 90, "Units": "Kilometers"}},
+                "Unused": {"Indexing": None, "Storage": None, "TermVector": None, "Spatial": None},
+            },
+            additional_sources={"Helpers": " ".join(CORAX_INDEX_DEFINITION["additional_sources"]["Helpers"].split(" "))})
+        self.assertEqual(index_differences(existing_index, CORAX_INDEX_DEFINITION), [])
+
+        changed = dict(CORAX_INDEX_DEFINITION, search_engine="lucene", fields={
+            "Name": {"indexing": "exact", "storage": False},
+            "Bio": {"indexing": "search", "storage": False, "term_vector": "with_positions"},
+            "Location": {"spatial": {"type": "geography", "units": "kilometers"}},
+        }, additional_sources={})
+        self.assertEqual(index_differences(existing_index, changed), [
+            "search engine differs (Corax -> Lucene)",
+            "field options differ (Bio, Name)",
+            "additional sources differ"])
+
 
 class TestValidationFunctions(TestCase):
 
@@ -273,6 +913,9 @@ class TestValidationFunctions(TestCase):
         self.assertTrue(is_valid_name("Valid-DB-123"))
         self.assertFalse(is_valid_name("Invalid DB!"))
         self.assertFalse(is_valid_name(""))
+        self.assertTrue(is_valid_database_pattern("tenant-*"))
+        self.assertTrue(is_valid_database_pattern("tenant-[0-9]?"))
+        self.assertFalse(is_valid_database_pattern("tenant *"))
 
     def test_valid_index_name(self):
         self.assertTrue(is_valid_name("valid_index"))
@@ -301,6 +944,46 @@ class TestValidationFunctions(TestCase):
         os.remove("test_cert.pem")
         os.remove("test_ca.pem")
 
+    def test_valid_indexes(self):
+        self.assertEqual(validate_indexes([{"name": "index_a", "index_definition": INDEX_DEFINITION}]), (True, None))
+        self.assertFalse(validate_indexes([{"name": "Invalid Index!", "index_definition": INDEX_DEFINITION}])[0])
+        self.assertFalse(validate_indexes([{"name": "index_a", "index_definition": INDEX_DEFINITION},
+                                           {"name": "index_a", "index_definition": INDEX_DEFINITION}])[0])
+        self.assertFalse(validate_indexes([{"name": "index_a", "index_definition": {"map": []}}])[0])
+
+    def test_valid_index_definition_options(self):
+        self.assertEqual(validate_index_definition(CORAX_INDEX_DEFINITION), (True, None))
+        self.assertFalse(validate_index_definition({"map": INDEX_DEFINITION["map"], "search_engine": "solr"})[0])
+        self.assertFalse(validate_index_definition({"map": INDEX_DEFINITION["map"], "fields": ["Name"]})[0])
+        self.assertFalse(validate_index_definition(
+            {"map": INDEX_DEFINITION["map"], "fields": {"Name": {"analyzer": "StandardAnalyzer"}}})[0])
+        self.assertFalse(validate_index_definition(
+            {"map": INDEX_DEFINITION["map"], "fields": {"Name": {"storage": "yes"}}})[0])
+        self.assertFalse(validate_index_definition(
+            {"map": INDEX_DEFINITION["map"], "fields": {"Name": {"term_vector": "sometimes"}}})[0])
+        self.assertFalse(validate_index_definition(
+            {"map": INDEX_DEFINITION["map"], "fields": {"Loc": {"spatial": {"units": "parsecs"}}}})[0])
+        self.assertFalse(validate_index_definition(
+            {"map": INDEX_DEFINITION["map"], "additional_sources": {"Helpers": 1}})[0])
+        self.assertFalse(validate_indexes(
+            [{"name": "index_a", "index_definition": {"map": INDEX_DEFINITION["map"], "search_engine": "solr"}}])[0])
+
+    def test_valid_index_settings(self):
+        self.assertEqual(validate_index_definition(dict(
+            INDEX_DEFINITION, priority="high", lock_mode="locked_ignore",
+            configuration={"Indexing.MapBatchSize": 1024})), (True, None))
+        self.assertFalse(validate_index_definition(dict(INDEX_DEFINITION, priority="urgent"))[0])
+        self.assertFalse(validate_index_definition(dict(INDEX_DEFINITION, lock_mode="locked"))[0])
+        self.assertFalse(validate_index_definition(dict(INDEX_DEFINITION, configuration=["Indexing.MapBatchSize"]))[0])
+        self.assertFalse(validate_index_definition(dict(
+            INDEX_DEFINITION, configuration={"Indexing.Static.SearchEngineType": "Corax"}))[0])
+
+    def test_valid_wait(self):
+        self.assertTrue(is_valid_wait(None))
+        self.assertTrue(is_valid_wait({"timeout": 600, "interval": 0.5}))
+        self.assertFalse(is_valid_wait({"timeout": 0, "interval": 1}))
+        self.assertFalse(is_valid_wait({"timeout": 60, "interval": 0}))
+
     def test_valid_state(self):
         self.assertTrue(is_valid_state("present"))
         self.assertTrue(is_valid_state("absent"))
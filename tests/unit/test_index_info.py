@@ -0,0 +1,139 @@
+# Copyright (c), RavenDB
+# GNU General Public License v3.0 or later (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from ravendb_test_driver import RavenTestDriver
+from unittest import TestCase
+from unittest.mock import patch
+from ansible_collections.ravendb.ravendb.plugins.modules.index import reconcile_state
+from ansible_collections.ravendb.ravendb.plugins.modules.index_info import (
+    collect_index_info,
+    summarize_performance,
+    find_slowest_indexes,
+    summarize_info,
+    is_valid_top
+)
+
+
+MAP_REDUCE_INDEX_DEFINITION = {
+    "map": ["from u in docs.Users select new { Name = u.name, Count = 1 }"],
+    "reduce": "from r in results group r by r.Name into g select new { Name = g.Key, Count = g.Sum(x => x.Count) }"
+}
+
+MAP_INDEX_DEFINITION = {
+    "map": ["from u in docs.Users select new { u.name }"]
+}
+
+
+class TestIndexInfo(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test_driver = RavenTestDriver()
+
+    def test_collect_index_info(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_collect_index_info")
+
+        with store.open_session() as session:
+            for i in range(200):
+                session.store({"name": f"user-{i % 10}"}, f"users/{i}")
+            session.save_changes()
+
+        for index_name, index_definition in [("UsersTotals", MAP_REDUCE_INDEX_DEFINITION),
+                                             ("UsersByName", MAP_INDEX_DEFINITION)]:
+            params = {
+                "database_name": store.database,
+                "index_name": index_name,
+                "index_definition": index_definition,
+                "state": "present",
+                "cluster_wide": False,
+                "wait_for_non_stale": {"timeout": 60, "interval": 0.2},
+            }
+            reconcile_state(store, params, check_mode=False, result={})
+
+        nodes, indexes = collect_index_info(store, store.database, None)
+
+        self.assertEqual(nodes, [{"node": "A", "indexing_status": "Running"}])
+        by_name = {info["name"]: info for info in indexes}
+        self.assertEqual(set(by_name), {"UsersTotals", "UsersByName"})
+        self.assertEqual(by_name["UsersTotals"]["type"], "MapReduce")
+        self.assertEqual(by_name["UsersTotals"]["entries_count"], 10)
+        self.assertEqual(by_name["UsersTotals"]["errors_count"], 0)
+        self.assertGreater(by_name["UsersTotals"]["batches"], 0)
+        self.assertGreater(by_name["UsersTotals"]["map_duration_ms"], 0)
+        self.assertGreater(by_name["UsersTotals"]["max_batch_size"], 0)
+        self.assertEqual(by_name["UsersByName"]["reduce_duration_ms"], 0)
+
+        nodes, indexes = collect_index_info(store, store.database, ["UsersByName"])
+        self.assertEqual([info["name"] for info in indexes], ["UsersByName"])
+
+    def test_collect_index_info_with_unreachable_node(self):
+
+        store = self.test_driver.get_document_store(
+            database="test_collect_index_info_with_unreachable_node")
+
+        params = {
+            "database_name": store.database,
+            "index_name": "UsersByName",
+            "index_definition": MAP_INDEX_DEFINITION,
+            "state": "present",
+            "cluster_wide": False,
+        }
+        reconcile_state(store, params, check_mode=False, result={})
+
+        module = "ansible_collections.ravendb.ravendb.plugins.modules.index_info"
+        with patch(f"{module}.get_database_nodes", return_value=["A", "Z"]):
+            nodes, indexes = collect_index_info(store, store.database, None)
+
+        self.assertEqual(nodes[0], {"node": "A", "indexing_status": "Running"})
+        self.assertEqual(nodes[1]["node"], "Z")
+        self.assertTrue(nodes[1]["failed"])
+        self.assertIn("Failed to collect index statistics on node 'Z'", nodes[1]["msg"])
+        self.assertEqual([(info["name"], info["node"]) for info in indexes], [("UsersByName", "A")])
+
+    def test_summarize_performance(self):
+        batches = [
+            {"DurationInMs": 120.5, "InputCount": 100,
+             "AllocatedUnmanagedBytes": {"SizeInBytes": 2048}, "AllocatedManagedBytes": {"SizeInBytes": 1024},
+             "Details": {"Operations": [{"Name": "Map", "DurationInMs": 80.25},
+                                        {"Name": "Reduce", "DurationInMs": 30.0},
+                                        {"Name": "Storage/Commit", "DurationInMs": 10.0}]}},
+            {"DurationInMs": 40.0, "InputCount": 300, "AllocatedUnmanagedBytes": {"SizeInBytes": 1024},
+             "Details": {"Operations": [{"Name": "Map", "DurationInMs": 35.0}]}},
+        ]
+        self.assertEqual(summarize_performance(batches), {
+            "batches": 2,
+            "indexing_duration_ms": 160.5,
+            "map_duration_ms": 115.25,
+            "reduce_duration_ms": 30.0,
+            "average_batch_size": 200,
+            "max_batch_size": 300,
+            "allocated_bytes": 3072,
+        })
+        self.assertEqual(summarize_performance([])["batches"], 0)
+
+    def test_find_slowest_indexes(self):
+        indexes = [
+            dict(name="Fast", node="A", indexing_duration_ms=10, map_duration_ms=8, reduce_duration_ms=0,
+                 batches=1, errors_count=0),
+            dict(name="Slow", node="A", indexing_duration_ms=100, map_duration_ms=60, reduce_duration_ms=30,
+                 batches=3, errors_count=0),
+            dict(name="Slow", node="B", indexing_duration_ms=250, map_duration_ms=200, reduce_duration_ms=40,
+                 batches=4, errors_count=2),
+        ]
+        slowest = find_slowest_indexes(indexes, 1)
+        self.assertEqual(slowest, [dict(name="Slow", node="B", indexing_duration_ms=250, map_duration_ms=200,
+                                        reduce_duration_ms=40, batches=4)])
+        self.assertEqual([info["name"] for info in find_slowest_indexes(indexes, 5)], ["Slow", "Fast"])
+        self.assertEqual(find_slowest_indexes(indexes, 0), [])
+        self.assertEqual(
+            summarize_info([{"node": "A"}, {"node": "B", "failed": True}], indexes),
+            "Collected statistics of 2 indexes on 2 nodes: 2 indexing errors, 1 nodes failed.")
+
+    def test_valid_top(self):
+        self.assertTrue(is_valid_top(0))
+        self.assertTrue(is_valid_top(5))
+        self.assertFalse(is_valid_top(-1))
+        self.assertFalse(is_valid_top(True))